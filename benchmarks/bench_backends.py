@@ -0,0 +1,158 @@
+"""
+Compare the installed backends against snmpsim and write the results as JSON
+
+get and get_next are sent to the cisco community from snmpsim/data/cisco.snmprec, walk and bulkwalk walk a column of
+the large table generated by snmpsim/generate_snmprec.py (community large).
+Backends which are not installed are listed in skipped.
+The snmprec backend reads the files from the directory in the SNMPREC_DATA_DIR environment variable.
+
+Usage: python -m benchmarks.bench_backends [--output results.json] [--libraries ezsnmp,pysnmp]
+"""
+import argparse
+import datetime
+import gc
+import importlib.metadata
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+
+from snmp_compat.compat import select
+
+LIBRARIES = ['easysnmp', 'ezsnmp', 'netsnmp', 'pysnmp', 'asyncudp']
+# Distribution names used to report the installed version of each backend, asyncudp is part of this package
+DISTRIBUTIONS = {'easysnmp': 'easysnmp', 'ezsnmp': 'ezsnmp', 'netsnmp': 'netsnmp-py', 'pysnmp': 'pysnmp'}
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Nearest rank percentile of sorted values
+    """
+    rank = max(int(round(percent / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def library_version(library: str) -> Optional[str]:
+    if library not in DISTRIBUTIONS:
+        return None
+    try:
+        return importlib.metadata.version(DISTRIBUTIONS[library])
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def measure(library: str, operation: str, function: Callable[[], object], iterations: int,
+            varbinds: Callable[[object], int] = lambda result: 1, memory=False) -> dict:
+    """
+    Call function iterations times and summarise the latencies
+
+    :param varbinds: Function returning the number of varbinds in a result
+    :param memory: Measure the Python memory held by the result of an extra call
+    """
+    # The first request of some backends includes session setup
+    function()
+    latencies = []
+    count = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        request_start = time.perf_counter()
+        result = function()
+        latencies.append(time.perf_counter() - request_start)
+        count += varbinds(result)
+    seconds = time.perf_counter() - start
+    latencies.sort()
+
+    bytes_per_varbind = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        result = function()
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        bytes_per_varbind = held / max(varbinds(result), 1)
+        del result
+
+    return {
+        'library': library,
+        'library_version': library_version(library),
+        'operation': operation,
+        'requests': iterations,
+        'varbinds': count,
+        'seconds': seconds,
+        'operations_per_second': iterations / seconds,
+        'varbinds_per_second': count / seconds,
+        'latency_ms': {
+            'min': latencies[0] * 1000,
+            'p50': percentile(latencies, 50) * 1000,
+            'p90': percentile(latencies, 90) * 1000,
+            'p99': percentile(latencies, 99) * 1000,
+            'max': latencies[-1] * 1000,
+        },
+        'bytes_per_varbind': bytes_per_varbind,
+    }
+
+
+def bench_library(library: str, args) -> List[dict]:
+    session_class = select(library)
+    # easysnmp and ezsnmp use the version number, the other libraries use mpModel
+    version = 2 if library in ['easysnmp', 'ezsnmp'] else 1
+    session = session_class(args.host, args.community, version, timeout=args.timeout)
+    table = session_class(args.host, args.table_community, version, timeout=args.timeout)
+    try:
+        return [
+            measure(library, 'get', lambda: session.get('.1.3.6.1.2.1.1.5.0'), args.iterations),
+            measure(library, 'get_next', lambda: session.get_next('.1.3.6.1.2.1.1.5'), args.iterations),
+            measure(library, 'walk', lambda: table.walk(args.oid), args.walks, len, True),
+            measure(library, 'bulkwalk', lambda: table.bulkwalk(args.oid, args.max_repetitions), args.walks, len,
+                    True),
+        ]
+    finally:
+        session.close()
+        table.close()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='Benchmark the installed SNMP backends against snmpsim')
+    parser.add_argument('--host', default=os.getenv('SNMPSIM_HOST', '127.0.0.1'))
+    parser.add_argument('--community', default='cisco', help='Community for get and get_next')
+    parser.add_argument('--table-community', default='large', help='Community for walk and bulkwalk')
+    parser.add_argument('--oid', default='.1.3.6.1.2.1.2.2.1.2', help='Column walked by walk and bulkwalk')
+    parser.add_argument('--libraries', default=','.join(LIBRARIES), help='Comma separated backend names')
+    parser.add_argument('--iterations', type=int, default=1000, help='Requests for get and get_next')
+    parser.add_argument('--walks', type=int, default=5, help='Walks for walk and bulkwalk')
+    parser.add_argument('--max-repetitions', type=int, default=50)
+    parser.add_argument('--timeout', type=float, default=30, help='Session timeout, walks of large tables are slow')
+    parser.add_argument('--output', default='-', help='Output file, - for stdout')
+    args = parser.parse_args(argv)
+
+    report = {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'host': args.host,
+        'oid': args.oid,
+        'results': [],
+        'skipped': {},
+    }
+    for library in args.libraries.split(','):
+        try:
+            select(library)
+        except ImportError as e:
+            report['skipped'][library] = str(e)
+            continue
+        print('Benchmarking %s' % library, file=sys.stderr)
+        report['results'].extend(bench_library(library, args))
+
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
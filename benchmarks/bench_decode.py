@@ -0,0 +1,42 @@
+"""
+Benchmark decoding the values of a walk with typed_value for each response and with decode
+
+Usage: python -m benchmarks.bench_decode [rows]
+"""
+import sys
+import timeit
+
+from snmp_compat.decode import decode
+from snmp_compat.libraries.easysnmp_common import EasySNMPResponse
+
+
+def make_walk(rows: int) -> list:
+    responses = []
+    for index in range(rows):
+        responses.append(EasySNMPResponse('.1.3.6.1.2.1.2.2.1.2.%d' % index, None, 'eth%d' % index, 'OCTETSTR'))
+        responses.append(EasySNMPResponse('.1.3.6.1.2.1.2.2.1.6.%d' % index, None, '\x00\x12\x79\x62\xf9\x40',
+                                          'OCTETSTR'))
+        responses.append(EasySNMPResponse('.1.3.6.1.2.1.2.2.1.9.%d' % index, None, str(index * 100), 'TICKS'))
+        responses.append(EasySNMPResponse('.1.3.6.1.2.1.2.2.1.10.%d' % index, None, str(index * 1000), 'COUNTER'))
+    return responses
+
+
+def per_object(responses: list) -> list:
+    return [response.typed_value() for response in responses]
+
+
+def batch(responses: list) -> list:
+    return decode(responses)
+
+
+def main(rows=25000):
+    responses = make_walk(rows)
+    assert per_object(responses) == batch(responses)
+    for function in [per_object, batch]:
+        seconds = min(timeit.repeat(lambda: function(responses), number=1, repeat=5))
+        print('%-12s %d responses: %.3f s, %.2f us/response' % (
+            function.__name__, len(responses), seconds, seconds / len(responses) * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,51 @@
+"""
+Benchmark scaling of ThreadedPoller with the number of worker threads against snmpsim
+
+The SNMP_LIBRARY environment variable selects the backend and SNMPSIM_HOST the agent (default 127.0.0.1).
+snmpsim answers requests from a single process, so the scaling shown includes the capacity of the simulator.
+
+Usage: python -m benchmarks.bench_parallel [jobs] [max workers]
+"""
+import os
+import sys
+import time
+
+from snmp_compat.compat import select
+from snmp_compat.parallel import ThreadedPoller
+
+host = os.getenv('SNMPSIM_HOST', '127.0.0.1')
+oids = ['.1.3.6.1.2.1.1.1.0', '.1.3.6.1.2.1.1.3.0', '.1.3.6.1.2.1.1.5.0']
+
+
+def sequential(jobs: int) -> float:
+    start = time.perf_counter()
+    with select()(host, 'public') as session:
+        for _ in range(jobs):
+            for oid in oids:
+                session.get(oid)
+    return time.perf_counter() - start
+
+
+def threaded(jobs: int, workers: int) -> float:
+    with ThreadedPoller(workers=workers) as poller:
+        # Create the sessions before timing
+        poller.run([(host, 'public', oids)] * workers)
+        start = time.perf_counter()
+        results = poller.run([(host, 'public', oids)] * jobs)
+        elapsed = time.perf_counter() - start
+    assert not [result for result in results if result.error]
+    return elapsed
+
+
+def main(jobs=500, max_workers=32):
+    seconds = sequential(jobs)
+    print('%-12s %d jobs: %.3f s, %.0f jobs/s' % ('sequential', jobs, seconds, jobs / seconds))
+    workers = 1
+    while workers <= max_workers:
+        seconds = threaded(jobs, workers)
+        print('%-12s %d jobs: %.3f s, %.0f jobs/s' % ('%d workers' % workers, jobs, seconds, jobs / seconds))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,42 @@
+"""
+Benchmark construction time and memory of SNMPResponse objects for a walk
+
+Usage: python -m benchmarks.bench_response [rows]
+"""
+import sys
+import timeit
+import tracemalloc
+
+from snmp_compat.libraries.easysnmp_common import EasySNMPResponse
+
+
+def make_walk(rows: int) -> list:
+    return [('.1.3.6.1.2.1.2.2.1.10.%d' % index, str(index * 1000), 'COUNTER') for index in range(rows)]
+
+
+def construct(varbinds: list) -> list:
+    return [EasySNMPResponse(oid, None, value, snmp_type) for oid, value, snmp_type in varbinds]
+
+
+def construct_and_read(varbinds: list) -> list:
+    responses = construct(varbinds)
+    for response in responses:
+        response.oid_index
+    return responses
+
+
+def main(rows=100000):
+    varbinds = make_walk(rows)
+    for function in [construct, construct_and_read]:
+        seconds = min(timeit.repeat(lambda: function(varbinds), number=1, repeat=5))
+        tracemalloc.start()
+        responses = function(varbinds)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del responses
+        print('%-20s %d rows: %.3f s, %.2f us/row, %d bytes/row' % (
+            function.__name__, rows, seconds, seconds / rows * 1e6, memory / rows))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,93 @@
+"""
+Benchmark typed_value for each type of each backend response class
+
+Backends which are not installed are skipped.
+
+Usage: python -m benchmarks.bench_typed_value [calls]
+"""
+import sys
+import timeit
+from typing import List, Tuple
+
+from snmp_compat import SNMPResponse
+
+
+def easysnmp_responses() -> List[Tuple[str, SNMPResponse]]:
+    from snmp_compat.libraries.easysnmp_common import EasySNMPResponse
+    oid = '.1.3.6.1.2.1.2.2.1.10.1'
+    return [(snmp_type, EasySNMPResponse(oid, None, value, snmp_type)) for snmp_type, value in [
+        ('OCTETSTR', 'GigabitEthernet0/1'),
+        ('OCTETSTR', '\x00\x12\x79\x62\xf9\x40'),
+        ('INTEGER', '1'),
+        ('COUNTER', '3598045232'),
+        ('COUNTER64', '18446744073709551615'),
+        ('GAUGE', '1000000000'),
+        ('TICKS', '123456789'),
+        ('OBJECTID', '.1.3.6.1.4.1.9.1.1208'),
+    ]]
+
+
+def netsnmp_responses() -> List[Tuple[str, SNMPResponse]]:
+    from snmp_compat.libraries.compat_netsnmp import NetSNMPResponse
+    oid = '.1.3.6.1.2.1.2.2.1.10.1'
+    return [(snmp_type, NetSNMPResponse(oid=oid, value=value, snmp_type=snmp_type)) for snmp_type, value in [
+        ('STRING', '"GigabitEthernet0/1"'),
+        ('Hex-STRING', '00 12 79 62 F9 40 '),
+        ('INTEGER', '1'),
+        ('Counter32', '3598045232'),
+        ('Gauge32', '1000000000'),
+        ('Timeticks', '14:6:56:07.89'),
+        ('OID', '.1.3.6.1.4.1.9.1.1208'),
+    ]]
+
+
+def pysnmp_responses() -> List[Tuple[str, SNMPResponse]]:
+    from pysnmp.proto import rfc1902
+    from snmp_compat.libraries.compat_pysnmp import PYSNMPResponse
+    oid = '.1.3.6.1.2.1.2.2.1.10.1'
+    return [(value.__class__.__name__, PYSNMPResponse(oid, None, value, type(value))) for value in [
+        rfc1902.OctetString(b'GigabitEthernet0/1'),
+        rfc1902.OctetString(b'\x00\x12\x79\x62\xf9\x40'),
+        rfc1902.Integer32(1),
+        rfc1902.Counter32(3598045232),
+        rfc1902.Counter64(18446744073709551615),
+        rfc1902.Gauge32(1000000000),
+        rfc1902.TimeTicks(123456789),
+        rfc1902.ObjectIdentifier('1.3.6.1.4.1.9.1.1208'),
+    ]]
+
+
+def ber_responses() -> List[Tuple[str, SNMPResponse]]:
+    from snmp_compat.libraries import ber
+    oid = '.1.3.6.1.2.1.2.2.1.10.1'
+    return [(name, ber.BERResponse(oid, None, value, tag)) for name, tag, value in [
+        ('OCTET_STRING', ber.OCTET_STRING, b'GigabitEthernet0/1'),
+        ('OCTET_STRING', ber.OCTET_STRING, b'\x00\x12\x79\x62\xf9\x40'),
+        ('INTEGER', ber.INTEGER, 1),
+        ('COUNTER32', ber.COUNTER32, 3598045232),
+        ('COUNTER64', ber.COUNTER64, 18446744073709551615),
+        ('GAUGE32', ber.GAUGE32, 1000000000),
+        ('TIMETICKS', ber.TIMETICKS, 123456789),
+        ('OBJECT_ID', ber.OBJECT_ID, '.1.3.6.1.4.1.9.1.1208'),
+    ]]
+
+
+BACKENDS = [('easysnmp', easysnmp_responses), ('netsnmp', netsnmp_responses), ('pysnmp', pysnmp_responses),
+            ('ber', ber_responses)]
+
+
+def main(calls=200000):
+    for backend, responses in BACKENDS:
+        try:
+            responses = responses()
+        except ImportError as e:
+            print('%-8s skipped: %s' % (backend, e))
+            continue
+        for snmp_type, response in responses:
+            seconds = min(timeit.repeat(response.typed_value, number=calls, repeat=5))
+            print('%-8s %-12s %-24r %.3f us/call' % (backend, snmp_type, response.typed_value(),
+                                                     seconds / calls * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
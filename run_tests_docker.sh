@@ -1,4 +1,4 @@
 #!/usr/bin/env bash
 set -e
 docker compose build --build-arg SNMP_LIBRARY=$1
-docker compose run --rm tests_$1 python3 -m unittest tests.compat.test_compat
\ No newline at end of file
+docker compose run --rm tests_$1 python3 -m unittest tests.compat.test_compat tests.compat.test_poller tests.compat.test_rate tests.compat.test_snmprec tests.compat.test_ber tests.compat.test_oid tests.compat.test_scheduler tests.compat.test_diff
\ No newline at end of file
@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Dict
+
+from . import snmp_exceptions
+from .compat import OperationHook, SNMPCompat
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class HostCircuit:
+    """
+    Circuit state of a host
+    """
+    state: str = CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+
+    def __repr__(self):
+        return '<HostCircuit %s failures=%d>' % (self.state, self.failures)
+
+
+class CircuitBreaker(OperationHook):
+    """
+    Fail requests to a host immediately with SNMPCircuitOpen after it has failed to respond to several requests in a row
+
+    After the cooldown one request is let through as a probe, the circuit is closed again if the agent responds.
+    Share an instance between all sessions to share the state of each host. When used with AdaptiveTimeout, add the
+    breaker first so that a request with all its retries counts as one failure.
+
+    :param failures: Number of consecutive timeouts or connection errors before the circuit opens
+    :param cooldown: Seconds before a probe request is sent to a host with an open circuit
+    """
+
+    def __init__(self, failures: int = 3, cooldown: float = 30.0):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.hosts: Dict[str, HostCircuit] = {}
+        self._lock = threading.Lock()
+
+    def circuit(self, hostname: str) -> HostCircuit:
+        circuit = self.hosts.get(hostname)
+        if circuit is None:
+            with self._lock:
+                circuit = self.hosts.setdefault(hostname, HostCircuit())
+        return circuit
+
+    def state(self, hostname: str) -> str:
+        return self.circuit(hostname).state
+
+    def allow(self, hostname: str) -> bool:
+        """
+        Check if a request to the host should be sent, a host with an open circuit is allowed one probe after the
+        cooldown
+        """
+        circuit = self.circuit(hostname)
+        if circuit.state == CLOSED:
+            return True
+        with self._lock:
+            if circuit.state == OPEN and time.monotonic() - circuit.opened_at >= self.cooldown:
+                circuit.state = HALF_OPEN
+                return True
+        return False
+
+    def record_success(self, hostname: str):
+        circuit = self.circuit(hostname)
+        if circuit.state != CLOSED or circuit.failures:
+            with self._lock:
+                circuit.state = CLOSED
+                circuit.failures = 0
+
+    def record_failure(self, hostname: str):
+        """
+        Record a timeout or connection error, can also be called for errors outside of session requests like
+        SNMPConnectionError when creating a session
+        """
+        circuit = self.circuit(hostname)
+        with self._lock:
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failures:
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+
+    def __call__(self, session: SNMPCompat, operation: str, oid, request):
+        if not self.allow(session.hostname):
+            raise snmp_exceptions.SNMPCircuitOpen(session=session, oid=oid[0] if isinstance(oid, list) else oid)
+        try:
+            result = request()
+        except (snmp_exceptions.SNMPTimeout, snmp_exceptions.SNMPConnectionError):
+            self.record_failure(session.hostname)
+            raise
+        except (snmp_exceptions.SNMPNoData, snmp_exceptions.SNMPTooBig):
+            # The agent responded
+            self.record_success(session.hostname)
+            raise
+        except BaseException:
+            # Do not leave the circuit half-open if the probe failed with another error
+            if self.state(session.hostname) == HALF_OPEN:
+                self.record_failure(session.hostname)
+            raise
+        self.record_success(session.hostname)
+        return result
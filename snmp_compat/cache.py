@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Union
+
+from . import snmp_exceptions
+from .compat import SNMPCompat
+from .oid import OID, normalize
+from .response import SNMPResponse
+
+
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return '<CacheStats hits=%d misses=%d evictions=%d>' % (self.hits, self.misses, self.evictions)
+
+    @property
+    def hit_ratio(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
+class ResponseCache:
+    """
+    LRU cache of responses with a time to live for each OID prefix
+    A cache can be shared by many CachingSession objects
+
+    :param ttl: Default time to live in seconds
+    :param prefix_ttls: Time to live for OIDs below a prefix, the longest matching prefix is used. A TTL of 0 disables
+     caching for the prefix
+    :param negative_ttl: Time to live for SNMPNoData, defaults to the TTL of the OID
+    :param max_responses: Maximum number of cached responses, a walk counts one for each response. The least recently
+     used results are evicted
+    """
+    # Number of cached responses
+    size: int = 0
+
+    def __init__(self, ttl: float = 5.0, prefix_ttls: Dict[str, float] = None, negative_ttl: float = None,
+                 max_responses: int = 10000):
+        self.ttl = ttl
+        # Longest prefix first
+        self.prefix_ttls = sorted(((OID(prefix), prefix_ttl)
+                                   for prefix, prefix_ttl in (prefix_ttls or {}).items()),
+                                  key=lambda item: len(item[0]), reverse=True)
+        self.negative_ttl = negative_ttl
+        self.max_responses = max_responses
+        self.size = 0
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, oid: str) -> float:
+        try:
+            oid = OID(oid)
+        except ValueError:
+            # Symbolic OIDs only match the default TTL
+            return self.ttl
+        for prefix, prefix_ttl in self.prefix_ttls:
+            if oid.startswith(prefix):
+                return prefix_ttl
+        return self.ttl
+
+    def get(self, key: tuple):
+        """
+        Get a cached result, returns None if the key is not cached or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value, weight = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                del self._entries[key]
+                self.size -= weight
+            self.stats.misses += 1
+            return None
+
+    def set(self, key: tuple, oid: str, value):
+        if isinstance(value, snmp_exceptions.SNMPNoData) and self.negative_ttl is not None:
+            ttl = self.negative_ttl
+        else:
+            ttl = self.ttl_for(oid)
+        if ttl <= 0:
+            return
+
+        weight = len(value) if isinstance(value, list) else 1
+        with self._lock:
+            replaced = self._entries.pop(key, None)
+            if replaced is not None:
+                self.size -= replaced[2]
+            self._entries[key] = (time.monotonic() + ttl, value, weight)
+            self.size += weight
+            # A result larger than the cache is evicted immediately
+            while self.size > self.max_responses:
+                _, (_, _, evicted_weight) = self._entries.popitem(last=False)
+                self.size -= evicted_weight
+                self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class CachingSession(SNMPCompat):
+    """
+    Cache get, get_next, get_many and walk results of another session
+    Results are cached by host, community, operation and OID. Cached response objects are shared between callers.
+
+    :param session: Session from any backend
+    :param cache: Cache to use, a new cache with default settings is created if not set
+    """
+    session: SNMPCompat
+    cache: ResponseCache
+
+    def __init__(self, session: SNMPCompat, cache: Optional[ResponseCache] = None):
+        super().__init__(session.hostname, session.community, timeout=session.timeout, retries=session.retries)
+        self.session = session
+        self.cache = cache if cache is not None else ResponseCache()
+        self.max_varbinds = session.max_varbinds
+
+    def close(self):
+        self.session.close()
+
+    def _apply_timeout(self):
+        self.session.set_timeout(self.timeout, self.retries)
+
+    def _key(self, operation: str, oid: str) -> tuple:
+        return self.hostname, self.community, operation, normalize(oid)
+
+    def _cached(self, operation: str, oid: str):
+        key = self._key(operation, oid)
+        value = self.cache.get(key)
+        if value is None:
+            try:
+                value = getattr(self.session, operation)(oid)
+            except snmp_exceptions.SNMPNoData as e:
+                value = e
+            self.cache.set(key, oid, value)
+
+        if isinstance(value, snmp_exceptions.SNMPNoData):
+            raise value
+        return value
+
+    def get(self, oid: str) -> SNMPResponse:
+        return self._cached('get', oid)
+
+    def get_next(self, oid: str) -> SNMPResponse:
+        return self._cached('get_next', oid)
+
+    def walk(self, oid: str) -> List[SNMPResponse]:
+        return list(self._cached('walk', oid))
+
+    def get_many(self, oids: List[str]) -> List[Union[SNMPResponse, snmp_exceptions.SNMPNoData]]:
+        """
+        Get multiple OIDs, OIDs not in the cache are fetched from the session with a single get_many call
+        """
+        responses = [self.cache.get(self._key('get', oid)) for oid in oids]
+        missing = [position for position, response in enumerate(responses) if response is None]
+        if missing:
+            fetched = self.session.get_many([oids[position] for position in missing])
+            for position, response in zip(missing, fetched):
+                responses[position] = response
+                self.cache.set(self._key('get', oids[position]), oids[position], response)
+        return responses
+
+    def get_bulk(self, oids: List[str], non_repeaters=0, max_repetitions=10) -> List[SNMPResponse]:
+        return self.session.get_bulk(oids, non_repeaters, max_repetitions)
+
+    def iter_walk(self, oid: str, max_repetitions=10, adaptive=False) -> Iterator[SNMPResponse]:
+        yield from self.walk(oid)
+
+    def _bulk_supported(self) -> bool:
+        # bulkwalk and get_table fall back to the cached walk
+        return False
@@ -0,0 +1,173 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import snmp_exceptions
+from .compat import SNMPCompat, select
+from .jobs import PollJob
+from .walk_result import WalkResult
+
+# Sessions of a worker process by hostname and community, reused by all tasks the process runs
+_sessions: Dict[tuple, SNMPCompat] = {}
+_session_args: tuple = ()
+
+
+def _init_worker(library: Optional[str], session_kwargs: dict):
+    global _session_args
+    _session_args = (library, session_kwargs)
+
+
+def _worker_session(hostname: str, community: str) -> SNMPCompat:
+    session = _sessions.get((hostname, community))
+    if session is None:
+        library, session_kwargs = _session_args
+        session = _sessions[(hostname, community)] = select(library)(hostname, community, **session_kwargs)
+    return session
+
+
+def _collect_job(job: PollJob) -> Tuple[bytes, List[tuple]]:
+    result = WalkResult()
+    errors = []
+
+    def error(oid: str, e: Exception):
+        errors.append((type(e).__name__, oid, str(e)))
+
+    try:
+        session = _worker_session(job.hostname, job.community)
+        if job.operation == 'get':
+            for oid, response in zip(job.oids, session.get_many(list(job.oids))):
+                if isinstance(response, snmp_exceptions.SNMPError):
+                    error(oid, response)
+                else:
+                    result.append(response.oid, response.type_code, response.raw_value())
+            return result.to_bytes(), errors
+    except Exception as e:
+        # An unexpected error fails only the job, not the whole shard
+        for oid in job.oids:
+            error(oid, e)
+        return result.to_bytes(), errors
+
+    for oid in job.oids:
+        try:
+            if job.operation == 'walk':
+                responses = session.iter_walk(oid)
+            else:
+                responses = [session.get_next(oid)]
+            for response in responses:
+                result.append(response.oid, response.type_code, response.raw_value())
+        except Exception as e:
+            error(oid, e)
+    return result.to_bytes(), errors
+
+
+def _collect_shard(jobs: List[Tuple[int, PollJob]]) -> List[Tuple[int, bytes, List[tuple]]]:
+    return [(index,) + _collect_job(job) for index, job in jobs]
+
+
+class CollectResult:
+    """
+    Result of a job collected by a worker process
+    Values of all OIDs in the job are in result, OIDs which failed are in errors
+    """
+    job: PollJob
+    result: WalkResult
+    errors: Dict[str, snmp_exceptions.SNMPError]
+
+    def __init__(self, job: PollJob, result: WalkResult, errors: Dict[str, snmp_exceptions.SNMPError]):
+        self.job = job
+        self.result = result
+        self.errors = errors
+
+    def __repr__(self):
+        return '<CollectResult %s rows=%d errors=%d>' % (self.job.hostname, len(self.result), len(self.errors))
+
+
+class ProcessCollector:
+    """
+    Collect jobs in worker processes to use more than one CPU core for response handling
+
+    Jobs are sharded by host so that all jobs for a host are handled by the same task, and each worker process keeps
+    its own sessions. Results are sent to the parent as serialised WalkResult arrays instead of pickled response
+    objects.
+
+    :param library: Backend name, defaults to the SNMP_LIBRARY environment variable
+    :param processes: Number of worker processes, defaults to the number of CPUs
+    :param shard_size: Maximum number of jobs in each task sent to a worker
+    :param version: Session version argument, None uses the default of the backend
+    :param timeout: Session timeout argument, None uses the default of the backend
+    :param retries: Session retries argument, None uses the default of the backend
+    """
+
+    def __init__(self, library: str = None, processes: int = None, shard_size: int = 64, version=None, timeout=None,
+                 retries=None):
+        self.library = library or os.getenv('SNMP_LIBRARY')
+        # Check the library name in the parent
+        select(self.library)
+        self.processes = processes or os.cpu_count()
+        self.shard_size = shard_size
+        self.session_kwargs = {name: value for name, value in
+                               [('version', version), ('timeout', timeout), ('retries', retries)] if value is not None}
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _shards(self, jobs: List[PollJob]) -> Iterator[List[Tuple[int, PollJob]]]:
+        hosts: Dict[str, List[Tuple[int, PollJob]]] = {}
+        for index, job in enumerate(jobs):
+            hosts.setdefault(job.hostname, []).append((index, job))
+
+        shard = []
+        for host_jobs in hosts.values():
+            shard.extend(host_jobs)
+            if len(shard) >= self.shard_size:
+                yield shard
+                shard = []
+        if shard:
+            yield shard
+
+    def collect(self, jobs: Iterable[Union[PollJob, tuple]]) -> Iterator[CollectResult]:
+        """
+        Collect all jobs and yield results as each shard completes
+        Jobs can be PollJob objects or (hostname, community, oids) tuples
+        """
+        jobs = [job if isinstance(job, PollJob) else PollJob(*job) for job in jobs]
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.processes, initializer=_init_worker,
+                                                 initargs=(self.library, self.session_kwargs))
+
+        futures = [self._executor.submit(_collect_shard, shard) for shard in self._shards(jobs)]
+        try:
+            for future in as_completed(futures):
+                for index, data, errors in future.result():
+                    yield CollectResult(jobs[index], WalkResult.from_bytes(data),
+                                        {oid: self._error(name, oid, message) for name, oid, message in errors})
+        finally:
+            for future in futures:
+                future.cancel()
+
+    @staticmethod
+    def _error(name: str, oid: str, message: str) -> snmp_exceptions.SNMPError:
+        error_class = getattr(snmp_exceptions, name, None)
+        if error_class is None:
+            # Unexpected errors in the worker are not SNMP errors, the name of the exception is kept in the message
+            error = snmp_exceptions.SNMPError(oid=oid)
+            error.message = '%s: %s' % (name, message)
+        else:
+            error = error_class(oid=oid)
+            error.message = message
+        return error
+
+    def run(self, jobs: Iterable[Union[PollJob, tuple]]) -> List[CollectResult]:
+        """
+        Blocking version of collect, returns all results in completion order
+        """
+        return list(self.collect(jobs))
@@ -1,33 +1,419 @@
+import functools
 import os
+import threading
+import time
 from abc import ABC
-from typing import Type, List
+from typing import Any, Callable, Dict, Iterator, Type, List, Union
 
+from . import snmp_exceptions
+from .cursor import CheckpointedWalk, WalkCursor
 from .response import SNMPResponse
+from .oid import OID
+from .table import Table
+from .walk_result import WalkResult
+
+
+class _Operations(threading.local):
+    def __init__(self):
+        # id of the sessions running an operation in this thread
+        self.sessions = set()
+
+
+_operations = _Operations()
+
+
+def operation(method):
+    """
+    Decorator for session methods sending requests, the hooks of the session are run around the method
+    Operations called by another operation of the same session do not run the hooks again
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def run(self: 'SNMPCompat', *args, **kwargs):
+        if not self.hooks or id(self) in _operations.sessions:
+            return method(self, *args, **kwargs)
+        request = functools.partial(method, self, *args, **kwargs)
+        for hook in reversed(self.hooks):
+            request = functools.partial(hook, self, name, args[0] if args else None, request)
+        _operations.sessions.add(id(self))
+        try:
+            return request()
+        finally:
+            _operations.sessions.discard(id(self))
+
+    return run
+
+
+class OperationHook:
+    """
+    Hook run around each request sent by a session, added with SNMPCompat.add_hook
+    Hooks must call request to send the request, and can retry it, change the session before it or raise instead
+    """
+
+    def __call__(self, session: 'SNMPCompat', operation: str, oid: Union[str, List[str], None],
+                 request: Callable[[], Any]):
+        """
+        :param session: Session sending the request
+        :param operation: Name of the session method
+        :param oid: First argument of the method, an OID or a list of OIDs
+        :param request: Function sending the request and returning the result
+        """
+        return request()
+
+
+class BulkRepetitions:
+    """
+    max-repetitions for a GETBULK walk
+    The value is halved when the agent responds with tooBig
+    In adaptive mode it is doubled when a full page is received and lowered to the number of received varbinds
+    when the agent truncates the response
+    """
+
+    def __init__(self, value=10, adaptive=False, maximum=256):
+        self.value = value
+        self.adaptive = adaptive
+        self.maximum = maximum
+
+    def too_big(self):
+        if self.value == 1:
+            return False
+        self.value = max(self.value // 2, 1)
+        return True
+
+    def received(self, count: int):
+        if not self.adaptive:
+            return
+        if count >= self.value:
+            self.value = min(self.value * 2, self.maximum)
+        elif count > 0:
+            self.value = count
+
+
+class WalkPosition:
+    """
+    Position of a walk, filters each GETBULK or GETNEXT page to the responses belonging to the walk
+    The walk is complete when a response is outside the walked OID, the OID does not increase or a page is empty
+
+    :param oid: Walked OID
+    :param start: OID to continue the walk after
+    """
+    complete: bool = False
+
+    def __init__(self, oid: str, start: str = None):
+        self.root = OID(oid)
+        self.previous = OID(start) if start else self.root
+        # OID to request the next page from
+        self.next = start or oid
+
+    def filter(self, page: List[SNMPResponse]) -> List[SNMPResponse]:
+        entries = []
+        for entry in page:
+            entry_oid = OID(entry.oid)
+            # Agents repeating or going back in the OID tree would make the walk loop forever
+            if entry_oid <= self.previous or not entry_oid.in_tree(self.root):
+                self.complete = True
+                break
+            entries.append(entry)
+            self.previous = entry_oid
+        if not page:
+            self.complete = True
+        if entries:
+            self.next = entries[-1].oid
+        return entries
 
 
 class SNMPCompat(ABC):
     session = None
     hostname: str = None
     community: str = None
+    timeout: float = None
+    retries: int = None
+    # Maximum number of varbinds sent in one PDU by get_many, lowered when the agent responds with tooBig
+    max_varbinds: int = 64
+    # Hooks run around each request, see add_hook
+    hooks: tuple = ()
+    # perf_counter time the last response was received before it was converted, only set when hooks are used
+    received_at: float = None
 
     def __init__(self, hostname, community, version=0, timeout=0.5, retries=1):
         self.hostname = hostname
         self.community = community
+        self.timeout = timeout
+        self.retries = retries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def close(self):
         pass
 
+    def add_hook(self, hook: OperationHook):
+        """
+        Add a hook to run around each request, hooks added first are run outermost
+        """
+        self.hooks = self.hooks + (hook,)
+
+    def set_timeout(self, timeout: float, retries: int):
+        """
+        Change the timeout and retries used by the following requests
+        """
+        if timeout == self.timeout and retries == self.retries:
+            return
+        self.timeout = timeout
+        self.retries = retries
+        self._apply_timeout()
+
+    def _apply_timeout(self):
+        """
+        Apply timeout and retries to the backend session
+        """
+        raise NotImplementedError
+
+    def _received(self):
+        """
+        Called by backends when the response is received, before it is converted to response objects
+        """
+        if self.hooks:
+            self.received_at = time.perf_counter()
+
     def get(self, oid: str) -> SNMPResponse:
         raise NotImplementedError
 
     def get_next(self, oid: str) -> SNMPResponse:
         raise NotImplementedError
 
+    def get_many(self, oids: List[str]) -> List[Union[SNMPResponse, snmp_exceptions.SNMPNoData]]:
+        """
+        Get multiple OIDs using as few PDUs as possible
+        Responses are returned in the same order as the OIDs, OIDs without data returns a SNMPNoData exception object
+        """
+        responses = []
+        start = 0
+        while start < len(oids):
+            chunk = oids[start:start + self.max_varbinds]
+            responses.extend(self._get_chunk(chunk))
+            start += len(chunk)
+        return responses
+
+    def _get_chunk(self, oids: List[str]) -> list:
+        try:
+            return self._get_many(oids)
+        except snmp_exceptions.SNMPTooBig:
+            if len(oids) == 1:
+                raise
+            self.max_varbinds = max(len(oids) // 2, 1)
+        except snmp_exceptions.SNMPNoData as e:
+            # SNMPv1 fails the whole PDU if one OID is missing
+            if len(oids) == 1:
+                return [e]
+
+        half = len(oids) // 2
+        return self._get_chunk(oids[:half]) + self._get_chunk(oids[half:])
+
+    def _get_many(self, oids: List[str]) -> List[Union[SNMPResponse, snmp_exceptions.SNMPNoData]]:
+        """
+        Get all OIDs in a single PDU
+        Raise SNMPTooBig if the response does not fit and SNMPNoData if the PDU failed because of a missing OID
+        """
+        responses = []
+        for oid in oids:
+            try:
+                responses.append(self.get(oid))
+            except snmp_exceptions.SNMPNoData as e:
+                responses.append(e)
+        return responses
+
     def walk(self, oid: str) -> List[SNMPResponse]:
         raise NotImplementedError
 
-    def bulkwalk(self, oid: str) -> List[SNMPResponse]:
-        return self.walk(oid)
+    def get_bulk(self, oids: List[str], non_repeaters=0, max_repetitions=10) -> List[SNMPResponse]:
+        """
+        Send a single GETBULK request
+        Varbinds beyond the end of the MIB view are not returned
+        """
+        raise NotImplementedError
+
+    def _bulk_supported(self) -> bool:
+        """
+        Check if the backend implements get_bulk and the session SNMP version supports it
+        """
+        return False
+
+    def bulkwalk(self, oid: str, max_repetitions=10, non_repeaters=0, adaptive=False) -> List[SNMPResponse]:
+        """
+        Walk using GETBULK, falls back to walk for SNMPv1
+
+        :param max_repetitions: Number of varbinds requested per PDU
+        :param non_repeaters: Passed to the agent in each GETBULK request
+        :param adaptive: Adjust max_repetitions to the size of the responses from the agent
+        """
+        if not self._bulk_supported():
+            return self.walk(oid)
+        entries = []
+        for page in self._bulkwalk_pages(oid, max_repetitions, non_repeaters, adaptive):
+            entries.extend(page)
+        return entries
+
+    def iter_walk(self, oid: str, max_repetitions=10, adaptive=False) -> Iterator[SNMPResponse]:
+        """
+        Walk and yield each response as it is received
+        GETBULK is used when supported, otherwise GETNEXT
+
+        :param max_repetitions: Number of varbinds requested per GETBULK PDU
+        :param adaptive: Adjust max_repetitions to the size of the responses from the agent
+        """
+        if self._bulk_supported():
+            for page in self._bulkwalk_pages(oid, max_repetitions, 0, adaptive):
+                yield from page
+            return
+        yield from self._getnext_walk(oid)
+
+    def _getnext_walk(self, oid: str, start: str = None) -> Iterator[SNMPResponse]:
+        """
+        Walk with GETNEXT, continuing after start if specified
+        """
+        root = OID(oid)
+        current = start or oid
+        previous = OID(current)
+        while True:
+            try:
+                entry = self.get_next(current)
+            except snmp_exceptions.SNMPNoData:
+                return
+            entry_oid = OID(entry.oid)
+            # Stop if the agent does not advance, end of MIB view is returned with the requested OID
+            if entry_oid <= previous or not entry_oid.in_tree(root):
+                return
+            yield entry
+            current = entry.oid
+            previous = entry_oid
+
+    def resumable_walk(self, oid: Union[str, WalkCursor], max_repetitions=10, adaptive=False,
+                       resumes=3) -> CheckpointedWalk:
+        """
+        Walk and record the last OID received in a cursor, the walk is continued from the cursor after a timeout
+        Responses received before an error are returned with complete set to False instead of being discarded
+
+        :param oid: OID to walk, or a cursor from an interrupted walk to continue it
+        :param max_repetitions: Number of varbinds requested per GETBULK PDU
+        :param adaptive: Adjust max_repetitions to the size of the responses from the agent
+        :param resumes: Number of times the walk is continued after timeouts without any response in between
+        """
+        cursor = oid if isinstance(oid, WalkCursor) else WalkCursor(oid)
+        entries = []
+        if cursor.complete:
+            return CheckpointedWalk(entries, cursor)
+        attempts = resumes
+        while True:
+            received = cursor.received
+            try:
+                if self._bulk_supported():
+                    for page in self._bulkwalk_pages(cursor.oid, max_repetitions, 0, adaptive, cursor.last):
+                        for entry in page:
+                            entries.append(entry)
+                            cursor.advance(entry.oid)
+                else:
+                    for entry in self._getnext_walk(cursor.oid, cursor.last):
+                        entries.append(entry)
+                        cursor.advance(entry.oid)
+            except snmp_exceptions.SNMPTimeout as e:
+                if cursor.received > received:
+                    attempts = resumes
+                if attempts <= 0:
+                    return CheckpointedWalk(entries, cursor, e)
+                attempts -= 1
+                continue
+            except snmp_exceptions.SNMPError as e:
+                return CheckpointedWalk(entries, cursor, e)
+            cursor.complete = True
+            return CheckpointedWalk(entries, cursor)
+
+    def walk_result(self, oid: str, max_repetitions=10, adaptive=False) -> WalkResult:
+        """
+        Walk and store the result in a compact WalkResult instead of a list of response objects
+
+        :param max_repetitions: Number of varbinds requested per GETBULK PDU
+        :param adaptive: Adjust max_repetitions to the size of the responses from the agent
+        """
+        return WalkResult.from_responses(self.iter_walk(oid, max_repetitions, adaptive))
+
+    def get_table(self, columns: Union[List[str], Dict[str, str]], max_repetitions=10) -> Table:
+        """
+        Walk the columns of a table in lockstep with GETBULK, each request contains all unfinished columns
+
+        :param columns: List of column OIDs or dict with column names as keys and OIDs as values
+        :param max_repetitions: Number of rows requested per GETBULK PDU
+        """
+        if isinstance(columns, dict):
+            names, oids = list(columns.keys()), list(columns.values())
+        else:
+            names, oids = list(columns), list(columns)
+        roots = [OID(oid) for oid in oids]
+        table = Table(names)
+
+        if not self._bulk_supported():
+            for name, oid, root in zip(names, oids, roots):
+                for entry in self.iter_walk(oid):
+                    table.add(name, OID(entry.oid).index_string(root), entry.typed_value())
+            table.sort()
+            return table
+
+        current = [str(root) for root in roots]
+        previous = list(roots)
+        active = list(range(len(oids)))
+        repetitions = BulkRepetitions(max_repetitions)
+        while active:
+            try:
+                page = self.get_bulk([current[column] for column in active], 0, repetitions.value)
+            except snmp_exceptions.SNMPTooBig:
+                if not repetitions.too_big():
+                    raise
+                continue
+
+            if not page:
+                break
+            finished = set()
+            for position, entry in enumerate(page):
+                column = active[position % len(active)]
+                if column in finished:
+                    continue
+                entry_oid = OID(entry.oid)
+                if entry_oid <= previous[column]:
+                    # Varbinds for a column at the end of the MIB view are not returned and the following
+                    # varbinds are shifted, the first shifted varbind is assigned to the ended column
+                    finished.add(column)
+                    break
+                if not entry_oid.in_tree(roots[column]):
+                    finished.add(column)
+                    continue
+                table.add(names[column], entry_oid.index_string(roots[column]), entry.typed_value())
+                current[column] = entry.oid
+                previous[column] = entry_oid
+            active = [column for column in active if column not in finished]
+
+        table.sort()
+        return table
+
+    def _bulkwalk_pages(self, oid: str, max_repetitions=10, non_repeaters=0, adaptive=False,
+                        start: str = None) -> Iterator[List[SNMPResponse]]:
+        repetitions = BulkRepetitions(max_repetitions, adaptive)
+        position = WalkPosition(oid, start)
+        while not position.complete:
+            try:
+                page = self.get_bulk([position.next], non_repeaters, repetitions.value)
+            except snmp_exceptions.SNMPTooBig:
+                if not repetitions.too_big():
+                    raise
+                continue
+
+            repetitions.received(len(page))
+            entries = position.filter(page)
+            if entries:
+                yield entries
 
 
 def select(library=None) -> Type[SNMPCompat]:
@@ -48,5 +434,11 @@ def select(library=None) -> Type[SNMPCompat]:
     elif library == 'pysnmp':
         from .libraries.compat_pysnmp import PySNMPCompat
         return PySNMPCompat
+    elif library == 'asyncudp':
+        from .libraries.compat_asyncudp import AsyncUDPCompat
+        return AsyncUDPCompat
+    elif library == 'snmprec':
+        from .libraries.compat_snmprec import SnmprecCompat
+        return SnmprecCompat
     else:
         raise AttributeError('Invalid library %s' % library)
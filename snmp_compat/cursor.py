@@ -0,0 +1,70 @@
+import json
+from typing import List, Optional
+
+from . import snmp_exceptions
+from .response import SNMPResponse
+
+
+class WalkCursor:
+    """
+    Checkpoint of a walk, the last OID received below the walked OID
+
+    Cursors can be saved with dumps and loaded with loads to resume a walk later, in the same or another process.
+
+    :param oid: Walked OID
+    :param last: Last OID received, None before the first response
+    :param received: Number of responses received, including responses from previous attempts
+    """
+    complete: bool = False
+
+    def __init__(self, oid: str, last: str = None, received: int = 0, complete: bool = False):
+        self.oid = oid
+        self.last = last
+        self.received = received
+        self.complete = complete
+
+    def __repr__(self):
+        return '<WalkCursor %s last=%s received=%d complete=%s>' % (self.oid, self.last, self.received,
+                                                                     self.complete)
+
+    def advance(self, oid: str):
+        self.last = oid
+        self.received += 1
+
+    def dumps(self) -> str:
+        return json.dumps({'oid': self.oid, 'last': self.last, 'received': self.received, 'complete': self.complete})
+
+    @classmethod
+    def loads(cls, data: str) -> 'WalkCursor':
+        return cls(**json.loads(data))
+
+
+class CheckpointedWalk:
+    """
+    Responses of a resumable walk
+
+    When complete is False the walk was interrupted by error, entries contains the responses received before the
+    error and the walk can be continued from cursor.
+
+    :param entries: Responses received by this call, a resumed walk does not include the responses of earlier calls
+    """
+    error: Optional[snmp_exceptions.SNMPError] = None
+
+    def __init__(self, entries: List[SNMPResponse], cursor: WalkCursor,
+                 error: snmp_exceptions.SNMPError = None):
+        self.entries = entries
+        self.cursor = cursor
+        self.error = error
+
+    def __repr__(self):
+        return '<CheckpointedWalk %s entries=%d complete=%s>' % (self.cursor.oid, len(self.entries), self.complete)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def complete(self) -> bool:
+        return self.cursor.complete
@@ -0,0 +1,44 @@
+import datetime
+from typing import Dict, List, Sequence, Type
+
+from .response import SNMPResponse
+
+
+def decode(responses: Sequence[SNMPResponse], as_numpy=False):
+    """
+    Decode the values of many responses, for example a walk
+    Gives the same values as typed_value, but responses are grouped by type and each type is decoded in one pass
+
+    :param as_numpy: Return a NumPy array, integer values give an int64 or uint64 array,
+     Timeticks give a timedelta64 array and other values give an object array
+    """
+    classes = {type(response) for response in responses}
+    if len(classes) == 1:
+        values = classes.pop().decode_batch(responses)
+    else:
+        groups: Dict[Type[SNMPResponse], List[int]] = {response_class: [] for response_class in classes}
+        for position, response in enumerate(responses):
+            groups[type(response)].append(position)
+        values = [None] * len(responses)
+        for response_class, positions in groups.items():
+            decoded = response_class.decode_batch([responses[position] for position in positions])
+            for position, value in zip(positions, decoded):
+                values[position] = value
+
+    if as_numpy:
+        return to_numpy(values)
+    return values
+
+
+def to_numpy(values: list):
+    import numpy
+
+    if values and all(type(value) is int for value in values):
+        if max(values) >= 1 << 63:
+            return numpy.array(values, dtype=numpy.uint64)
+        return numpy.array(values, dtype=numpy.int64)
+    elif values and all(type(value) is datetime.timedelta for value in values):
+        return numpy.array(values, dtype='timedelta64[us]')
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
@@ -0,0 +1,177 @@
+import hashlib
+import struct
+import threading
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+from .compat import SNMPCompat
+from .oid import OID, normalize
+from .response import SNMPResponse
+
+# Row count and number of index sub-identifiers
+_HEADER = struct.Struct('=4sQQ')
+_MAGIC = b'WS01'
+
+
+def row_hash(response: SNMPResponse) -> int:
+    """
+    64 bit hash of the type and value of a response, stable between processes and backends
+    """
+    digest = hashlib.blake2b(bytes([response.type_code]), digest_size=8)
+    value = response.raw_value()
+    digest.update(value if isinstance(value, bytes) else value.to_bytes(9, 'big', signed=True))
+    return int.from_bytes(digest.digest(), 'big')
+
+
+class WalkState:
+    """
+    Index and value hash of each row of a walk, stored in arrays
+
+    Indexes are the sub-identifiers after the walked OID, stored in index_parts with row boundaries in index_offsets.
+    Rows are in index order.
+    """
+
+    def __init__(self):
+        self.index_parts = array('I')
+        self.index_offsets = array('Q', [0])
+        self.hashes = array('Q')
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __repr__(self):
+        return '<WalkState rows=%d>' % len(self)
+
+    def append(self, index: Tuple[int, ...], value_hash: int):
+        self.index_parts.extend(index)
+        self.index_offsets.append(len(self.index_parts))
+        self.hashes.append(value_hash)
+
+    def index(self, row: int) -> Tuple[int, ...]:
+        return tuple(self.index_parts[self.index_offsets[row]:self.index_offsets[row + 1]])
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialise the arrays, the byte order is native so the bytes should be read on the same machine
+        """
+        return b''.join([_HEADER.pack(_MAGIC, len(self), len(self.index_parts)), self.index_parts.tobytes(),
+                         self.index_offsets.tobytes(), self.hashes.tobytes()])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'WalkState':
+        magic, rows, index_parts = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError('Invalid WalkState data')
+        state = cls()
+        view = memoryview(data)
+        position = _HEADER.size
+        for name, count in [('index_parts', index_parts), ('index_offsets', rows + 1), ('hashes', rows)]:
+            buffer = array(getattr(state, name).typecode)
+            size = count * buffer.itemsize
+            buffer.frombytes(view[position:position + size])
+            setattr(state, name, buffer)
+            position += size
+        return state
+
+
+class WalkDiff:
+    """
+    Rows of a walk which changed since the previous walk
+
+    :param added: Responses for rows not in the previous walk
+    :param changed: Responses for rows with a different type or value
+    :param removed: OIDs of rows which are no longer returned
+    """
+
+    def __init__(self, added: List[SNMPResponse], changed: List[SNMPResponse], removed: List[str], rows: int):
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+        self.rows = rows
+
+    def __repr__(self):
+        return '<WalkDiff rows=%d added=%d changed=%d removed=%d>' % (self.rows, len(self.added), len(self.changed),
+                                                                     len(self.removed))
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+
+def diff_walk(previous: WalkState, oid: str, responses: Iterable[SNMPResponse]) -> Tuple[WalkDiff, WalkState]:
+    """
+    Compare a walk to the state of the previous walk of the same OID
+
+    Both walks are read in order once, responses must be in OID order as returned by a walk.
+
+    :return: The changes and the state of the new walk
+    """
+    root = OID(oid)
+    state = WalkState()
+    added, changed, removed = [], [], []
+    position = 0
+    previous_rows = len(previous)
+    previous_index = previous.index(0) if previous_rows else None
+    for response in responses:
+        index = OID(response.oid)[len(root):]
+        value_hash = row_hash(response)
+        state.append(index, value_hash)
+        while previous_index is not None and previous_index < index:
+            removed.append(str(OID(root + previous_index)))
+            position += 1
+            previous_index = previous.index(position) if position < previous_rows else None
+        if previous_index == index:
+            if previous.hashes[position] != value_hash:
+                changed.append(response)
+            position += 1
+            previous_index = previous.index(position) if position < previous_rows else None
+        else:
+            added.append(response)
+    for row in range(position, previous_rows):
+        removed.append(str(OID(root + previous.index(row))))
+    return WalkDiff(added, changed, removed, len(state)), state
+
+
+class DiffStore:
+    """
+    States of the previous walks by hostname and OID, used to get only the rows which changed since the last walk
+    A store can be shared by many sessions
+
+    The state of each row uses 16 bytes and 4 bytes for each sub-identifier of the index.
+    """
+
+    def __init__(self):
+        self.states: Dict[Tuple[str, str], WalkState] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.states)
+
+    def diff(self, hostname: str, oid: str, responses: Iterable[SNMPResponse]) -> WalkDiff:
+        """
+        Compare a walk to the previous walk of the OID from the host and store the new state
+        All rows are added for the first walk
+        """
+        key = (hostname, normalize(oid))
+        with self._lock:
+            previous = self.states.get(key, WalkState())
+        walk_diff, state = diff_walk(previous, oid, responses)
+        with self._lock:
+            self.states[key] = state
+        return walk_diff
+
+    def walk(self, session: SNMPCompat, oid: str, max_repetitions=10, adaptive=False) -> WalkDiff:
+        """
+        Walk with session.iter_walk and get the changes since the previous walk
+        """
+        return self.diff(session.hostname, oid, session.iter_walk(oid, max_repetitions, adaptive))
+
+    def forget(self, hostname: str, oid: str = None):
+        """
+        Remove the stored state of an OID or all OIDs of a host, the next walk returns all rows as added
+        """
+        if oid is not None:
+            oid = normalize(oid)
+        with self._lock:
+            for key in list(self.states):
+                if key[0] == hostname and (oid is None or key[1] == oid):
+                    del self.states[key]
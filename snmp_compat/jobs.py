@@ -0,0 +1,46 @@
+from typing import List, Optional, Sequence, Union
+
+from snmp_compat import SNMPResponse
+
+
+class PollJob:
+    """
+    A set of OIDs to poll from one host
+
+    :param operation: get, get_next or walk
+    """
+    hostname: str
+    community: str
+    oids: Sequence[str]
+    operation: str
+
+    def __init__(self, hostname: str, community: str, oids: Sequence[str], operation: str = 'get'):
+        if operation not in ['get', 'get_next', 'walk']:
+            raise AttributeError('Invalid operation %s' % operation)
+        self.hostname = hostname
+        self.community = community
+        self.oids = oids
+        self.operation = operation
+
+    def __repr__(self):
+        return '<PollJob %s %s (%d oids)>' % (self.operation, self.hostname, len(self.oids))
+
+
+class PollResult:
+    """
+    Result of polling a single OID, either response or error is set
+    error is a SNMPError for errors reported by the backend, other exceptions are unexpected errors
+    """
+    job: PollJob
+    oid: str
+    response: Union[SNMPResponse, List[SNMPResponse], None] = None
+    error: Optional[Exception] = None
+
+    def __init__(self, job: PollJob, oid: str, response=None, error: Exception = None):
+        self.job = job
+        self.oid = oid
+        self.response = response
+        self.error = error
+
+    def __repr__(self):
+        return '<PollResult %s %s response=%s error=%s>' % (self.job.hostname, self.oid, self.response, self.error)
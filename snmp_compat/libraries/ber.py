@@ -0,0 +1,222 @@
+"""
+Minimal BER encoder and decoder for SNMPv1 and SNMPv2c messages
+"""
+import functools
+from typing import List, Tuple
+
+from snmp_compat import SNMPResponse
+from snmp_compat.oid import OID
+from snmp_compat.response import SNMPType, timeticks
+
+INTEGER = 0x02
+OCTET_STRING = 0x04
+NULL = 0x05
+OBJECT_ID = 0x06
+SEQUENCE = 0x30
+IP_ADDRESS = 0x40
+COUNTER32 = 0x41
+GAUGE32 = 0x42
+TIMETICKS = 0x43
+OPAQUE = 0x44
+COUNTER64 = 0x46
+NO_SUCH_OBJECT = 0x80
+NO_SUCH_INSTANCE = 0x81
+END_OF_MIB_VIEW = 0x82
+
+GET_REQUEST = 0xa0
+GET_NEXT_REQUEST = 0xa1
+RESPONSE = 0xa2
+GET_BULK_REQUEST = 0xa5
+
+UNSIGNED_TAGS = frozenset([COUNTER32, GAUGE32, TIMETICKS, COUNTER64])
+INTEGER_TAGS = UNSIGNED_TAGS | {INTEGER}
+EXCEPTION_TAGS = frozenset([NO_SUCH_OBJECT, NO_SUCH_INSTANCE, END_OF_MIB_VIEW])
+
+# Names of the error-status values
+ERROR_STATUS = ['noError', 'tooBig', 'noSuchName', 'badValue', 'readOnly', 'genErr', 'noAccess', 'wrongType',
+                'wrongLength', 'wrongEncoding', 'wrongValue', 'noCreation', 'inconsistentValue',
+                'resourceUnavailable', 'commitFailed', 'undoFailed', 'authorizationError', 'notWritable',
+                'inconsistentName']
+
+
+def octet_string_value(value):
+    # Values from snmprec files which are not hex encoded are str
+    if not isinstance(value, bytes):
+        return value
+    try:
+        string = value.decode('utf-8')
+    except UnicodeDecodeError:
+        return value.hex()
+    if string.isprintable() or ''.join(string.split()).isprintable():
+        return string
+    return value.hex()
+
+
+class BERResponse(SNMPResponse):
+    """
+    Response with the value decoded from BER, snmp_type is the BER tag
+    Values are int for integer types, str for object identifiers and IP addresses and bytes for other types
+    """
+    __slots__ = ()
+    type_codes = {
+        INTEGER: SNMPType.INTEGER,
+        OCTET_STRING: SNMPType.OCTET_STRING,
+        NULL: SNMPType.NULL,
+        OBJECT_ID: SNMPType.OBJECT_ID,
+        IP_ADDRESS: SNMPType.IP_ADDRESS,
+        COUNTER32: SNMPType.COUNTER32,
+        GAUGE32: SNMPType.GAUGE32,
+        TIMETICKS: SNMPType.TIMETICKS,
+        OPAQUE: SNMPType.OPAQUE,
+        COUNTER64: SNMPType.COUNTER64,
+    }
+    decoders = {
+        OCTET_STRING: octet_string_value,
+        TIMETICKS: timeticks,
+    }
+
+    def hex_string(self):
+        if isinstance(self.value, bytes):
+            return self.value.hex()
+        return super().hex_string()
+
+
+def encode_length(length: int) -> bytes:
+    if length < 0x80:
+        return bytes([length])
+    length = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+    return bytes([0x80 | len(length)]) + length
+
+
+def encode_tlv(tag: int, content: bytes) -> bytes:
+    return bytes([tag]) + encode_length(len(content)) + content
+
+
+def encode_integer(value: int) -> bytes:
+    return encode_tlv(INTEGER, value.to_bytes(value.bit_length() // 8 + 1, 'big', signed=True))
+
+
+@functools.lru_cache(maxsize=4096)
+def encode_oid(oid: str) -> bytes:
+    parts = list(OID(oid))
+    if len(parts) < 2:
+        parts.append(0)
+    content = bytearray()
+    for part in [parts[0] * 40 + parts[1]] + parts[2:]:
+        chunk = [part & 0x7f]
+        part >>= 7
+        while part:
+            chunk.append(0x80 | part & 0x7f)
+            part >>= 7
+        content.extend(reversed(chunk))
+    return encode_tlv(OBJECT_ID, bytes(content))
+
+
+def encode_request(version: int, community: bytes, pdu_type: int, request_id: int, oids: List[str],
+                   non_repeaters: int = 0, max_repetitions: int = 0) -> bytes:
+    """
+    Encode a request message, the values of the varbinds are NULL
+
+    :param version: Message version, 0 for SNMPv1 and 1 for SNMPv2c
+    :param non_repeaters: Error status field for other requests than GETBULK
+    :param max_repetitions: Error index field for other requests than GETBULK
+    """
+    null = encode_tlv(NULL, b'')
+    varbinds = b''.join(encode_tlv(SEQUENCE, encode_oid(oid) + null) for oid in oids)
+    pdu = (encode_integer(request_id) + encode_integer(non_repeaters) + encode_integer(max_repetitions) +
+           encode_tlv(SEQUENCE, varbinds))
+    return encode_tlv(SEQUENCE, encode_integer(version) + encode_tlv(OCTET_STRING, community) +
+                      encode_tlv(pdu_type, pdu))
+
+
+def decode_header(data: bytes, position: int) -> Tuple[int, int, int]:
+    """
+    Decode the tag and length at position
+
+    :return: Tag, length and position of the content
+    """
+    tag = data[position]
+    length = data[position + 1]
+    position += 2
+    if length & 0x80:
+        count = length & 0x7f
+        length = int.from_bytes(data[position:position + count], 'big')
+        position += count
+    return tag, length, position
+
+
+def decode_oid(content: bytes) -> str:
+    parts = []
+    value = 0
+    for byte in content:
+        value = (value << 7) | (byte & 0x7f)
+        if not byte & 0x80:
+            parts.append(value)
+            value = 0
+    first = parts[0]
+    if first < 80:
+        parts[0:1] = [first // 40, first % 40]
+    else:
+        parts[0:1] = [2, first - 80]
+    return '.' + '.'.join(map(str, parts))
+
+
+def decode_value(tag: int, content: bytes):
+    if tag == INTEGER:
+        return int.from_bytes(content, 'big', signed=True)
+    elif tag in UNSIGNED_TAGS:
+        return int.from_bytes(content, 'big')
+    elif tag == OBJECT_ID:
+        return decode_oid(content)
+    elif tag == IP_ADDRESS:
+        return '.'.join(map(str, content))
+    elif tag == NULL or tag in EXCEPTION_TAGS:
+        return None
+    return bytes(content)
+
+
+def _skip_header(data: bytes) -> int:
+    """
+    Position of the request-id in a message
+    """
+    _, _, position = decode_header(data, 0)
+    for _ in range(2):
+        # version and community
+        _, length, position = decode_header(data, position)
+        position += length
+    _, _, position = decode_header(data, position)
+    return position
+
+
+def decode_request_id(data: bytes) -> int:
+    tag, length, position = decode_header(data, _skip_header(data))
+    if tag != INTEGER:
+        raise ValueError('Invalid request-id tag %d' % tag)
+    return int.from_bytes(data[position:position + length], 'big', signed=True)
+
+
+def decode_response(data: bytes) -> Tuple[int, int, int, List[Tuple[str, int, object]]]:
+    """
+    Decode a response message
+
+    :return: request-id, error-status, error-index and varbinds as (oid, tag, value) tuples
+    """
+    position = _skip_header(data)
+    fields = []
+    for _ in range(3):
+        _, length, position = decode_header(data, position)
+        fields.append(int.from_bytes(data[position:position + length], 'big', signed=True))
+        position += length
+
+    _, length, position = decode_header(data, position)
+    end = position + length
+    varbinds = []
+    while position < end:
+        _, _, position = decode_header(data, position)
+        _, length, position = decode_header(data, position)
+        oid = decode_oid(data[position:position + length])
+        position += length
+        tag, length, position = decode_header(data, position)
+        varbinds.append((oid, tag, decode_value(tag, data[position:position + length])))
+        position += length
+    return fields[0], fields[1], fields[2], varbinds
@@ -0,0 +1,278 @@
+import asyncio
+import itertools
+import random
+import socket
+from typing import AsyncIterator, Dict, List, Tuple
+
+from snmp_compat import SNMPCompat, SNMPResponse, snmp_exceptions
+from snmp_compat.compat import BulkRepetitions, WalkPosition, operation
+from . import ber
+from .ber import BERResponse
+
+
+class SNMPProtocol(asyncio.DatagramProtocol):
+    """
+    UDP socket shared by all sessions of an engine, responses are passed to the request with the same request-id
+    """
+    transport: asyncio.DatagramTransport = None
+
+    def __init__(self):
+        # Future and agent address for each request in flight by request-id
+        self.pending: Dict[int, Tuple[asyncio.Future, tuple]] = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: tuple):
+        try:
+            request_id = ber.decode_request_id(data)
+        except (IndexError, ValueError):
+            return
+        pending = self.pending.get(request_id)
+        if pending is None:
+            return
+        future, address = pending
+        if addr[:2] == address[:2] and not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc):
+        # The request times out
+        pass
+
+
+class AsyncUDPEngine:
+    """
+    An event loop and the UDP sockets of one or more AsyncUDPCompat sessions
+
+    Sessions sharing an engine send all requests from one socket for each address family, the number of requests in
+    flight is only limited by the 31 bit request-id.
+
+    :param loop: run on an existing event loop instead of creating a new one
+    :param receive_buffer: Requested receive buffer size of the sockets, responses arriving faster than they are
+                           handled are dropped when the buffer is full
+    """
+    loop: asyncio.AbstractEventLoop = None
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None, receive_buffer: int = 4 * 1024 * 1024):
+        self.receive_buffer = receive_buffer
+        self._own_loop = loop is None
+        self.loop = loop or asyncio.new_event_loop()
+        self._protocols: Dict[int, SNMPProtocol] = {}
+        self._request_ids = itertools.count(random.randrange(1, 2 ** 30))
+
+    def run(self, coroutine):
+        """
+        Run a coroutine on the engine loop and return the result
+        If the loop is already running in another thread the coroutine is submitted to it
+        """
+        if self.loop.is_running():
+            if asyncio._get_running_loop() is self.loop:
+                # Waiting for the result would block the loop which should produce it
+                coroutine.close()
+                raise RuntimeError('The engine loop is running in this thread, use the async methods like get_async')
+            return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+        return self.loop.run_until_complete(coroutine)
+
+    def request_id(self) -> int:
+        return next(self._request_ids) & 0x7fffffff
+
+    async def protocol(self, family: int) -> SNMPProtocol:
+        protocol = self._protocols.get(family)
+        if protocol is None:
+            transport, protocol = await self.loop.create_datagram_endpoint(SNMPProtocol, family=family)
+            # The kernel limits the size to net.core.rmem_max
+            transport.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer)
+            if self._protocols.setdefault(family, protocol) is not protocol:
+                # Created by another request at the same time
+                transport.close()
+                protocol = self._protocols[family]
+        return protocol
+
+    def close(self):
+        for protocol in self._protocols.values():
+            protocol.transport.close()
+        self._protocols = {}
+        if self._own_loop and not self.loop.is_closed():
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+
+class AsyncUDPCompat(SNMPCompat):
+    """
+    Pure Python SNMPv1 and SNMPv2c backend on asyncio
+    The version argument is the message version, 0 for SNMPv1 and 1 for SNMPv2c
+    """
+    _address: tuple = None
+    _family: int = None
+    engine: AsyncUDPEngine = None
+
+    def __init__(self, hostname, community, version=0, timeout=0.5, retries=1, engine: AsyncUDPEngine = None,
+                 port=161):
+        """
+        :param engine: Engine to share with other sessions, a new engine is created if not specified
+        :param port: UDP port of the agent
+        """
+        super().__init__(hostname, community, version, timeout, retries)
+        self.version = version
+        self.port = port
+        self._community = community.encode('utf-8')
+        self._own_engine = engine is None
+        self.engine = engine or AsyncUDPEngine()
+        # Sessions created from inside a running loop resolves the hostname on first request
+        if not self.engine.loop.is_running():
+            try:
+                self.engine.run(self._resolve())
+            except snmp_exceptions.SNMPConnectionError:
+                self.close()
+                raise
+
+    def close(self):
+        if self._own_engine:
+            self.engine.close()
+
+    def _apply_timeout(self):
+        # The timeout is read for each request
+        pass
+
+    async def _resolve(self):
+        try:
+            addresses = await self.engine.loop.getaddrinfo(self.hostname, self.port, type=socket.SOCK_DGRAM)
+        except (socket.gaierror, UnicodeError) as e:
+            raise snmp_exceptions.SNMPConnectionError(e, self)
+        self._family, _, _, _, self._address = addresses[0]
+
+    async def _request(self, pdu_type: int, oids: List[str], non_repeaters=0,
+                       max_repetitions=0) -> List[Tuple[str, int, object]]:
+        """
+        Send a request and wait for the response, the request is resent after each timeout
+
+        :return: Varbinds as (oid, tag, value) tuples
+        """
+        if self._address is None:
+            await self._resolve()
+        protocol = await self.engine.protocol(self._family)
+        request_id = self.engine.request_id()
+        try:
+            message = ber.encode_request(self.version, self._community, pdu_type, request_id, oids, non_repeaters,
+                                         max_repetitions)
+        except ValueError as e:
+            raise snmp_exceptions.SNMPError(e, self, oids[0])
+
+        future = self.engine.loop.create_future()
+        protocol.pending[request_id] = (future, self._address)
+        try:
+            for _ in range(self.retries + 1):
+                protocol.transport.sendto(message, self._address)
+                try:
+                    data = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+                    break
+                except asyncio.TimeoutError:
+                    continue
+            else:
+                raise snmp_exceptions.SNMPTimeout(oid=oids[0], session=self)
+        finally:
+            del protocol.pending[request_id]
+        self._received()
+
+        try:
+            _, error_status, error_index, varbinds = ber.decode_response(data)
+        except (IndexError, ValueError) as e:
+            raise snmp_exceptions.SNMPError(e, self, oids[0])
+        if error_status:
+            if error_status == 1:
+                raise snmp_exceptions.SNMPTooBig(oid=oids[0], session=self)
+            if error_status == 2:
+                raise snmp_exceptions.SNMPNoData(oid=oids[max(error_index - 1, 0)], session=self)
+            status = ber.ERROR_STATUS[error_status] if error_status < len(ber.ERROR_STATUS) else error_status
+            raise snmp_exceptions.SNMPError(status, self, oids[0])
+        return varbinds
+
+    async def get_async(self, oid: str) -> SNMPResponse:
+        response_oid, tag, value = (await self._request(ber.GET_REQUEST, [oid]))[0]
+        if tag in ber.EXCEPTION_TAGS:
+            raise snmp_exceptions.SNMPNoData(oid=oid, session=self)
+        return BERResponse(response_oid, None, value, tag)
+
+    async def get_next_async(self, oid: str) -> SNMPResponse:
+        response_oid, tag, value = (await self._request(ber.GET_NEXT_REQUEST, [oid]))[0]
+        if tag in ber.EXCEPTION_TAGS:
+            raise snmp_exceptions.SNMPNoData(oid=oid, session=self)
+        return BERResponse(response_oid, None, value, tag)
+
+    async def _get_many_async(self, oids: List[str]) -> list:
+        responses = []
+        for oid, (response_oid, tag, value) in zip(oids, await self._request(ber.GET_REQUEST, oids)):
+            if tag in ber.EXCEPTION_TAGS:
+                responses.append(snmp_exceptions.SNMPNoData(oid=oid, session=self))
+            else:
+                responses.append(BERResponse(response_oid, None, value, tag))
+        return responses
+
+    async def get_bulk_async(self, oids: List[str], non_repeaters=0, max_repetitions=10) -> List[SNMPResponse]:
+        varbinds = await self._request(ber.GET_BULK_REQUEST, oids, non_repeaters, max_repetitions)
+        return [BERResponse(oid, None, value, tag) for oid, tag, value in varbinds if tag != ber.END_OF_MIB_VIEW]
+
+    async def iter_walk_async(self, oid: str, max_repetitions=10, adaptive=False,
+                              non_repeaters=0) -> AsyncIterator[SNMPResponse]:
+        """
+        Walk and yield each response as it is received, GETBULK is used for SNMPv2c
+        """
+        repetitions = BulkRepetitions(max_repetitions, adaptive)
+        position = WalkPosition(oid)
+        while not position.complete:
+            if self._bulk_supported():
+                try:
+                    page = await self.get_bulk_async([position.next], non_repeaters, repetitions.value)
+                except snmp_exceptions.SNMPTooBig:
+                    if not repetitions.too_big():
+                        raise
+                    continue
+                repetitions.received(len(page))
+            else:
+                try:
+                    page = [await self.get_next_async(position.next)]
+                except snmp_exceptions.SNMPNoData:
+                    return
+
+            for entry in position.filter(page):
+                yield entry
+
+    async def bulkwalk_async(self, oid: str, max_repetitions=10, non_repeaters=0,
+                             adaptive=False) -> List[SNMPResponse]:
+        if not self._bulk_supported():
+            return await self.walk_async(oid)
+        return [entry async for entry in self.iter_walk_async(oid, max_repetitions, adaptive, non_repeaters)]
+
+    async def walk_async(self, oid: str) -> List[SNMPResponse]:
+        position = WalkPosition(oid)
+        entries = []
+        while not position.complete:
+            try:
+                entry = await self.get_next_async(position.next)
+            except snmp_exceptions.SNMPNoData:
+                break
+            entries.extend(position.filter([entry]))
+        return entries
+
+    @operation
+    def get(self, oid: str) -> SNMPResponse:
+        return self.engine.run(self.get_async(oid))
+
+    @operation
+    def get_next(self, oid: str) -> SNMPResponse:
+        return self.engine.run(self.get_next_async(oid))
+
+    @operation
+    def _get_many(self, oids: List[str]) -> list:
+        return self.engine.run(self._get_many_async(oids))
+
+    def _bulk_supported(self) -> bool:
+        return self.version > 0
+
+    @operation
+    def get_bulk(self, oids: List[str], non_repeaters=0, max_repetitions=10) -> List[SNMPResponse]:
+        return self.engine.run(self.get_bulk_async(oids, non_repeaters, max_repetitions))
+
+    @operation
+    def walk(self, oid: str) -> List[SNMPResponse]:
+        return self.engine.run(self.walk_async(oid))
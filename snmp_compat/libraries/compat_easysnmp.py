@@ -2,6 +2,7 @@ import easysnmp
 from easysnmp import SNMPVariable as EasySNMPVariable
 
 from snmp_compat import SNMPCompat, snmp_exceptions
+from snmp_compat.compat import operation
 from .easysnmp_common import EasySNMPResponse
 
 
@@ -11,7 +12,7 @@ def convert_variable(var: EasySNMPVariable):
 
 class EasySNMPCompat(SNMPCompat):
     def __init__(self, hostname: str, community: str, version=2, timeout=0.5, retries=1):
-        super().__init__(hostname, community)
+        super().__init__(hostname, community, version, timeout, retries)
         try:
             self.session = easysnmp.Session(hostname, version, community, timeout, retries, abort_on_nonexistent=True)
         except easysnmp.EasySNMPConnectionError as e:
@@ -19,36 +20,87 @@ class EasySNMPCompat(SNMPCompat):
         except SystemError as e:
             raise snmp_exceptions.SNMPError(e, self)
 
+    def _apply_timeout(self):
+        self.session.update_session(timeout=self.timeout, retries=self.retries)
+
     def _convert_exception(self, e: easysnmp.EasySNMPError, oid: str):
         if type(e) is easysnmp.EasySNMPTimeoutError:
             raise snmp_exceptions.SNMPTimeout(e, self, oid)
+        elif str(e).find('tooBig') > -1:
+            raise snmp_exceptions.SNMPTooBig(e, self, oid)
         elif type(e) is easysnmp.EasySNMPConnectionError:
             raise snmp_exceptions.SNMPConnectionError(e, self, oid)
-        elif type(e) in [easysnmp.EasySNMPNoSuchInstanceError, easysnmp.EasySNMPNoSuchObjectError]:
+        elif type(e) in [easysnmp.EasySNMPNoSuchInstanceError, easysnmp.EasySNMPNoSuchObjectError,
+                         easysnmp.EasySNMPNoSuchNameError]:
             raise snmp_exceptions.SNMPNoData(e, self, oid)
         else:
             raise snmp_exceptions.SNMPError(e, self, oid)
 
+    @operation
     def get(self, oid):
         try:
-            return convert_variable(self.session.get(oid))
+            variable = self.session.get(oid)
+            self._received()
+            return convert_variable(variable)
         except easysnmp.exceptions.EasySNMPError as e:
             self._convert_exception(e, oid)
         except SystemError as e:
             raise snmp_exceptions.SNMPError(e, self, oid)
 
+    @operation
     def get_next(self, oid):
         try:
-            return convert_variable(self.session.get_next(oid))
+            variable = self.session.get_next(oid)
+            self._received()
+            return convert_variable(variable)
         except easysnmp.exceptions.EasySNMPError as e:
             self._convert_exception(e, oid)
         except SystemError as e:
             raise snmp_exceptions.SNMPError(e, self, oid)
 
+    @operation
+    def _get_many(self, oids):
+        # Missing OIDs are returned with a NOSUCH type instead of aborting the whole request
+        self.session.abort_on_nonexistent = False
+        try:
+            variables = self.session.get(list(oids))
+        except easysnmp.exceptions.EasySNMPError as e:
+            self._convert_exception(e, oids[0])
+        except SystemError as e:
+            raise snmp_exceptions.SNMPError(e, self, oids[0])
+        finally:
+            self.session.abort_on_nonexistent = True
+        self._received()
+
+        responses = []
+        for oid, var in zip(oids, variables):
+            if var.snmp_type in ['NOSUCHOBJECT', 'NOSUCHINSTANCE']:
+                responses.append(snmp_exceptions.SNMPNoData(session=self, oid=oid))
+            else:
+                responses.append(convert_variable(var))
+        return responses
+
+    @operation
     def walk(self, oid):
         try:
-            return list(map(lambda var: convert_variable(var), self.session.walk(oid)))
+            variables = self.session.walk(oid)
+            self._received()
+            return list(map(lambda var: convert_variable(var), variables))
         except easysnmp.exceptions.EasySNMPError as e:
             self._convert_exception(e, oid)
         except SystemError as e:
             raise snmp_exceptions.SNMPError(e, self, oid)
+
+    def _bulk_supported(self) -> bool:
+        return self.session.version >= 2
+
+    @operation
+    def get_bulk(self, oids, non_repeaters=0, max_repetitions=10):
+        try:
+            variables = self.session.get_bulk(list(oids), non_repeaters, max_repetitions)
+            self._received()
+            return [convert_variable(var) for var in variables if var.snmp_type != 'ENDOFMIBVIEW']
+        except easysnmp.exceptions.EasySNMPError as e:
+            self._convert_exception(e, oids[0])
+        except SystemError as e:
+            raise snmp_exceptions.SNMPError(e, self, oids[0])
@@ -3,6 +3,8 @@ from typing import Literal
 import ezsnmp
 
 from snmp_compat import SNMPCompat, SNMPResponse, snmp_exceptions
+from snmp_compat.compat import operation
+from snmp_compat.oid import normalize
 from .easysnmp_common import EasySNMPResponse
 
 
@@ -12,50 +14,99 @@ def convert_response(response: ezsnmp.SNMPVariable) -> SNMPResponse:
 
 class EZSNMPCompat(SNMPCompat):
     def __init__(self, hostname, community, version: Literal[1, 2, 3] = 2, timeout=1, retries=1):
-        super().__init__(hostname, community)
+        super().__init__(hostname, community, version, timeout, retries)
         try:
             self.session = ezsnmp.Session(hostname, version, community, timeout, retries, abort_on_nonexistent=True)
         except ezsnmp.exceptions.EzSNMPConnectionError as e:
             raise snmp_exceptions.SNMPConnectionError(e, self)
 
+    def _apply_timeout(self):
+        self.session.update_session(timeout=self.timeout, retries=self.retries)
+
     def _convert_exception(self, e: ezsnmp.EzSNMPError, oid: str):
-        oid = oid.replace('iso.', '.1.')
+        oid = normalize(oid)
         if type(e) is ezsnmp.exceptions.EzSNMPTimeoutError:
             raise snmp_exceptions.SNMPTimeout(e, self, oid)
+        elif str(e).find('tooBig') > -1:
+            raise snmp_exceptions.SNMPTooBig(e, self, oid)
         elif type(e) in [ezsnmp.exceptions.EzSNMPNoSuchInstanceError, ezsnmp.exceptions.EzSNMPNoSuchObjectError,
                          ezsnmp.exceptions.EzSNMPNoSuchNameError]:
             raise snmp_exceptions.SNMPNoData(e, self, oid)
         else:
             raise snmp_exceptions.SNMPError(e, self, oid)
 
+    @operation
     def get(self, oid):
         try:
             response = self.session.get(oid)
+            self._received()
             return convert_response(response)
         except ezsnmp.exceptions.EzSNMPError as e:
             self._convert_exception(e, oid)
 
+    @operation
     def get_next(self, oid):
         try:
             response = self.session.get_next(oid)
+            self._received()
             return convert_response(response)
         except ezsnmp.exceptions.EzSNMPError as e:
             self._convert_exception(e, oid)
 
+    @operation
+    def _get_many(self, oids):
+        # Missing OIDs are returned with a NOSUCH type instead of aborting the whole request
+        self.session.abort_on_nonexistent = False
+        try:
+            variables = self.session.get(list(oids))
+        except ezsnmp.exceptions.EzSNMPError as e:
+            self._convert_exception(e, oids[0])
+        finally:
+            self.session.abort_on_nonexistent = True
+        self._received()
+
+        responses = []
+        for oid, var in zip(oids, variables):
+            if var.snmp_type in ['NOSUCHOBJECT', 'NOSUCHINSTANCE']:
+                responses.append(snmp_exceptions.SNMPNoData(session=self, oid=normalize(oid)))
+            else:
+                responses.append(convert_response(var))
+        return responses
+
+    @operation
     def walk(self, oid):
         try:
-            return list(map(lambda var: convert_response(var), self.session.walk(oid)))
+            variables = self.session.walk(oid)
+            self._received()
+            return list(map(lambda var: convert_response(var), variables))
         except ezsnmp.exceptions.EzSNMPError as e:
             self._convert_exception(e, oid)
         except SystemError as e:
             raise snmp_exceptions.SNMPError(e, self, oid)
 
-    def bulkwalk(self, oid):
-        if self.session.version < 2:
+    def _bulk_supported(self) -> bool:
+        return self.session.version >= 2
+
+    @operation
+    def get_bulk(self, oids, non_repeaters=0, max_repetitions=10):
+        try:
+            variables = self.session.get_bulk(list(oids), non_repeaters, max_repetitions)
+            self._received()
+            return [convert_response(var) for var in variables if var.snmp_type != 'ENDOFMIBVIEW']
+        except ezsnmp.exceptions.EzSNMPError as e:
+            self._convert_exception(e, oids[0])
+
+    @operation
+    def bulkwalk(self, oid, max_repetitions=10, non_repeaters=0, adaptive=False):
+        if not self._bulk_supported():
             return self.walk(oid)
+        if adaptive:
+            return super().bulkwalk(oid, max_repetitions, non_repeaters, adaptive)
 
         try:
-            return list(map(lambda var: convert_response(var), self.session.bulkwalk(oid)))
+            variables = self.session.bulkwalk(oid, non_repeaters, max_repetitions)
+            self._received()
+            return list(map(lambda var: convert_response(var), variables))
         except ezsnmp.exceptions.EzSNMPError as e:
             self._convert_exception(e, oid)
         except SystemError as e:
@@ -1,4 +1,5 @@
 import re
+import socket
 from datetime import timedelta
 
 import netsnmp
@@ -6,6 +7,34 @@ import netsnmp
 from netsnmp._api import SNMPError
 
 from snmp_compat import SNMPCompat, snmp_exceptions, SNMPResponse
+from snmp_compat.compat import operation
+from snmp_compat.response import SNMPType, timeticks
+
+
+DIGITS_RE = re.compile(r'[0-9]+')
+
+
+def timeticks_ticks(value: str) -> int:
+    """
+    Number of ticks of a Timeticks value formatted as days:hours:minutes:seconds.centiseconds or as a number
+    """
+    if value.isdigit():
+        return int(value)
+    days, hours, minutes, seconds, centiseconds = map(int, DIGITS_RE.findall(value)[:5])
+    return (((days * 24 + hours) * 60 + minutes) * 60 + seconds) * 100 + centiseconds
+
+
+def timeticks_value(value: str) -> timedelta:
+    return timeticks(timeticks_ticks(value))
+
+
+def hex_value(value: str) -> str:
+    # Octets are separated by whitespace, which is ignored by bytes.fromhex
+    return bytes.fromhex(value.replace('"', '')).hex()
+
+
+def string_value(value: str) -> str:
+    return value.replace('"', '')
 
 
 def get_exception(message: str):
@@ -13,6 +42,8 @@ def get_exception(message: str):
         return snmp_exceptions.SNMPNoData
     if message.find('Timeout') > -1:
         return snmp_exceptions.SNMPTimeout
+    if message.find('tooBig') > -1:
+        return snmp_exceptions.SNMPTooBig
     else:
         return snmp_exceptions.SNMPError
 
@@ -24,30 +55,66 @@ def convert_response(data: tuple):
 class NetSNMPCompat(SNMPCompat):
 
     def __init__(self, hostname, community, version=0, timeout=0.5, retries=1):
-        super().__init__(hostname, community)
+        super().__init__(hostname, community, version, timeout, retries)
+        self.version = version
+        self._connect()
+
+    def _connect(self):
         try:
-            self.session = netsnmp.SNMPSession(peername=hostname, community=community, version=version, timeout=timeout,
-                                               retries=retries)
+            self.session = netsnmp.SNMPSession(peername=self.hostname, community=self.community, version=self.version,
+                                               timeout=self.timeout, retries=self.retries)
         except (SNMPError, SystemError, RuntimeError) as e:
             # raise get_exception(str(e))(e)
             raise snmp_exceptions.SNMPConnectionError(e, self)
 
+    def close(self):
+        self.session.close()
+
+    def _apply_timeout(self):
+        # The timeout of a net-snmp session can not be changed after it is opened
+        self.session.close()
+        self._connect()
+
+    @operation
     def get(self, oid):
         try:
             data = self.session.get(oid)
         except (SNMPError, SystemError, TimeoutError) as e:
             raise get_exception(str(e))(e, self, oid)
+        self._received()
 
         return convert_response(data[0])
 
+    @operation
     def get_next(self, oid):
         try:
             data = self.session.getnext(oid)
         except (SNMPError, SystemError, TimeoutError) as e:
             raise get_exception(str(e))(e, self, oid)
+        self._received()
 
         return convert_response(data[0])
 
+    @operation
+    def _get_many(self, oids):
+        try:
+            data = self.session.get(list(oids))
+        except (SNMPError, SystemError, TimeoutError) as e:
+            raise get_exception(str(e))(e, self, oids[0])
+        self._received()
+
+        responses = []
+        for oid, element in zip(oids, data):
+            if element[1] in ['NOSUCHOBJECT', 'NOSUCHINSTANCE']:
+                responses.append(snmp_exceptions.SNMPNoData(session=self, oid=oid))
+                continue
+            try:
+                responses.append(convert_response(element))
+            except snmp_exceptions.SNMPNoData:
+                responses.append(snmp_exceptions.SNMPNoData(session=self, oid=oid))
+        return responses
+
+    @operation
     def walk(self, oid):
         try:
             data = self.session.walk(oid)
@@ -55,35 +122,56 @@ class NetSNMPCompat(SNMPCompat):
         except (SNMPError, SystemError) as e:
             raise get_exception(str(e))(e, self, oid)
 
+    def iter_walk(self, oid, max_repetitions=10, adaptive=False):
+        # netsnmp-py walks using a generator with GETNEXT
+        try:
+            for element in self.session.walk(oid):
+                yield convert_response(element)
+        except (SNMPError, SystemError) as e:
+            raise get_exception(str(e))(e, self, oid)
+
 
 class NetSNMPResponse(SNMPResponse):
+    __slots__ = ()
+    type_codes = {
+        'INTEGER': SNMPType.INTEGER,
+        'STRING': SNMPType.OCTET_STRING,
+        'Hex-STRING': SNMPType.OCTET_STRING,
+        'OID': SNMPType.OBJECT_ID,
+        'IpAddress': SNMPType.IP_ADDRESS,
+        'Counter32': SNMPType.COUNTER32,
+        'Gauge32': SNMPType.GAUGE32,
+        'Timeticks': SNMPType.TIMETICKS,
+        'Opaque': SNMPType.OPAQUE,
+        'Counter64': SNMPType.COUNTER64,
+        'NULL': SNMPType.NULL,
+        'BITSTR': SNMPType.BITS,
+    }
+    # NULL responses raise SNMPNoData when created
+    decoders = {
+        'STRING': string_value,
+        'INTEGER': int,
+        'Gauge32': int,
+        'Counter32': int,
+        'Timeticks': timeticks_value,
+        'Hex-STRING': hex_value,
+    }
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if self.snmp_type == 'NULL':
             raise snmp_exceptions.SNMPNoData(oid=self.oid)
 
-    def typed_value(self):
+    def raw_value(self):
         if self.snmp_type == 'STRING':
-            return self.value.replace('"', '')
-        elif self.snmp_type in ['INTEGER', 'Gauge32', 'Counter32']:
-            return int(self.value)
-        elif self.snmp_type == 'Timeticks':
-            matches = re.findall(r'[0-9]+', self.value)
-            return timedelta(days=int(matches[0]), hours=int(matches[1]), minutes=int(matches[2]),
-                             seconds=int(matches[3]), milliseconds=int(matches[4]))
+            return string_value(self.value).encode('latin-1')
         elif self.snmp_type == 'Hex-STRING':
-            matches = re.findall(r'([A-F0-9]{2})\s', self.value)
-            value = ''
-            for byte in matches:
-                octet = int(byte, 16)
-                if octet <= 0x0f:
-                    value += '0'
-                value += format(octet, 'x')
-            return value
-        elif self.snmp_type == 'NULL':
-            raise snmp_exceptions.SNMPNoData(oid=self.oid)
-        else:
-            return self.value
+            return bytes.fromhex(self.value.replace('"', ''))
+        elif self.snmp_type == 'Timeticks':
+            return timeticks_ticks(self.value)
+        elif self.snmp_type == 'IpAddress':
+            return socket.inet_aton(self.value)
+        return super().raw_value()
 
     def hex_string(self):
         if self.snmp_type == 'Hex-STRING':
@@ -1,57 +1,139 @@
 import asyncio
-import datetime
-from typing import List
+from typing import AsyncIterator, List
 
+from pyasn1.type import univ
 from pysnmp.error import PySnmpError
 from pysnmp.hlapi.v3arch.asyncio import *
 
 from snmp_compat import SNMPCompat, SNMPResponse, snmp_exceptions
+from snmp_compat.compat import BulkRepetitions, WalkPosition, operation
+from snmp_compat.oid import OID
+from snmp_compat.response import SNMPType, timeticks
+
+
+def octet_string_value(value: bytes) -> str:
+    string = value.decode(OctetString.encoding)
+    if string.isprintable():
+        return string
+    return value.hex()
 
 
 class PYSNMPResponse(SNMPResponse):
+    """
+    Response with the value from the pysnmp object, snmp_type is the pysnmp class
+    """
+    __slots__ = ()
     value: any
-    _response = None
+    type_codes = {
+        Integer: SNMPType.INTEGER,
+        Integer32: SNMPType.INTEGER,
+        OctetString: SNMPType.OCTET_STRING,
+        ObjectIdentifier: SNMPType.OBJECT_ID,
+        univ.ObjectIdentifier: SNMPType.OBJECT_ID,
+        IpAddress: SNMPType.IP_ADDRESS,
+        Counter32: SNMPType.COUNTER32,
+        Gauge32: SNMPType.GAUGE32,
+        Unsigned32: SNMPType.GAUGE32,
+        TimeTicks: SNMPType.TIMETICKS,
+        Opaque: SNMPType.OPAQUE,
+        Counter64: SNMPType.COUNTER64,
+        Null: SNMPType.NULL,
+        univ.Null: SNMPType.NULL,
+        Bits: SNMPType.BITS,
+    }
+    # Values of other types are converted to string by the pysnmp class
+    decoders = {
+        Integer32: int,
+        Counter32: int,
+        Counter64: int,
+        Gauge32: int,
+        TimeTicks: timeticks,
+        OctetString: octet_string_value,
+    }
 
     def __init__(self, oid=None, oid_index=None, response=None, snmp_type=None):
         # noinspection PyProtectedMember
-        value = response._value
-        self._response = response
-        super().__init__(oid, oid_index, value, snmp_type)
+        super().__init__(oid, oid_index, response._value, snmp_type)
+
+    def raw_value(self):
+        if self.type_code == SNMPType.OBJECT_ID:
+            return ('.' + '.'.join(map(str, self.value))).encode('ascii')
+        return super().raw_value()
 
     def hex_string(self):
-        string = ''
-        for octet in self._response.asOctets():
-            if octet <= 0x0f:
-                string += '0'
-            # Format as lower case hex digit without prefix
-            string += format(octet, 'x')
-        return string
+        return bytes(self.value).hex()
 
     def typed_value(self):
-        if type(self._response) in [Integer32, Counter32, Counter64, Gauge32]:
-            return self.value
-        elif self.snmp_type == TimeTicks:
-            return datetime.timedelta(seconds=int(self._response) / 100)
-        elif self.snmp_type == OctetString:
-            string_value = str(self._response)
-            if self.value == b'':
-                return ''
-            for char in string_value:
-                if not char.isprintable():
-                    return self.hex_string()
-            return string_value
-        else:
-            return str(self._response)
+        decoder = self.decoders.get(self.snmp_type)
+        if decoder is None:
+            return str(self.snmp_type(self.value))
+        return decoder(self.value)
+
+
+class PySNMPEngine:
+    """
+    A SnmpEngine and the event loop it runs on, shared by one or more PySNMPCompat sessions
+
+    :param loop: run on an existing event loop instead of creating a new one
+    """
+    loop: asyncio.AbstractEventLoop = None
+    snmp_engine: SnmpEngine = None
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None):
+        self._own_loop = loop is None
+        self.loop = loop or asyncio.new_event_loop()
+        self.snmp_engine = SnmpEngine()
+
+    def run(self, coroutine):
+        """
+        Run a coroutine on the engine loop and return the result
+        If the loop is already running in another thread the coroutine is submitted to it
+        """
+        if self.loop.is_running():
+            if asyncio._get_running_loop() is self.loop:
+                # Waiting for the result would block the loop which should produce it
+                coroutine.close()
+                raise RuntimeError('The engine loop is running in this thread, use the async methods like get_async')
+            return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+        return self.loop.run_until_complete(coroutine)
+
+    def close(self):
+        self.snmp_engine.close_dispatcher()
+        if self._own_loop and not self.loop.is_closed():
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
 
 
 class PySNMPCompat(SNMPCompat):
     _transport: UdpTransportTarget = None
+    _connect_lock: asyncio.Lock = None
+    engine: PySNMPEngine = None
 
-    def __init__(self, hostname, community, version=0, timeout=0.5, retries=1):
-        super().__init__(hostname, community)
+    def __init__(self, hostname, community, version=0, timeout=0.5, retries=1, engine: PySNMPEngine = None):
+        """
+        :param engine: Engine to share with other sessions, a new engine is created if not specified
+        """
+        super().__init__(hostname, community, version, timeout, retries)
 
         self.community_data = CommunityData(community, mpModel=version)  # 1= SNMPv2c
-        asyncio.run(self._async_connect())
+        self._own_engine = engine is None
+        self.engine = engine or PySNMPEngine()
+        # Sessions created from inside a running loop connects on first request
+        if not self.engine.loop.is_running():
+            try:
+                self.engine.run(self._async_connect())
+            except snmp_exceptions.SNMPConnectionError:
+                self.close()
+                raise
+
+    def close(self):
+        if self._own_engine:
+            self.engine.close()
+
+    def _apply_timeout(self):
+        if self._transport is not None:
+            self._transport.timeout = self.timeout
+            self._transport.retries = self.retries
 
     def _convert_response(self, response, oid: str = None):
         error_indication, error_status, error_index, var_binds = response
@@ -68,39 +150,137 @@ class PySNMPCompat(SNMPCompat):
 
     async def _async_connect(self):
         try:
-            self._transport = await UdpTransportTarget.create((self.hostname, 161))
+            self._transport = await UdpTransportTarget.create((self.hostname, 161), timeout=self.timeout,
+                                                              retries=self.retries)
         except PySnmpError as e:
             raise snmp_exceptions.SNMPConnectionError(e, self)
 
+    async def _transport_async(self) -> UdpTransportTarget:
+        if self._transport is None:
+            # Concurrent first requests of a session share one transport
+            if self._connect_lock is None:
+                self._connect_lock = asyncio.Lock()
+            async with self._connect_lock:
+                if self._transport is None:
+                    await self._async_connect()
+        return self._transport
+
     async def get_async(self, oid: str):
         obj = ObjectType(ObjectIdentity(oid))
-        response = await get_cmd(SnmpEngine(),
-                                 self.community_data, self._transport, ContextData(), obj)
+        response = await get_cmd(self.engine.snmp_engine, self.community_data, await self._transport_async(),
+                                 ContextData(), obj, lookupMib=False)
+        self._received()
         return self._convert_response(response, oid)
 
     async def get_next_async(self, oid: str):
         obj = ObjectType(ObjectIdentity(oid))
-        response = await next_cmd(SnmpEngine(),
-                                  self.community_data, self._transport, ContextData(), obj)
+        response = await next_cmd(self.engine.snmp_engine, self.community_data, await self._transport_async(),
+                                  ContextData(), obj, lookupMib=False)
+        self._received()
         return self._convert_response(response, oid)
 
+    def _check_error(self, error_indication, error_status, error_index, oids: List[str]):
+        if error_indication:
+            if str(error_indication) == 'No SNMP response received before timeout':
+                raise snmp_exceptions.SNMPTimeout(oid=oids[0], session=self)
+            raise snmp_exceptions.SNMPError(error_indication, self, oids[0])
+        if error_status:
+            if str(error_status) == 'tooBig':
+                raise snmp_exceptions.SNMPTooBig(oid=oids[0], session=self)
+            if str(error_status) == 'noSuchName':
+                raise snmp_exceptions.SNMPNoData(oid=oids[int(error_index) - 1], session=self)
+            raise snmp_exceptions.SNMPError(error_status, self, oids[0])
+
+    async def _get_many_async(self, oids: List[str]) -> list:
+        objs = [ObjectType(ObjectIdentity(oid)) for oid in oids]
+        error_indication, error_status, error_index, var_binds = await get_cmd(
+            self.engine.snmp_engine, self.community_data, await self._transport_async(), ContextData(), *objs,
+            lookupMib=False)
+        self._check_error(error_indication, error_status, error_index, oids)
+        self._received()
+
+        responses = []
+        for oid, (identity, response) in zip(oids, var_binds):
+            if isinstance(response, (NoSuchObject, NoSuchInstance)):
+                responses.append(snmp_exceptions.SNMPNoData(oid=oid, session=self))
+            else:
+                responses.append(PYSNMPResponse(oid='.' + str(identity), response=response, snmp_type=type(response)))
+        return responses
+
+    async def get_bulk_async(self, oids: List[str], non_repeaters=0, max_repetitions=10) -> List[SNMPResponse]:
+        objs = [ObjectType(ObjectIdentity(oid)) for oid in oids]
+        error_indication, error_status, error_index, var_binds = await bulk_cmd(
+            self.engine.snmp_engine, self.community_data, await self._transport_async(), ContextData(),
+            non_repeaters, max_repetitions, *objs, lookupMib=False)
+        self._check_error(error_indication, error_status, error_index, oids)
+        self._received()
+
+        return [PYSNMPResponse(oid='.' + str(identity), response=response, snmp_type=type(response))
+                for identity, response in var_binds if not isinstance(response, EndOfMibView)]
+
+    async def iter_walk_async(self, oid: str, max_repetitions=10, adaptive=False,
+                              non_repeaters=0) -> AsyncIterator[SNMPResponse]:
+        """
+        Walk and yield each response as it is received, GETBULK is used for SNMPv2c
+        """
+        repetitions = BulkRepetitions(max_repetitions, adaptive)
+        position = WalkPosition(oid)
+        while not position.complete:
+            if self._bulk_supported():
+                try:
+                    page = await self.get_bulk_async([position.next], non_repeaters, repetitions.value)
+                except snmp_exceptions.SNMPTooBig:
+                    if not repetitions.too_big():
+                        raise
+                    continue
+                repetitions.received(len(page))
+            else:
+                try:
+                    page = [await self.get_next_async(position.next)]
+                except snmp_exceptions.SNMPNoData:
+                    return
+
+            for entry in position.filter(page):
+                yield entry
+
+    async def bulkwalk_async(self, oid: str, max_repetitions=10, non_repeaters=0,
+                             adaptive=False) -> List[SNMPResponse]:
+        if not self._bulk_supported():
+            return await self.walk_async(oid)
+        return [entry async for entry in self.iter_walk_async(oid, max_repetitions, adaptive, non_repeaters)]
+
     async def walk_async(self, oid: str) -> List[SNMPResponse]:
         obj = ObjectType(ObjectIdentity(oid))
-        response = walk_cmd(SnmpEngine(),
-                            self.community_data, self._transport, ContextData(), obj)
+        response = walk_cmd(self.engine.snmp_engine, self.community_data, await self._transport_async(),
+                            ContextData(), obj, lookupMib=False)
+        root = OID(oid)
         entries = []
         async for entry in response:
             entry = self._convert_response(entry)
-            if entry.oid.find(oid[1:]) == -1:
+            if not OID(entry.oid).in_tree(root):
                 break
             entries.append(entry)
         return entries
 
+    @operation
     def get(self, oid: str) -> SNMPResponse:
-        return asyncio.run(self.get_async(oid))
+        return self.engine.run(self.get_async(oid))
 
+    @operation
     def get_next(self, oid: str) -> SNMPResponse:
-        return asyncio.run(self.get_next_async(oid))
+        return self.engine.run(self.get_next_async(oid))
+
+    @operation
+    def _get_many(self, oids: List[str]) -> list:
+        return self.engine.run(self._get_many_async(oids))
+
+    def _bulk_supported(self) -> bool:
+        return self.community_data.message_processing_model > 0
+
+    @operation
+    def get_bulk(self, oids: List[str], non_repeaters=0, max_repetitions=10) -> List[SNMPResponse]:
+        return self.engine.run(self.get_bulk_async(oids, non_repeaters, max_repetitions))
 
+    @operation
     def walk(self, oid: str) -> List[SNMPResponse]:
-        return asyncio.run(self.walk_async(oid))
+        return self.engine.run(self.walk_async(oid))
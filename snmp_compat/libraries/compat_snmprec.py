@@ -0,0 +1,239 @@
+import bisect
+import os
+import random
+import socket
+import threading
+import time
+from typing import Dict, List, Optional
+
+from snmp_compat import SNMPCompat, snmp_exceptions
+from snmp_compat.compat import operation
+from snmp_compat.oid import OID, normalize
+# snmprec type tags are the BER tags of the types
+from .ber import INTEGER_TAGS, BERResponse
+
+
+def decode_value(tag: int, value: str, hex_encoded: bool):
+    """
+    Convert a value from a snmprec file to int for integer types, str for OIDs and IP addresses and bytes or str for
+    other types
+    """
+    if hex_encoded:
+        value = bytes.fromhex(value)
+    if tag in INTEGER_TAGS:
+        return int(value)
+    elif tag == 6:
+        return '.' + (value.decode('ascii') if hex_encoded else value).lstrip('.')
+    elif tag == 64 and hex_encoded:
+        return socket.inet_ntoa(value)
+    elif tag == 5:
+        return None
+    return value
+
+
+class SnmprecIndex:
+    """
+    Records of a snmprec file sorted by OID
+    """
+
+    def __init__(self, file: str):
+        records = []
+        with open(file, encoding='utf-8', errors='surrogateescape') as fp:
+            for line in fp:
+                line = line.rstrip('\r\n')
+                if not line or line.startswith('#'):
+                    continue
+                oid, tag, value = line.split('|', 2)
+                # Records using variation modules are skipped
+                if ':' in tag:
+                    continue
+                hex_encoded = tag.endswith('x')
+                tag = int(tag.rstrip('x'))
+                records.append((OID(oid), '.' + oid.lstrip('.'), tag, decode_value(tag, value, hex_encoded)))
+        records.sort(key=lambda record: record[0])
+
+        self.keys: List[OID] = [record[0] for record in records]
+        self.oids: List[str] = [record[1] for record in records]
+        self.tags: List[int] = [record[2] for record in records]
+        self.values: list = [record[3] for record in records]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def find(self, key: OID) -> Optional[int]:
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return position
+        return None
+
+    def next(self, key: OID) -> int:
+        """
+        Position of the first record after key, equal to the number of records at the end of the MIB view
+        """
+        return bisect.bisect_right(self.keys, key)
+
+    def response(self, position: int) -> BERResponse:
+        return BERResponse(self.oids[position], None, self.values[position], self.tags[position])
+
+
+_indexes: Dict[str, SnmprecIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def load_index(file: str) -> SnmprecIndex:
+    """
+    Load a snmprec file, each file is loaded once and shared by all sessions
+    """
+    file = os.path.abspath(file)
+    index = _indexes.get(file)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(file)
+            if index is None:
+                index = _indexes[file] = SnmprecIndex(file)
+    return index
+
+
+class AgentProfile:
+    """
+    Behaviour of a simulated agent
+
+    :param latency: Seconds from sending a request until the response is received
+    :param jitter: Extra latency, uniformly distributed between 0 and jitter seconds
+    :param loss: Probability that a request or its response is lost, 1 gives an agent which never responds
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+
+    def __repr__(self):
+        return '<AgentProfile latency=%s jitter=%s loss=%s>' % (self.latency, self.jitter, self.loss)
+
+
+# Profiles by hostname, the profile with key None is used for other hosts
+profiles: Dict[Optional[str], AgentProfile] = {}
+
+
+class SnmprecCompat(SNMPCompat):
+    """
+    Simulated agent answering from snmprec files without network access
+
+    The community selects the file <data_dir>/<community>.snmprec like snmpsim, requests with a community without a
+    file time out. Latency and loss are simulated for each request PDU according to the AgentProfile for the
+    hostname, see profiles. A GETNEXT walk sends one PDU for each row.
+
+    :param data_dir: Directory with snmprec files, defaults to the SNMPREC_DATA_DIR environment variable
+    :param profile: Agent behaviour, overrides profiles
+    :param seed: Seed for the random numbers used for jitter and loss
+    """
+
+    def __init__(self, hostname, community, version=0, timeout=0.5, retries=1, data_dir: str = None,
+                 profile: AgentProfile = None, seed=None):
+        super().__init__(hostname, community, version, timeout, retries)
+        self.version = version
+        if data_dir is None:
+            if 'SNMPREC_DATA_DIR' not in os.environ:
+                raise AttributeError('data_dir argument not set and SNMPREC_DATA_DIR environment variable not set')
+            data_dir = os.environ['SNMPREC_DATA_DIR']
+        file = os.path.join(data_dir, community + '.snmprec')
+        self.index = load_index(file) if os.path.exists(file) else None
+        self.profile = profile or profiles.get(hostname) or profiles.get(None)
+        self.random = random.Random(seed)
+
+    def _apply_timeout(self):
+        # The timeout is read for each request
+        pass
+
+    def _exchange(self, oid):
+        """
+        Simulate sending a request PDU and waiting for the response
+        """
+        if self.index is None:
+            # Agents do not respond to unknown communities
+            time.sleep(self.timeout * (self.retries + 1))
+            raise snmp_exceptions.SNMPTimeout(oid=oid, session=self)
+        profile = self.profile
+        if profile is None:
+            return
+        for _ in range(self.retries + 1):
+            delay = profile.latency + self.random.random() * profile.jitter
+            if self.random.random() >= profile.loss and delay <= self.timeout:
+                if delay > 0:
+                    time.sleep(delay)
+                return
+            time.sleep(self.timeout)
+        raise snmp_exceptions.SNMPTimeout(oid=oid, session=self)
+
+    def _key(self, oid: str) -> OID:
+        try:
+            return OID(oid)
+        except ValueError as e:
+            raise snmp_exceptions.SNMPError(e, self, oid)
+
+    @operation
+    def get(self, oid):
+        self._exchange(oid)
+        position = self.index.find(self._key(oid))
+        if position is None:
+            raise snmp_exceptions.SNMPNoData(session=self, oid=normalize(oid))
+        return self.index.response(position)
+
+    @operation
+    def get_next(self, oid):
+        self._exchange(oid)
+        position = self.index.next(self._key(oid))
+        if position == len(self.index):
+            raise snmp_exceptions.SNMPNoData(session=self, oid=normalize(oid))
+        return self.index.response(position)
+
+    @operation
+    def _get_many(self, oids):
+        self._exchange(oids[0])
+        responses = []
+        for oid in oids:
+            position = self.index.find(self._key(oid))
+            if position is not None:
+                responses.append(self.index.response(position))
+            elif self.version == 0:
+                # SNMPv1 fails the whole PDU
+                raise snmp_exceptions.SNMPNoData(session=self, oid=normalize(oid))
+            else:
+                responses.append(snmp_exceptions.SNMPNoData(session=self, oid=normalize(oid)))
+        return responses
+
+    @operation
+    def walk(self, oid):
+        root = self._key(oid)
+        self._exchange(oid)
+        position = self.index.next(root)
+        entries = []
+        while position < len(self.index) and self.index.keys[position].in_tree(root):
+            entries.append(self.index.response(position))
+            position += 1
+            self._exchange(oid)
+        return entries
+
+    def _bulk_supported(self) -> bool:
+        return self.version > 0
+
+    @operation
+    def get_bulk(self, oids, non_repeaters=0, max_repetitions=10):
+        self._exchange(oids[0])
+        end = len(self.index)
+        responses = []
+        for oid in oids[:non_repeaters]:
+            position = self.index.next(self._key(oid))
+            if position < end:
+                responses.append(self.index.response(position))
+
+        positions = [self.index.next(self._key(oid)) for oid in oids[non_repeaters:]]
+        for repetition in range(max_repetitions):
+            if all(position >= end for position in positions):
+                break
+            for position in positions:
+                # Varbinds beyond the end of the MIB view are not returned
+                if position + repetition < end:
+                    responses.append(self.index.response(position + repetition))
+        return responses
@@ -1,6 +1,24 @@
 import datetime
 
 from snmp_compat import SNMPCompat, SNMPResponse
+from snmp_compat.response import SNMPType, hex_string, timeticks
+
+
+def octet_string_value(value: str) -> str:
+    """
+    Convert values with characters which are not printable or whitespace to hex string, match C code in netsnmp-py3
+    https://github.com/xstaticxgpx/netsnmp-py3/blob/a8c83851351f04a304ff81dbbd1d92433a43eac4/netsnmp/interface.c#L90
+    """
+    if value.isprintable():
+        return value
+    for char in value:
+        if not char.isprintable() and not char.isspace():
+            return hex_string(value)
+    return value
+
+
+def ticks_value(value: str) -> datetime.timedelta:
+    return timeticks(int(value))
 
 
 class EasySNMPCommon(SNMPCompat):
@@ -11,20 +29,28 @@ class EasySNMPResponse(SNMPResponse):
     """
     Common methods for EasySNMP and its fork EzSNMP
     """
-
-    def typed_value(self):
-        if self.snmp_type == 'OCTETSTR':
-            # Detect hex string, match C code in netsnmp-py3
-            # https://github.com/xstaticxgpx/netsnmp-py3/blob/a8c83851351f04a304ff81dbbd1d92433a43eac4/netsnmp/interface.c#L90
-            for char in self.value:
-                if not char.isprintable() and not char.isspace():
-                    return self.hex_string()
-            return self.value
-        elif self.snmp_type in ['INTEGER', 'COUNTER', 'COUNTER64', 'GAUGE']:
-            return int(self.value)
-        elif self.snmp_type == 'TICKS':
-            return datetime.timedelta(seconds=int(self.value) / 100)
-        elif self.snmp_type == 'OBJECTID':
-            return self.value  # Value 'ccitt.0.0'
-        else:
-            return self.value
+    __slots__ = ()
+    type_codes = {
+        'INTEGER': SNMPType.INTEGER,
+        'UINTEGER': SNMPType.GAUGE32,
+        'OCTETSTR': SNMPType.OCTET_STRING,
+        'OBJECTID': SNMPType.OBJECT_ID,
+        'IPADDR': SNMPType.IP_ADDRESS,
+        'NETADDR': SNMPType.IP_ADDRESS,
+        'COUNTER': SNMPType.COUNTER32,
+        'GAUGE': SNMPType.GAUGE32,
+        'TICKS': SNMPType.TIMETICKS,
+        'OPAQUE': SNMPType.OPAQUE,
+        'COUNTER64': SNMPType.COUNTER64,
+        'NULL': SNMPType.NULL,
+        'BITS': SNMPType.BITS,
+    }
+    # OBJECTID values are returned as is, like 'ccitt.0.0'
+    decoders = {
+        'OCTETSTR': octet_string_value,
+        'INTEGER': int,
+        'COUNTER': int,
+        'COUNTER64': int,
+        'GAUGE': int,
+        'TICKS': ticks_value,
+    }
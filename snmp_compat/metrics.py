@@ -0,0 +1,162 @@
+import bisect
+import threading
+import time
+import weakref
+from typing import Dict, List, Tuple
+
+from . import snmp_exceptions
+from .compat import OperationHook, SNMPCompat
+from .response import SNMPResponse
+
+# Upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class OperationMetrics:
+    """
+    Counters and latency histogram for one operation on one host
+
+    wire_seconds and conversion_seconds split the time of requests where the backend reports when the response was
+    received, walks sending several requests from the backend are only counted in seconds_sum.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # Count of requests in each bucket, not cumulative, the last element is the +Inf bucket
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.seconds_sum = 0.0
+        self.requests = 0
+        self.wire_seconds = 0.0
+        self.conversion_seconds = 0.0
+        self.varbinds = 0
+        self.retries = 0
+        self.errors: Dict[str, int] = {}
+
+    def __repr__(self):
+        return '<OperationMetrics requests=%d errors=%d seconds=%.3f>' % (
+            self.requests, sum(self.errors.values()), self.seconds_sum)
+
+    def observe(self, seconds: float):
+        self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.seconds_sum += seconds
+        self.requests += 1
+
+    def cumulative_counts(self) -> List[int]:
+        counts = []
+        total = 0
+        for count in self.bucket_counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+def _label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics(OperationHook):
+    """
+    Record latency, requests, varbinds, retries and errors for each host and operation
+
+    Add it to sessions with SNMPCompat.add_hook, an instance can be shared by sessions and threads. Sessions without
+    hooks are not affected. Add it after AdaptiveTimeout to count each attempt as a request, a request repeating an
+    operation and OID that timed out on the same session is counted as a retry. Retries sent by the backend library
+    are not visible.
+
+    :param buckets: Upper bounds of the latency histogram buckets in seconds
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.operations: Dict[Tuple[str, str], OperationMetrics] = {}
+        self._timed_out = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def metrics(self, hostname: str, operation: str) -> OperationMetrics:
+        metrics = self.operations.get((hostname, operation))
+        if metrics is None:
+            with self._lock:
+                metrics = self.operations.setdefault((hostname, operation), OperationMetrics(self.buckets))
+        return metrics
+
+    def __call__(self, session: SNMPCompat, operation: str, oid, request):
+        # get_many sends its requests with _get_many, export it with the public name
+        operation = operation.lstrip('_')
+        metrics = self.metrics(session.hostname, operation)
+        session.received_at = None
+        start = time.perf_counter()
+        result = error = None
+        try:
+            result = request()
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            end = time.perf_counter()
+            received_at = session.received_at
+            # Consume the mark, a hook around an enclosing operation must not use it
+            session.received_at = None
+            with self._lock:
+                metrics.observe(end - start)
+                if received_at is not None:
+                    metrics.wire_seconds += received_at - start
+                    metrics.conversion_seconds += end - received_at
+                if self._timed_out.pop(session, None) == (operation, oid):
+                    metrics.retries += 1
+                if error is None:
+                    metrics.varbinds += self._count_varbinds(result)
+                else:
+                    name = type(error).__name__
+                    metrics.errors[name] = metrics.errors.get(name, 0) + 1
+                    if isinstance(error, snmp_exceptions.SNMPTimeout):
+                        self._timed_out[session] = (operation, oid)
+
+    @staticmethod
+    def _count_varbinds(result) -> int:
+        if isinstance(result, SNMPResponse):
+            return 1
+        if isinstance(result, list):
+            return sum(1 for response in result if not isinstance(response, snmp_exceptions.SNMPError))
+        return 0
+
+    def prometheus(self, prefix: str = 'snmp') -> str:
+        """
+        Export the metrics in the Prometheus text exposition format
+
+        :param prefix: Prefix for the metric names
+        """
+        with self._lock:
+            operations = sorted(self.operations.items())
+            counts = [metrics.cumulative_counts() for _, metrics in operations]
+
+        lines = ['# HELP %s_request_duration_seconds Time from sending a request until the response is converted' % (
+            prefix), '# TYPE %s_request_duration_seconds histogram' % prefix]
+        for ((hostname, operation), metrics), cumulative in zip(operations, counts):
+            labels = 'host="%s",operation="%s"' % (_label(hostname), _label(operation))
+            for bound, count in zip(self.buckets + ('+Inf',), cumulative):
+                lines.append('%s_request_duration_seconds_bucket{%s,le="%s"} %d' % (prefix, labels, bound, count))
+            lines.append('%s_request_duration_seconds_sum{%s} %r' % (prefix, labels, metrics.seconds_sum))
+            lines.append('%s_request_duration_seconds_count{%s} %d' % (prefix, labels, cumulative[-1]))
+
+        counters = [
+            ('requests_total', 'Requests sent, a walk done by the backend library is one request', 'requests'),
+            ('varbinds_total', 'Varbinds returned', 'varbinds'),
+            ('retries_total', 'Requests repeated after a timeout', 'retries'),
+            ('wire_seconds_total', 'Time spent waiting for the agent', 'wire_seconds'),
+            ('conversion_seconds_total', 'Time spent converting responses', 'conversion_seconds'),
+        ]
+        for name, description, attribute in counters:
+            lines.append('# HELP %s_%s %s' % (prefix, name, description))
+            lines.append('# TYPE %s_%s counter' % (prefix, name))
+            for (hostname, operation), metrics in operations:
+                lines.append('%s_%s{host="%s",operation="%s"} %r' % (
+                    prefix, name, _label(hostname), _label(operation), getattr(metrics, attribute)))
+
+        lines.append('# HELP %s_errors_total Failed requests by exception type' % prefix)
+        lines.append('# TYPE %s_errors_total counter' % prefix)
+        for (hostname, operation), metrics in operations:
+            for error, count in sorted(metrics.errors.items()):
+                lines.append('%s_errors_total{host="%s",operation="%s",error="%s"} %d' % (
+                    prefix, _label(hostname), _label(operation), _label(error), count))
+        return '\n'.join(lines) + '\n'
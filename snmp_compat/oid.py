@@ -0,0 +1,76 @@
+import functools
+from typing import Iterable, Union
+
+
+def normalize(oid: str) -> str:
+    """
+    Convert an OID to the format used in responses, with leading dot and iso replaced by 1
+    Symbolic OIDs are returned unchanged
+    """
+    if oid.startswith('.iso'):
+        return '.1' + oid[4:]
+    elif oid.startswith('iso'):
+        return '.1' + oid[3:]
+    elif oid[:1].isdigit():
+        return '.' + oid
+    return oid
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse(oid: str) -> 'OID':
+    oid = normalize(oid).strip('.')
+    if not oid:
+        return OID.EMPTY
+    return tuple.__new__(OID, map(int, oid.split('.')))
+
+
+class OID(tuple):
+    """
+    Numeric object identifier stored as a tuple of sub-identifiers
+
+    OIDs compare in lexicographic order like the agent orders them, and hash as tuples. Slices are plain tuples.
+    Strings can be dotted with or without leading dot or start with iso, parsed strings are cached so parsing the same
+    string again returns the same object. Symbolic names raise ValueError.
+    """
+    __slots__ = ()
+    EMPTY: 'OID'
+
+    def __new__(cls, oid: Union[str, Iterable[int]] = ()):
+        if isinstance(oid, str):
+            return _parse(oid)
+        if type(oid) is cls:
+            return oid
+        return tuple.__new__(cls, oid)
+
+    def __str__(self):
+        return '.' + '.'.join(map(str, self))
+
+    def __repr__(self):
+        return "OID('%s')" % self
+
+    def startswith(self, prefix: tuple) -> bool:
+        """
+        Check if the OID is equal to prefix or in the subtree below it
+        """
+        return self[:len(prefix)] == prefix
+
+    def in_tree(self, root: tuple) -> bool:
+        """
+        Check if the OID is in the subtree below root, root itself is not in the tree
+        """
+        return len(self) > len(root) and self[:len(root)] == root
+
+    def suffix(self, root: tuple) -> 'OID':
+        """
+        Get the sub-identifiers after root, like the index of a table column
+        """
+        return OID(self[len(root):])
+
+    def index_string(self, root: tuple) -> str:
+        """
+        Get the sub-identifiers after root as a string without leading dot
+        """
+        return '.'.join(map(str, self[len(root):]))
+
+
+OID.EMPTY = tuple.__new__(OID)
@@ -0,0 +1,141 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Iterable, Iterator, List, Sequence, Type, Union
+
+from . import snmp_exceptions
+from .compat import OperationHook, SNMPCompat, select
+from .jobs import PollJob, PollResult
+
+
+class ThreadedPoller:
+    """
+    Poll many hosts concurrently with a pool of threads, for the backends wrapping blocking C libraries
+
+    Each thread has its own session for each host, sessions are kept until the poller is closed and reused by the
+    following polls. Get jobs use get_many to request all OIDs of the job in as few PDUs as possible.
+
+    Threads only poll in parallel when the backend releases the GIL while waiting for the agent.
+    netsnmp-py and ezsnmp release the GIL during requests and scale with the number of threads.
+    easysnmp has not been verified, run benchmarks/bench_parallel.py to check the scaling of a backend.
+    pysnmp should use AsyncPoller instead.
+
+    :param library: Backend name or SNMPCompat class, defaults to the SNMP_LIBRARY environment variable
+    :param workers: Number of threads
+    :param version: Session version argument, None uses the default of the backend
+    :param timeout: Session timeout argument, None uses the default of the backend
+    :param retries: Session retries argument, None uses the default of the backend
+    :param hooks: Hooks added to each new session, for example a shared CircuitBreaker
+    """
+    session_class: Type[SNMPCompat]
+
+    def __init__(self, library: Union[str, Type[SNMPCompat]] = None, workers: int = 16, version=None, timeout=None,
+                 retries=None, hooks: Sequence[OperationHook] = ()):
+        if isinstance(library, type):
+            self.session_class = library
+        else:
+            self.session_class = select(library)
+        self.workers = workers
+        self.session_kwargs = {name: value for name, value in
+                               [('version', version), ('timeout', timeout), ('retries', retries)] if value is not None}
+        self.hooks = list(hooks)
+        self._executor = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: List[SNMPCompat] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+
+    def _session(self, job: PollJob) -> SNMPCompat:
+        sessions = getattr(self._local, 'sessions', None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+        key = (job.hostname, job.community)
+        session = sessions.get(key)
+        if session is None:
+            session = sessions[key] = self.session_class(job.hostname, job.community, **self.session_kwargs)
+            for hook in self.hooks:
+                session.add_hook(hook)
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        Thread pool running the jobs, created on first use
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='snmp-poller')
+        return self._executor
+
+    def poll_job(self, job: PollJob) -> List[PollResult]:
+        """
+        Poll a single job in the calling thread, using the sessions of the thread
+        """
+        try:
+            session = self._session(job)
+            if job.operation == 'get':
+                responses = session.get_many(list(job.oids))
+        except Exception as e:
+            # An unexpected error fails only the job, not the whole poll
+            return [PollResult(job, oid, error=e) for oid in job.oids]
+
+        if job.operation == 'get':
+            return [PollResult(job, oid, error=response) if isinstance(response, snmp_exceptions.SNMPError)
+                    else PollResult(job, oid, response) for oid, response in zip(job.oids, responses)]
+
+        results = []
+        for oid in job.oids:
+            try:
+                results.append(PollResult(job, oid, getattr(session, job.operation)(oid)))
+            except Exception as e:
+                results.append(PollResult(job, oid, error=e))
+        return results
+
+    def poll(self, jobs: Iterable[Union[PollJob, tuple]]) -> Iterator[PollResult]:
+        """
+        Poll all jobs and yield results as each job completes
+        Jobs can be PollJob objects or (hostname, community, oids) tuples, jobs are read from the iterable as
+        workers become available
+        """
+        executor = self.executor
+        pending = set()
+        try:
+            for job in jobs:
+                if not isinstance(job, PollJob):
+                    job = PollJob(*job)
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from self._results(done)
+                pending.add(executor.submit(self.poll_job, job))
+
+            yield from self._results(as_completed(pending))
+            pending = set()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def _results(futures: Iterable[Future]) -> Iterator[PollResult]:
+        for future in futures:
+            yield from future.result()
+
+    def run(self, jobs: Iterable[Union[PollJob, tuple]]) -> List[PollResult]:
+        """
+        Blocking version of poll, returns all results in completion order
+        """
+        return list(self.poll(jobs))
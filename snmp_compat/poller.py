@@ -0,0 +1,96 @@
+import asyncio
+from typing import AsyncIterator, Dict, Iterable, List, Union
+
+from snmp_compat import SNMPCompat, snmp_exceptions
+from snmp_compat.jobs import PollJob, PollResult
+
+
+def async_backend(library: str) -> tuple:
+    """
+    Get the session and engine classes of a backend with async methods
+    """
+    if library == 'pysnmp':
+        from .libraries.compat_pysnmp import PySNMPCompat, PySNMPEngine
+        return PySNMPCompat, PySNMPEngine
+    elif library == 'asyncudp':
+        from .libraries.compat_asyncudp import AsyncUDPCompat, AsyncUDPEngine
+        return AsyncUDPCompat, AsyncUDPEngine
+    else:
+        raise AttributeError('Library %s does not support asyncio' % library)
+
+
+class AsyncPoller:
+    """
+    Poll many hosts concurrently on one event loop using the async methods of pysnmp or asyncudp
+
+    :param concurrency: Maximum number of requests in flight
+    :param per_host: Maximum number of requests in flight to a single host
+    :param library: pysnmp or asyncudp
+    """
+
+    def __init__(self, concurrency: int = 256, per_host: int = 4, version=1, timeout=0.5, retries=1,
+                 library: str = 'pysnmp'):
+        self.session_class, self.engine_class = async_backend(library)
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.version = version
+        self.timeout = timeout
+        self.retries = retries
+
+    async def _poll_oid(self, session: SNMPCompat, job: PollJob, oid: str,
+                        limit: asyncio.Semaphore, host_limit: asyncio.Semaphore) -> PollResult:
+        # Wait for the host before taking a global slot, tasks waiting for a busy host must not block other hosts
+        async with host_limit, limit:
+            try:
+                response = await getattr(session, job.operation + '_async')(oid)
+                return PollResult(job, oid, response)
+            except Exception as e:
+                # An unexpected error fails only the OID, not the whole poll
+                return PollResult(job, oid, error=e)
+
+    async def poll(self, jobs: Iterable[Union[PollJob, tuple]]) -> AsyncIterator[PollResult]:
+        """
+        Poll all jobs and yield results as they complete
+        Jobs can be PollJob objects or (hostname, community, oids) tuples, jobs are read from the iterable as
+        requests complete
+        """
+        engine = self.engine_class(asyncio.get_running_loop())
+        limit = asyncio.Semaphore(self.concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        pending = set()
+
+        try:
+            for job in jobs:
+                if not isinstance(job, PollJob):
+                    job = PollJob(*job)
+                if job.hostname not in host_limits:
+                    host_limits[job.hostname] = asyncio.Semaphore(self.per_host)
+
+                session = self.session_class(job.hostname, job.community, self.version, self.timeout,
+                                             self.retries, engine=engine)
+                for oid in job.oids:
+                    if len(pending) >= self.concurrency * 2:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            yield task.result()
+                    pending.add(asyncio.ensure_future(
+                        self._poll_oid(session, job, oid, limit, host_limits[job.hostname])))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            engine.close()
+
+    def run(self, jobs: Iterable[Union[PollJob, tuple]]) -> List[PollResult]:
+        """
+        Blocking version of poll, returns all results in completion order
+        """
+
+        async def collect():
+            return [result async for result in self.poll(jobs)]
+
+        return asyncio.run(collect())
@@ -0,0 +1,204 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Type, Union
+
+from . import snmp_exceptions
+from .compat import OperationHook, SNMPCompat, select
+
+
+class SessionPool:
+    """
+    Reuse sessions for the same host, community and settings instead of creating a new session for each request
+
+    A session is only handed out to one user at a time, sessions are returned to the pool after use.
+    Idle sessions are closed when the pool is full or when they have been idle longer than max_idle.
+    When max_sessions sessions are open acquire closes the oldest idle session, or waits for a session to be released
+    if all sessions are in use.
+
+    :param library: Backend name or SNMPCompat class, defaults to the SNMP_LIBRARY environment variable
+    :param max_size: Maximum number of idle sessions kept in the pool
+    :param max_idle: Seconds an idle session is kept in the pool
+    :param hooks: Hooks added to each new session, for example a shared CircuitBreaker
+    :param max_sessions: Maximum number of open sessions, idle and in use, None for no limit
+    """
+    session_class: Type[SNMPCompat]
+
+    def __init__(self, library: Union[str, Type[SNMPCompat]] = None, max_size: int = 64, max_idle: float = 300.0,
+                 hooks: Sequence[OperationHook] = (), max_sessions: int = None):
+        if isinstance(library, type):
+            self.session_class = library
+        else:
+            self.session_class = select(library)
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.hooks = list(hooks)
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        # Number of sessions created by the pool and not closed, including sessions being created
+        self._open = 0
+        # Idle sessions in the order they were released, with key and release time
+        self._idle: OrderedDict = OrderedDict()
+        self._by_key: Dict[tuple, List[SNMPCompat]] = {}
+        # Pool key of each session created by the pool
+        self._keys = weakref.WeakKeyDictionary()
+
+    def __len__(self):
+        return len(self._idle)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _key(self, hostname: str, community: str, version, timeout, retries) -> tuple:
+        return self.session_class, hostname, community, version, timeout, retries
+
+    def acquire(self, hostname: str, community: str, version=None, timeout=None, retries=None,
+                wait_timeout: float = None) -> SNMPCompat:
+        """
+        Get an idle session from the pool or create a new session
+        Arguments set to None use the default of the backend
+
+        :param wait_timeout: Seconds to wait for a session when max_sessions sessions are in use, None to wait
+         until a session is released
+        :raises TimeoutError: No session was released before wait_timeout
+        """
+        key = self._key(hostname, community, version, timeout, retries)
+        deadline = None if wait_timeout is None else time.monotonic() + wait_timeout
+        session = None
+        reserved = False
+        with self._available:
+            expired = self._expire()
+            while True:
+                sessions = self._by_key.get(key)
+                if sessions:
+                    session = sessions.pop()
+                    del self._idle[session]
+                    break
+                if self.max_sessions is None or self._open < self.max_sessions:
+                    self._open += 1
+                    reserved = True
+                    break
+                if self._idle:
+                    # Make room by closing an idle session with other settings
+                    expired.append(self._remove_oldest())
+                    continue
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._available.wait(remaining)
+        self._close(expired)
+        if session is not None:
+            return session
+        if not reserved:
+            raise TimeoutError('No session available after %s seconds, %d sessions in use' % (wait_timeout,
+                                                                                           self.max_sessions))
+
+        kwargs = {name: value for name, value in [('version', version), ('timeout', timeout), ('retries', retries)]
+                  if value is not None}
+        try:
+            session = self.session_class(hostname, community, **kwargs)
+        except BaseException:
+            with self._available:
+                self._open -= 1
+                self._available.notify()
+            raise
+        for hook in self.hooks:
+            session.add_hook(hook)
+        with self._lock:
+            self._keys[session] = key
+        return session
+
+    def release(self, session: SNMPCompat):
+        """
+        Return a session to the pool
+        """
+        with self._lock:
+            key = self._keys.get(session)
+            if key is None:
+                raise ValueError('Session does not belong to this pool')
+            if session in self._idle:
+                raise ValueError('Session is already released')
+            self._idle[session] = time.monotonic()
+            self._by_key.setdefault(key, []).append(session)
+            evicted = self._expire()
+            while len(self._idle) > self.max_size:
+                evicted.append(self._remove_oldest())
+            self._available.notify()
+        self._close(evicted)
+
+    def discard(self, session: SNMPCompat):
+        """
+        Close a session instead of returning it to the pool
+        """
+        with self._lock:
+            if session in self._idle:
+                self._remove(session)
+            elif self._keys.pop(session, None) is not None:
+                self._open -= 1
+                self._available.notify()
+        session.close()
+
+    @contextmanager
+    def session(self, hostname: str, community: str, version=None, timeout=None, retries=None,
+                wait_timeout: float = None) -> Iterator[SNMPCompat]:
+        """
+        Use a session from the pool in a with statement, the session is returned to the pool at the end of the block
+        Sessions which raised SNMPConnectionError are discarded
+        """
+        session = self.acquire(hostname, community, version, timeout, retries, wait_timeout)
+        try:
+            yield session
+        except snmp_exceptions.SNMPConnectionError:
+            self.discard(session)
+            raise
+        except BaseException:
+            self.release(session)
+            raise
+        else:
+            self.release(session)
+
+    def close(self):
+        """
+        Close all idle sessions
+        """
+        with self._lock:
+            sessions = list(self._idle)
+            self._idle.clear()
+            self._by_key.clear()
+            for session in sessions:
+                self._keys.pop(session, None)
+            self._open -= len(sessions)
+            self._available.notify_all()
+        self._close(sessions)
+
+    def _remove(self, session: SNMPCompat):
+        del self._idle[session]
+        key = self._keys.pop(session)
+        self._by_key[key].remove(session)
+        if not self._by_key[key]:
+            del self._by_key[key]
+        self._open -= 1
+        self._available.notify()
+
+    def _remove_oldest(self) -> SNMPCompat:
+        session = next(iter(self._idle))
+        self._remove(session)
+        return session
+
+    def _expire(self) -> List[SNMPCompat]:
+        expired = []
+        limit = time.monotonic() - self.max_idle
+        while self._idle and next(iter(self._idle.values())) < limit:
+            expired.append(self._remove_oldest())
+        return expired
+
+    @staticmethod
+    def _close(sessions: List[SNMPCompat]):
+        for session in sessions:
+            session.close()
@@ -0,0 +1,132 @@
+import time
+from array import array
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+from .oid import normalize
+from .response import SNMPResponse, SNMPType
+from .walk_result import WalkResult
+
+# Counter values wrap modulo these masks
+COUNTER_MASKS = {SNMPType.COUNTER32: 0xFFFFFFFF, SNMPType.COUNTER64: 0xFFFFFFFFFFFFFFFF}
+
+
+class _Sample:
+    __slots__ = ('result', 'timestamp', 'uptime')
+
+    def __init__(self, result: WalkResult, timestamp: float, uptime: Optional[int]):
+        self.result = result
+        self.timestamp = timestamp
+        self.uptime = uptime
+
+
+class RateCalculator:
+    """
+    Calculate per second rates of Counter32 and Counter64 values between polls
+
+    The previous sample is kept for each host and walked OID and matched to the new sample by OID.
+    Counter wraps are handled using the counter size from the response type.
+    If sysUpTime is passed and is lower than in the previous sample the agent has restarted and no rates are returned.
+    """
+
+    def __init__(self):
+        self._samples: Dict[Tuple[Hashable, Optional[str]], _Sample] = {}
+
+    def __len__(self):
+        return len(self._samples)
+
+    def remove(self, host: Hashable, oid: str = None):
+        """
+        Remove the previous sample of an OID or all OIDs of a host
+        """
+        for key in list(self._samples):
+            if key[0] == host and (oid is None or key[1] == normalize(oid)):
+                del self._samples[key]
+
+    def update(self, host: Hashable, samples: Union[WalkResult, Sequence[SNMPResponse]], timestamp: float = None,
+               uptime: int = None, as_numpy=False, oid: str = None):
+        """
+        Store a new sample and get the rates since the previous sample
+
+        :param host: Key for the sample, usually the hostname
+        :param samples: Counter values as a WalkResult or a list of responses
+        :param timestamp: Time of the poll in seconds, defaults to time.monotonic()
+        :param uptime: sysUpTime of the agent in ticks, used to detect restarts
+        :param as_numpy: Calculate with NumPy and return a float64 array with NaN for missing rates
+        :param oid: Walked OID, required to keep separate samples when several OIDs of the same host are polled
+        :return: Rate for each row in samples, None if there is no previous value or the row is not a counter
+        """
+        if not isinstance(samples, WalkResult):
+            samples = WalkResult.from_responses(samples)
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        key = (host, None if oid is None else normalize(oid))
+        previous = self._samples.get(key)
+        self._samples[key] = _Sample(samples, timestamp, uptime)
+
+        if previous is None or timestamp <= previous.timestamp or (
+                uptime is not None and previous.uptime is not None and uptime < previous.uptime):
+            return self._no_rates(len(samples), as_numpy)
+
+        interval = timestamp - previous.timestamp
+        if previous.result.oid_parts == samples.oid_parts and previous.result.oid_offsets == samples.oid_offsets:
+            previous_values = previous.result.ints
+            missing = None
+        else:
+            previous_values, missing = self._align(previous.result, samples)
+
+        if as_numpy:
+            return self._rates_numpy(samples, previous_values, missing, interval)
+
+        rates = []
+        for value, previous_value, type_code in zip(samples.ints, previous_values, samples.types):
+            mask = COUNTER_MASKS.get(type_code)
+            if mask is None:
+                rates.append(None)
+            else:
+                rates.append(((value - previous_value) & mask) / interval)
+        if missing:
+            for row in missing:
+                rates[row] = None
+        return rates
+
+    @staticmethod
+    def _align(previous: WalkResult, samples: WalkResult):
+        """
+        Get the previous values in the row order of samples, used when the rows have changed between polls
+        """
+        rows = {previous.oid_tuple(row): row for row in range(len(previous))}
+        values = array('q', bytes(8 * len(samples)))
+        missing = []
+        for row in range(len(samples)):
+            previous_row = rows.get(samples.oid_tuple(row))
+            if previous_row is None or previous.types[previous_row] != samples.types[row]:
+                missing.append(row)
+            else:
+                values[row] = previous.ints[previous_row]
+        return values, missing
+
+    @staticmethod
+    def _no_rates(count: int, as_numpy: bool):
+        if as_numpy:
+            import numpy
+
+            return numpy.full(count, numpy.nan)
+        return [None] * count
+
+    @staticmethod
+    def _rates_numpy(samples: WalkResult, previous_values: array, missing: Optional[List[int]], interval: float):
+        import numpy
+
+        values = numpy.frombuffer(samples.ints, dtype=numpy.int64).view(numpy.uint64)
+        previous_values = numpy.frombuffer(previous_values, dtype=numpy.int64).view(numpy.uint64)
+        types = numpy.frombuffer(samples.types, dtype=numpy.uint8)
+
+        # Unsigned subtraction wraps modulo 2^64, Counter32 deltas are masked to 32 bits
+        masks = numpy.where(types == SNMPType.COUNTER32, numpy.uint64(COUNTER_MASKS[SNMPType.COUNTER32]),
+                            numpy.uint64(COUNTER_MASKS[SNMPType.COUNTER64]))
+        rates = ((values - previous_values) & masks) / interval
+        rates[(types != SNMPType.COUNTER32) & (types != SNMPType.COUNTER64)] = numpy.nan
+        if missing:
+            rates[missing] = numpy.nan
+        return rates
@@ -1,5 +1,10 @@
 import datetime
+import enum
 import re
+import socket
+from typing import Callable, Dict, List, Sequence
+
+from .oid import normalize
 
 # This regular expression is used to extract the index from an OID
 OID_INDEX_RE = re.compile(
@@ -16,6 +21,29 @@ OID_INDEX_RE = re.compile(
 )
 
 
+class SNMPType(enum.IntEnum):
+    """
+    Backend independent SNMP data types
+    """
+    OTHER = 0
+    INTEGER = 1
+    OCTET_STRING = 2
+    OBJECT_ID = 3
+    IP_ADDRESS = 4
+    COUNTER32 = 5
+    GAUGE32 = 6
+    TIMETICKS = 7
+    OPAQUE = 8
+    COUNTER64 = 9
+    NULL = 10
+    BITS = 11
+
+
+# Types with integer values
+INTEGER_TYPES = frozenset([SNMPType.INTEGER, SNMPType.COUNTER32, SNMPType.GAUGE32, SNMPType.TIMETICKS,
+                           SNMPType.COUNTER64])
+
+
 def mac_string(mac_address):
     string = ''
     if len(mac_address) == 12:  # No conversion required
@@ -31,7 +59,18 @@ def mac_string(mac_address):
 
 
 def timeticks(ticks: int) -> datetime.timedelta:
-    return datetime.timedelta(seconds=ticks / 100)
+    # Exact number of microseconds, gives the same timedelta as seconds=ticks / 100
+    return datetime.timedelta(0, 0, ticks * 10000)
+
+
+def hex_string(value: str) -> str:
+    """
+    Hex string of a value where each character is an octet
+    """
+    try:
+        return value.encode('latin-1').hex()
+    except UnicodeEncodeError:
+        return ''.join(format(ord(char), '02x') for char in value)
 
 
 def normalize_oid(oid, oid_index=None):
@@ -54,10 +93,15 @@ def normalize_oid(oid, oid_index=None):
     return oid, oid_index
 
 
+# Marks an OID which is not yet split into OID and index
+_PENDING = object()
+
+
 class SNMPResponse(object):
     """
     An SNMP variable binding which is used to represent a piece of
     information being retreived via SNMP.
+    The OID is split into OID and index on first access.
 
     :param oid: the OID being manipulated
     :param oid_index: the index of the OID
@@ -69,12 +113,53 @@ class SNMPResponse(object):
                       NOSUCHOBJECT and NOSUCHINSTANCE respectively
     """
 
+    __slots__ = ('_oid', '_oid_index', 'value', 'snmp_type')
+    # Backend snmp_type to SNMPType
+    type_codes: dict = {}
+    # Backend snmp_type to function converting the value to the typed value, values of other types are returned as is
+    decoders: Dict[object, Callable] = {}
+
     def __init__(self, oid=None, oid_index=None, value=None, snmp_type=None):
-        self.oid, self.oid_index = normalize_oid(oid, oid_index)
-        self.oid = self.oid.replace('iso.', '.1.')
+        self._oid = oid
+        self._oid_index = _PENDING if oid_index is None else oid_index
+        if oid_index is not None:
+            self._oid = normalize(oid)
         self.value = value
         self.snmp_type = snmp_type
 
+    def _split_oid(self):
+        oid = self._oid
+        # Numeric OIDs have no index, skip the regular expression
+        if oid[-1] != '.' and oid.replace('.', '').isdigit():
+            self._oid_index = ''
+            return
+        oid, self._oid_index = normalize_oid(oid)
+        self._oid = normalize(oid)
+
+    @property
+    def oid(self) -> str:
+        if self._oid_index is _PENDING:
+            self._split_oid()
+        return self._oid
+
+    @oid.setter
+    def oid(self, oid: str):
+        if self._oid_index is _PENDING:
+            self._split_oid()
+        self._oid = oid
+
+    @property
+    def oid_index(self) -> str:
+        if self._oid_index is _PENDING:
+            self._split_oid()
+        return self._oid_index
+
+    @oid_index.setter
+    def oid_index(self, oid_index: str):
+        if self._oid_index is _PENDING:
+            self._split_oid()
+        self._oid_index = oid_index
+
     def __repr__(self):
         return (
             "<{0} value={1} (oid={2}, oid_index={3}, snmp_type={4})>".format(
@@ -85,14 +170,60 @@ class SNMPResponse(object):
         )
 
     def hex_string(self):
-        string = ''
-        for octet in self.value:
-            octet = ord(octet)
-            if octet <= 0x0f:
-                string += '0'
-            # Format as lower case hex digit without prefix
-            string += format(octet, 'x')
-        return string
+        return hex_string(self.value)
+
+    @property
+    def type_code(self) -> SNMPType:
+        return self.type_codes.get(self.snmp_type, SNMPType.OTHER)
+
+    def raw_value(self):
+        """
+        Get the value as int for integer types and bytes for other types
+        Object identifiers are returned as numeric OID strings encoded as ASCII
+        """
+        type_code = self.type_code
+        if type_code in INTEGER_TYPES:
+            return int(self.value)
+        elif isinstance(self.value, bytes):
+            return self.value
+        elif type_code == SNMPType.IP_ADDRESS:
+            return socket.inet_aton(self.value)
+        elif self.value is None:
+            return b''
+        try:
+            return self.value.encode('latin-1')
+        except UnicodeEncodeError:
+            return self.value.encode('utf-8')
 
     def typed_value(self):
-        raise NotImplementedError
+        decoder = self.decoders.get(self.snmp_type)
+        if decoder is None:
+            return self.value
+        return decoder(self.value)
+
+    @classmethod
+    def decode_batch(cls, responses: Sequence['SNMPResponse']) -> list:
+        """
+        Get typed_value for many responses, each type is decoded in one pass
+        """
+        snmp_types = [response.snmp_type for response in responses]
+        groups: Dict[object, list] = {snmp_type: [] for snmp_type in snmp_types}
+        if len(groups) == 1:
+            return cls._decode_values(snmp_types[0], responses)
+        for snmp_type, response in zip(snmp_types, responses):
+            groups[snmp_type].append(response)
+
+        # Take the decoded values in the original order
+        decoded = {snmp_type: iter(cls._decode_values(snmp_type, group)).__next__
+                   for snmp_type, group in groups.items()}
+        return [decoded[snmp_type]() for snmp_type in snmp_types]
+
+    @classmethod
+    def _decode_values(cls, snmp_type, responses: List['SNMPResponse']) -> list:
+        """
+        Decode the values of responses with the same snmp_type, must give the same values as typed_value
+        """
+        decoder = cls.decoders.get(snmp_type)
+        if decoder is None:
+            return [response.typed_value() for response in responses]
+        return list(map(decoder, [response.value for response in responses]))
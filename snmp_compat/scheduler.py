@@ -0,0 +1,302 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Callable, Dict, List, Optional, Set, Union
+
+from .jobs import PollJob, PollResult
+from .parallel import ThreadedPoller
+
+# Status of a JobRun
+COMPLETED = 'completed'
+# Completed after the deadline
+LATE = 'late'
+# Not started before the deadline
+MISSED = 'missed'
+# Not started because the previous run of the job had not completed
+SKIPPED = 'skipped'
+# The poll raised an exception, see JobRun.error
+FAILED = 'failed'
+
+
+class ScheduledJob:
+    """
+    A job polled repeatedly by a PollScheduler
+
+    :param interval: Seconds between the start of each run
+    :param deadline: Seconds after the scheduled start the run should be completed
+    """
+    # Slot of the next run without jitter, runs are scheduled from the slot so the schedule does not drift
+    next_slot: float = None
+    running: bool = False
+    # Scheduled start of a coalesced run waiting for the running run to complete
+    pending: Optional[float] = None
+    removed: bool = False
+    last_lateness: Optional[float] = None
+
+    def __init__(self, job: PollJob, interval: float, deadline: float):
+        self.job = job
+        self.interval = interval
+        self.deadline = deadline
+        self.runs = 0
+        self.skipped = 0
+        self.missed = 0
+        self.late = 0
+        self.failed = 0
+        self.max_lateness = 0.0
+
+    def __repr__(self):
+        return '<ScheduledJob %s interval=%s runs=%d skipped=%d missed=%d late=%d failed=%d>' % (
+            self.job.hostname, self.interval, self.runs, self.skipped, self.missed, self.late, self.failed)
+
+    def _record(self, run: 'JobRun'):
+        self.runs += 1
+        self.last_lateness = run.lateness
+        self.max_lateness = max(self.max_lateness, run.lateness)
+        if run.status == MISSED:
+            self.missed += 1
+        elif run.status == LATE:
+            self.late += 1
+        elif run.status == FAILED:
+            self.failed += 1
+
+
+class JobRun:
+    """
+    One cycle of a scheduled job, times are time.monotonic values
+
+    :param scheduled: Time the run was scheduled to start, including jitter
+    :param started: Time the run started, None if it was skipped
+    :param status: completed, late, missed, skipped or failed
+    :param error: Exception raised by the poll of a failed run
+    """
+
+    def __init__(self, scheduled_job: ScheduledJob, scheduled: float, started: float = None, finished: float = None,
+                 results: List[PollResult] = None, status: str = COMPLETED, error: Exception = None):
+        self.scheduled_job = scheduled_job
+        self.scheduled = scheduled
+        self.started = started
+        self.finished = finished
+        self.results = results or []
+        self.status = status
+        self.error = error
+
+    def __repr__(self):
+        return '<JobRun %s %s lateness=%s>' % (self.scheduled_job.job.hostname, self.status, self.lateness)
+
+    @property
+    def lateness(self) -> Optional[float]:
+        """
+        Seconds between the scheduled and the actual start
+        """
+        if self.started is None:
+            return None
+        return self.started - self.scheduled
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        return self.finished - self.started
+
+
+class PollScheduler:
+    """
+    Poll jobs repeatedly at fixed intervals on the worker threads of a ThreadedPoller
+
+    The first runs of jobs with the same interval are spread evenly across the interval, jobs added while the
+    scheduler is running start at a random offset. Each following run is scheduled one interval after the previous
+    slot, so the schedule does not drift with the time the runs take.
+    A run which can not start before its deadline is reported as missed without polling, a run completing after the
+    deadline is reported as late and a run where the poll raised an exception is reported as failed.
+    A cycle which starts while the previous run of the job is still running is skipped or coalesced, and cycles which
+    passed while the scheduler was blocked are skipped, so a job never has more than one run in progress or queued.
+
+    :param poller: Poller running the jobs, the number of workers limits the number of jobs running at the same time
+    :param interval: Default interval in seconds
+    :param deadline: Default deadline in seconds after the scheduled start, defaults to the interval
+    :param jitter: Random delay of each run, uniformly distributed between 0 and jitter seconds
+    :param overrun: skip to drop the cycle of a job which is still running, or coalesce to start it when the
+                    running run completes, further cycles are skipped
+    :param callback: Called with each JobRun from the worker threads and the thread running the scheduler
+    :param seed: Seed for the random numbers used for jitter and offsets
+    """
+
+    def __init__(self, poller: ThreadedPoller, interval: float = 60.0, deadline: float = None, jitter: float = 0.0,
+                 overrun: str = 'skip', callback: Callable[[JobRun], None] = None, seed=None):
+        if overrun not in ['skip', 'coalesce']:
+            raise AttributeError('Invalid overrun policy %s' % overrun)
+        self.poller = poller
+        self.interval = interval
+        self.deadline = deadline
+        self.jitter = jitter
+        self.overrun = overrun
+        self.callback = callback
+        self.random = random.Random(seed)
+        self.jobs: List[ScheduledJob] = []
+        self._heap = []
+        self._sequence = itertools.count()
+        self._futures: Set[Future] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._running = False
+
+    def add(self, job: Union[PollJob, tuple], interval: float = None, deadline: float = None) -> ScheduledJob:
+        """
+        Add a job, jobs can be PollJob objects or (hostname, community, oids) tuples
+
+        :param interval: Interval of the job, defaults to the interval of the scheduler
+        :param deadline: Deadline of the job, defaults to the deadline of the scheduler or the interval
+        """
+        if not isinstance(job, PollJob):
+            job = PollJob(*job)
+        interval = interval or self.interval
+        scheduled_job = ScheduledJob(job, interval, deadline or self.deadline or interval)
+        with self._lock:
+            self.jobs.append(scheduled_job)
+            if self._running:
+                self._push(scheduled_job, time.monotonic() + self.random.uniform(0, interval))
+        self._wake.set()
+        return scheduled_job
+
+    def remove(self, scheduled_job: ScheduledJob):
+        """
+        Remove a job, a run in progress is completed
+        """
+        with self._lock:
+            scheduled_job.removed = True
+            self.jobs.remove(scheduled_job)
+
+    def stop(self):
+        """
+        Make run return, can be called from another thread or the callback
+        """
+        self._stop.set()
+        self._wake.set()
+
+    def _push(self, scheduled_job: ScheduledJob, slot: float):
+        scheduled_job.next_slot = slot
+        due = slot + self.random.uniform(0, self.jitter) if self.jitter else slot
+        heapq.heappush(self._heap, (due, next(self._sequence), scheduled_job))
+
+    def _spread(self, start: float):
+        intervals: Dict[float, List[ScheduledJob]] = {}
+        for scheduled_job in self.jobs:
+            intervals.setdefault(scheduled_job.interval, []).append(scheduled_job)
+        for interval, scheduled_jobs in intervals.items():
+            for position, scheduled_job in enumerate(scheduled_jobs):
+                self._push(scheduled_job, start + interval * position / len(scheduled_jobs))
+
+    def run(self, duration: float = None):
+        """
+        Run the scheduler in the calling thread until stop is called, returns when the runs in progress are completed
+
+        :param duration: Stop after duration seconds
+        """
+        start = time.monotonic()
+        end = None if duration is None else start + duration
+        self._stop.clear()
+        with self._lock:
+            self._running = True
+            self._spread(start)
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                now = time.monotonic()
+                if end is not None and now >= end:
+                    break
+                due = []
+                with self._lock:
+                    while self._heap and self._heap[0][0] <= now:
+                        due.append(heapq.heappop(self._heap))
+                    timeout = self._heap[0][0] - now if self._heap else None
+                for scheduled, _, scheduled_job in due:
+                    if not scheduled_job.removed:
+                        self._dispatch(scheduled_job, scheduled, now)
+                if due:
+                    continue
+                if end is not None:
+                    timeout = end - now if timeout is None else min(timeout, end - now)
+                self._wake.wait(timeout)
+        finally:
+            with self._lock:
+                self._running = False
+                self._heap = []
+            # Runs completing while waiting can submit a coalesced run
+            while True:
+                with self._lock:
+                    futures = [future for future in self._futures if not future.done()]
+                if not futures:
+                    break
+                wait(futures)
+
+    def _dispatch(self, scheduled_job: ScheduledJob, scheduled: float, now: float):
+        with self._lock:
+            slot = scheduled_job.next_slot + scheduled_job.interval
+            if slot <= now:
+                # The scheduler was blocked for more than an interval
+                missed = int((now - slot) // scheduled_job.interval) + 1
+                scheduled_job.skipped += missed
+                slot += missed * scheduled_job.interval
+            self._push(scheduled_job, slot)
+
+            if scheduled_job.running:
+                if self.overrun == 'coalesce' and scheduled_job.pending is None:
+                    scheduled_job.pending = scheduled
+                    return
+                scheduled_job.skipped += 1
+                skipped = JobRun(scheduled_job, scheduled, status=SKIPPED)
+            else:
+                skipped = None
+                scheduled_job.running = True
+
+        if skipped is not None:
+            self._report(skipped)
+        else:
+            self._submit(scheduled_job, scheduled)
+
+    def _submit(self, scheduled_job: ScheduledJob, scheduled: float):
+        future = self.poller.executor.submit(self._execute, scheduled_job, scheduled)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._done)
+
+    def _done(self, future: Future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def _execute(self, scheduled_job: ScheduledJob, scheduled: float):
+        started = time.monotonic()
+        pending = None
+        try:
+            if started > scheduled + scheduled_job.deadline:
+                run = JobRun(scheduled_job, scheduled, started, started, status=MISSED)
+            else:
+                try:
+                    results = self.poller.poll_job(scheduled_job.job)
+                except Exception as e:
+                    # Report the run instead of losing the exception in the worker future
+                    run = JobRun(scheduled_job, scheduled, started, time.monotonic(), status=FAILED, error=e)
+                else:
+                    finished = time.monotonic()
+                    status = LATE if finished > scheduled + scheduled_job.deadline else COMPLETED
+                    run = JobRun(scheduled_job, scheduled, started, finished, results, status)
+        finally:
+            with self._lock:
+                if self._running and not scheduled_job.removed:
+                    pending = scheduled_job.pending
+                scheduled_job.pending = None
+                scheduled_job.running = pending is not None
+
+        with self._lock:
+            scheduled_job._record(run)
+        self._report(run)
+        if pending is not None:
+            self._submit(scheduled_job, pending)
+
+    def _report(self, run: JobRun):
+        if self.callback is not None:
+            self.callback(run)
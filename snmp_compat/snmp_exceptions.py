@@ -1,4 +1,7 @@
-from snmp_compat import SNMPCompat
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from snmp_compat import SNMPCompat
 
 
 class SNMPError(ValueError):
@@ -6,15 +9,18 @@ class SNMPError(ValueError):
     oid: str = None
     message: str = None
 
-    def __init__(self, e: Exception = None, session: SNMPCompat = None, oid: str = None):
+    def __init__(self, e: Exception = None, session: 'SNMPCompat' = None, oid: str = None):
         self.session = session
         self.e = e
         self.oid = oid
 
+    def __str__(self):
+        return self.message or str(self.e or '')
+
 
 class SNMPConnectionError(SNMPError):
     def __str__(self):
-        return 'Unable to connect to %s with community %s: %s' % (
+        return self.message or 'Unable to connect to %s with community %s: %s' % (
             self.session.hostname, self.session.community, self.e)
 
 
@@ -26,3 +32,17 @@ class SNMPNoData(SNMPError):
 class SNMPTimeout(SNMPError):
     def __str__(self):
         return self.message or 'Timeout for oid %s' % self.oid
+
+
+class SNMPTooBig(SNMPError):
+    def __str__(self):
+        return self.message or 'Response too big for oid %s' % self.oid
+
+
+class SNMPCircuitOpen(SNMPError):
+    """
+    The host has not responded to the previous requests and is skipped until the cooldown has passed
+    """
+
+    def __str__(self):
+        return self.message or 'Circuit open for host %s, skipping oid %s' % (self.session.hostname, self.oid)
@@ -0,0 +1,66 @@
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from .oid import OID
+
+
+class Table:
+    """
+    SNMP table stored column by column
+    Each column is a list of values aligned with the shared index list, cells missing in the agent are None
+    """
+    index: List[str]
+    columns: Dict[str, list]
+
+    def __init__(self, names: Sequence[str]):
+        self.names = list(names)
+        self.index = []
+        self.columns = {name: [] for name in self.names}
+        self._rows: Dict[str, int] = {}
+        # Rows are in index order as long as they are all created by the first column
+        self.ordered = True
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, name: str) -> list:
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[Tuple[str, tuple]]:
+        """
+        Iterate rows as (index, values) tuples with values in column order
+        """
+        columns = [self.columns[name] for name in self.names]
+        for position, index in enumerate(self.index):
+            yield index, tuple(column[position] for column in columns)
+
+    def __repr__(self):
+        return '<Table columns=%s rows=%d>' % (self.names, len(self.index))
+
+    def add(self, name: str, index: str, value):
+        row = self._rows.get(index)
+        if row is None:
+            row = self._rows[index] = len(self.index)
+            self.index.append(index)
+            if name != self.names[0]:
+                self.ordered = False
+            for column in self.columns.values():
+                column.append(None)
+        self.columns[name][row] = value
+
+    def row(self, index: str) -> dict:
+        position = self._rows[index]
+        return {name: self.columns[name][position] for name in self.names}
+
+    def sort(self):
+        """
+        Sort rows by index, needed when some columns are missing rows
+        """
+        if self.ordered:
+            return
+        order = sorted(range(len(self.index)), key=lambda position: OID(self.index[position]))
+        self.index = [self.index[position] for position in order]
+        for name in self.names:
+            column = self.columns[name]
+            self.columns[name] = [column[position] for position in order]
+        self._rows = {index: position for position, index in enumerate(self.index)}
+        self.ordered = True
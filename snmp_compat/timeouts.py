@@ -0,0 +1,110 @@
+import math
+import threading
+import time
+from typing import Dict
+
+from . import snmp_exceptions
+from .compat import OperationHook, SNMPCompat
+
+# Operations sending a single request, the time they take is a round trip time sample
+SINGLE_REQUEST_OPERATIONS = frozenset(['get', 'get_next', 'get_bulk', '_get_many'])
+
+
+class RTTEstimator:
+    """
+    Smoothed round trip time and variance for a host, the retransmission timeout is calculated as in TCP (RFC 6298)
+
+    :param initial: Timeout used before the first sample
+    :param min_timeout: Lower limit for the timeout
+    :param max_timeout: Upper limit for the timeout
+    """
+    srtt: float = None
+    rttvar: float = None
+
+    def __init__(self, initial: float = 1.0, min_timeout: float = 0.1, max_timeout: float = 10.0):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout = initial
+
+    def __repr__(self):
+        return '<RTTEstimator srtt=%s rttvar=%s timeout=%.3f>' % (self.srtt, self.rttvar, self.timeout)
+
+    def sample(self, rtt: float):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.timeout = min(max(self.srtt + 4 * self.rttvar, self.min_timeout), self.max_timeout)
+
+    def timed_out(self):
+        """
+        Back off the timeout after a request timed out
+        """
+        self.timeout = min(self.timeout * 2, self.max_timeout)
+
+
+class AdaptiveTimeout(OperationHook):
+    """
+    Derive the timeout of each request from the round trip times measured for the host, and retry with backoff
+
+    Add it to sessions with SNMPCompat.add_hook, an instance can be shared by all sessions to share the estimates for
+    each host. Retries are sent by the hook, the backend is set to not retry.
+    Timeouts are rounded up to steps of about 19% to avoid reconfiguring the backend session for each request.
+
+    :param retries: Number of retries after a timeout
+    :param backoff: Factor the timeout is multiplied with for each retry
+    :param initial: Timeout for hosts without samples
+    :param min_timeout: Lower limit for the timeout
+    :param max_timeout: Upper limit for the timeout
+    """
+
+    def __init__(self, retries: int = 2, backoff: float = 2.0, initial: float = 1.0, min_timeout: float = 0.1,
+                 max_timeout: float = 10.0):
+        self.retries = retries
+        self.backoff = backoff
+        self.initial = initial
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.hosts: Dict[str, RTTEstimator] = {}
+        self._lock = threading.Lock()
+
+    def estimator(self, hostname: str) -> RTTEstimator:
+        estimator = self.hosts.get(hostname)
+        if estimator is None:
+            with self._lock:
+                estimator = self.hosts.setdefault(
+                    hostname, RTTEstimator(self.initial, self.min_timeout, self.max_timeout))
+        return estimator
+
+    def _round(self, timeout: float) -> float:
+        steps = math.ceil(math.log2(timeout / self.min_timeout) * 4 - 1e-9)
+        return min(self.min_timeout * 2 ** (max(steps, 0) / 4), self.max_timeout)
+
+    def __call__(self, session: SNMPCompat, operation: str, oid, request):
+        estimator = self.estimator(session.hostname)
+        timeout = estimator.timeout
+        attempt = 0
+        while True:
+            session.set_timeout(self._round(timeout), 0)
+            start = time.monotonic()
+            # A response can not arrive after the timeout, longer times are local overhead like the first request
+            # of a pysnmp session
+            try:
+                result = request()
+            except snmp_exceptions.SNMPTimeout:
+                estimator.timed_out()
+                if attempt >= self.retries:
+                    raise
+                attempt += 1
+                timeout = min(timeout * self.backoff, self.max_timeout)
+                continue
+            except (snmp_exceptions.SNMPNoData, snmp_exceptions.SNMPTooBig):
+                # The agent responded
+                if operation in SINGLE_REQUEST_OPERATIONS:
+                    estimator.sample(min(time.monotonic() - start, session.timeout))
+                raise
+            if operation in SINGLE_REQUEST_OPERATIONS:
+                estimator.sample(min(time.monotonic() - start, session.timeout))
+            return result
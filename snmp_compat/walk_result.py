@@ -0,0 +1,170 @@
+import struct
+from array import array
+from typing import Iterable, Iterator, Tuple, Union
+
+from .oid import OID
+from .response import INTEGER_TYPES, SNMPResponse, SNMPType
+
+
+# Row count, number of OID sub-identifiers and number of octets
+_HEADER = struct.Struct('=4sQQQ')
+_MAGIC = b'WR01'
+
+
+class WalkResult:
+    """
+    Walk result stored in arrays instead of one object per varbind
+
+    OIDs are stored as sub-identifiers in oid_parts with row boundaries in oid_offsets.
+    Types are stored as SNMPType codes.
+    Integer values (including Timeticks) are stored in ints, Counter64 values above 2^63 are stored as two's complement.
+    Other values are stored as bytes in octets with row boundaries in octet_offsets, object identifiers are stored as
+    numeric OID strings.
+    """
+
+    def __init__(self):
+        self.oid_parts = array('I')
+        self.oid_offsets = array('Q', [0])
+        self.types = array('B')
+        self.ints = array('q')
+        self.octets = bytearray()
+        self.octet_offsets = array('Q', [0])
+
+    @classmethod
+    def from_responses(cls, responses: Iterable[SNMPResponse]) -> 'WalkResult':
+        result = cls()
+        for response in responses:
+            result.append(response.oid, response.type_code, response.raw_value())
+        return result
+
+    def append(self, oid: Union[str, Tuple[int, ...]], type_code: SNMPType, value: Union[int, bytes]):
+        if isinstance(oid, str):
+            oid = OID(oid)
+        self.oid_parts.extend(oid)
+        self.oid_offsets.append(len(self.oid_parts))
+        self.types.append(type_code)
+        if type_code in INTEGER_TYPES:
+            if value >= 1 << 63:
+                value -= 1 << 64
+            self.ints.append(value)
+        else:
+            self.ints.append(0)
+            self.octets.extend(value)
+        self.octet_offsets.append(len(self.octets))
+
+    def __len__(self):
+        return len(self.types)
+
+    def __iter__(self) -> Iterator[Tuple[str, SNMPType, Union[int, bytes, str]]]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                raise ValueError('WalkResult slices must be contiguous')
+            return self._slice(start, max(start, stop))
+        if item < 0:
+            item += len(self)
+        return self.oid(item), SNMPType(self.types[item]), self.value(item)
+
+    def __repr__(self):
+        return '<WalkResult rows=%d>' % len(self)
+
+    def _slice(self, start: int, stop: int) -> 'WalkResult':
+        result = WalkResult()
+        oid_start, oid_stop = self.oid_offsets[start], self.oid_offsets[stop]
+        octet_start, octet_stop = self.octet_offsets[start], self.octet_offsets[stop]
+        result.oid_parts = self.oid_parts[oid_start:oid_stop]
+        result.oid_offsets = array('Q', (offset - oid_start for offset in self.oid_offsets[start:stop + 1]))
+        result.types = self.types[start:stop]
+        result.ints = self.ints[start:stop]
+        result.octets = self.octets[octet_start:octet_stop]
+        result.octet_offsets = array('Q', (offset - octet_start for offset in self.octet_offsets[start:stop + 1]))
+        return result
+
+    def oid_tuple(self, row: int) -> Tuple[int, ...]:
+        return tuple(self.oid_parts[self.oid_offsets[row]:self.oid_offsets[row + 1]])
+
+    def oid(self, row: int) -> str:
+        return '.' + '.'.join(map(str, self.oid_parts[self.oid_offsets[row]:self.oid_offsets[row + 1]]))
+
+    def value(self, row: int) -> Union[int, bytes, str]:
+        type_code = self.types[row]
+        if type_code in INTEGER_TYPES:
+            value = self.ints[row]
+            if value < 0 and type_code == SNMPType.COUNTER64:
+                value += 1 << 64
+            return value
+        value = bytes(self.octets[self.octet_offsets[row]:self.octet_offsets[row + 1]])
+        if type_code == SNMPType.OBJECT_ID:
+            return value.decode('ascii')
+        return value
+
+    def _lower_bound(self, oid: Tuple[int, ...]) -> int:
+        """
+        Find the first row with OID greater than or equal to oid, rows must be sorted
+        """
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.oid_tuple(middle) < oid:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def select(self, prefix: Union[str, Tuple[int, ...]]) -> 'WalkResult':
+        """
+        Get the rows below an OID using binary search, rows must be in OID order as returned by a walk
+        An empty prefix selects all rows
+        """
+        if isinstance(prefix, str):
+            prefix = OID(prefix)
+        if not prefix:
+            return self._slice(0, len(self))
+        start = self._lower_bound(prefix + (0,))
+        stop = self._lower_bound(prefix[:-1] + (prefix[-1] + 1,))
+        return self._slice(start, max(start, stop))
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialise the arrays, the byte order is native so the bytes should be read on the same machine
+        """
+        return b''.join([_HEADER.pack(_MAGIC, len(self), len(self.oid_parts), len(self.octets)),
+                         self.oid_parts.tobytes(), self.oid_offsets.tobytes(), self.types.tobytes(),
+                         self.ints.tobytes(), self.octet_offsets.tobytes(), self.octets])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'WalkResult':
+        magic, rows, oid_parts, octets = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError('Invalid WalkResult data')
+        result = cls()
+        view = memoryview(data)
+        position = _HEADER.size
+        for name, count in [('oid_parts', oid_parts), ('oid_offsets', rows + 1), ('types', rows), ('ints', rows),
+                            ('octet_offsets', rows + 1)]:
+            buffer = array(getattr(result, name).typecode)
+            size = count * buffer.itemsize
+            buffer.frombytes(view[position:position + size])
+            setattr(result, name, buffer)
+            position += size
+        result.octets = bytearray(view[position:position + octets])
+        return result
+
+    def to_numpy(self) -> dict:
+        """
+        Get the arrays as NumPy arrays without copying
+        """
+        import numpy
+
+        return {
+            'oid_parts': numpy.frombuffer(self.oid_parts, dtype=numpy.uint32),
+            'oid_offsets': numpy.frombuffer(self.oid_offsets, dtype=numpy.uint64),
+            'types': numpy.frombuffer(self.types, dtype=numpy.uint8),
+            'ints': numpy.frombuffer(self.ints, dtype=numpy.int64),
+            'octets': numpy.frombuffer(self.octets, dtype=numpy.uint8),
+            'octet_offsets': numpy.frombuffer(self.octet_offsets, dtype=numpy.uint64),
+        }
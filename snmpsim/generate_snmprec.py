@@ -0,0 +1,74 @@
+"""
+Generate a snmprec file with large ifTable and ifXTable tables for benchmarks
+
+The values are derived from the interface index so the output is the same for each run.
+
+Usage: python generate_snmprec.py [interfaces] [output file]
+"""
+import sys
+
+IF_TABLE = '1.3.6.1.2.1.2.2.1'
+IFX_TABLE = '1.3.6.1.2.1.31.1.1.1'
+
+
+def if_columns(index: int) -> list:
+    """
+    ifTable columns as (column, type, value), the types are snmprec tag numbers
+    """
+    return [
+        (1, 2, index),
+        (2, 4, 'GigabitEthernet1/0/%d' % index),
+        (3, 2, 6),
+        (4, 2, 1500),
+        (5, 66, 1000000000),
+        (6, '4x', '0011%08x' % index),
+        (7, 2, 1),
+        (8, 2, 1 if index % 4 else 2),
+        (9, 67, index * 1000),
+        (10, 65, index * 7919 % 2 ** 32),
+        (11, 65, index * 104729 % 2 ** 32),
+        (13, 65, 0),
+        (14, 65, index % 17),
+        (16, 65, index * 6007 % 2 ** 32),
+        (17, 65, index * 65537 % 2 ** 32),
+        (19, 65, 0),
+        (20, 65, index % 13),
+    ]
+
+
+def ifx_columns(index: int) -> list:
+    return [
+        (1, 4, 'Gi1/0/%d' % index),
+        (6, 70, index * 7919 * 2 ** 32 % 2 ** 64),
+        (10, 70, index * 6007 * 2 ** 32 % 2 ** 64),
+        (15, 66, 1000),
+        (18, 4, 'Port %d' % index),
+    ]
+
+
+def generate(interfaces: int):
+    yield '1.3.6.1.2.1.1.1.0|4|Generated benchmark agent with %d interfaces' % interfaces
+    yield '1.3.6.1.2.1.1.3.0|67|100000'
+    yield '1.3.6.1.2.1.1.5.0|4|bench-agent'
+    yield '1.3.6.1.2.1.2.1.0|2|%d' % interfaces
+    for table, columns in [(IF_TABLE, if_columns), (IFX_TABLE, ifx_columns)]:
+        rows = [columns(index) for index in range(1, interfaces + 1)]
+        for position in range(len(rows[0])):
+            for index, row in enumerate(rows, 1):
+                column, tag, value = row[position]
+                yield '%s.%d.%d|%s|%s' % (table, column, index, tag, value)
+
+
+def main(interfaces=10000, output=None):
+    interfaces = int(interfaces)
+    file = open(output, 'w') if output else sys.stdout
+    try:
+        for line in generate(interfaces):
+            file.write(line + '\n')
+    finally:
+        if output:
+            file.close()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
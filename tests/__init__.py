@@ -0,0 +1,4 @@
+import os
+
+# Data of the simulated agent used by the snmprec backend in the tests
+os.environ.setdefault('SNMPREC_DATA_DIR', os.path.join(os.path.dirname(__file__), '..', 'snmpsim', 'data'))
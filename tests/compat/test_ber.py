@@ -0,0 +1,49 @@
+import datetime
+import unittest
+
+from snmp_compat.libraries import ber
+
+
+class BERTestCase(unittest.TestCase):
+    def test_encode_oid(self):
+        self.assertEqual(bytes.fromhex('06082b06010201010500'), ber.encode_oid('.1.3.6.1.2.1.1.5.0'))
+        self.assertEqual(bytes.fromhex('06032b8b07'), ber.encode_oid('1.3.1415'))
+        self.assertEqual(ber.encode_oid('.1.3.6.1.2.1.1.5.0'), ber.encode_oid('iso.3.6.1.2.1.1.5.0'))
+
+    def test_encode_request(self):
+        message = ber.encode_request(1, b'public', ber.GET_REQUEST, 1, ['.1.3.6.1.2.1.1.5.0'])
+        self.assertEqual(bytes.fromhex('302602010104067075626c6963a019020101020100020100'
+                                       '300e300c06082b060102010105000500'), message)
+        self.assertEqual(1, ber.decode_request_id(message))
+        self.assertEqual(bytes.fromhex('020200ff'), ber.encode_integer(255))
+        self.assertEqual(bytes.fromhex('0201ff'), ber.encode_integer(-1))
+
+    def test_decode_response(self):
+        varbinds = [
+            ber.encode_oid('.1.3.6.1.2.1.1.3.0') + ber.encode_tlv(ber.TIMETICKS, bytes.fromhex('00ffffffff')),
+            ber.encode_oid('.1.3.6.1.2.1.1.5.0') + ber.encode_tlv(ber.OCTET_STRING, b'x' * 200),
+            ber.encode_oid('.1.3.6.1.2.1.1.7.0') + ber.encode_tlv(ber.INTEGER, b'\xfe'),
+            ber.encode_oid('.1.3.6.1.2.1.4.20.1.1.10.0.0.1') + ber.encode_tlv(ber.IP_ADDRESS, bytes([10, 0, 0, 1])),
+            ber.encode_oid('.1.3.6.1.2.1.1.9.9') + ber.encode_tlv(ber.END_OF_MIB_VIEW, b''),
+        ]
+        pdu = ber.encode_integer(1234) + ber.encode_integer(0) + ber.encode_integer(0) + ber.encode_tlv(
+            ber.SEQUENCE, b''.join(ber.encode_tlv(ber.SEQUENCE, varbind) for varbind in varbinds))
+        message = ber.encode_tlv(ber.SEQUENCE, ber.encode_integer(1) + ber.encode_tlv(ber.OCTET_STRING, b'public') +
+                                 ber.encode_tlv(ber.RESPONSE, pdu))
+
+        request_id, error_status, error_index, decoded = ber.decode_response(message)
+        self.assertEqual((1234, 0, 0), (request_id, error_status, error_index))
+        self.assertEqual(('.1.3.6.1.2.1.1.3.0', ber.TIMETICKS, 2 ** 32 - 1), decoded[0])
+        self.assertEqual(b'x' * 200, decoded[1][2])
+        self.assertEqual(-2, decoded[2][2])
+        self.assertEqual('10.0.0.1', decoded[3][2])
+        self.assertEqual(('.1.3.6.1.2.1.1.9.9', ber.END_OF_MIB_VIEW, None), decoded[4])
+
+        oid, tag, value = decoded[0]
+        response = ber.BERResponse(oid, None, value, tag)
+        self.assertEqual(datetime.timedelta(seconds=(2 ** 32 - 1) / 100), response.typed_value())
+        self.assertEqual([response.typed_value()], ber.BERResponse.decode_batch([response]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,28 @@
 import datetime
 import os
+import threading
+import time
 import unittest
+from unittest import mock
 
 from snmp_compat import snmp_exceptions
-from snmp_compat.compat import select
+from snmp_compat.breaker import CircuitBreaker
+from snmp_compat.cache import CachingSession, ResponseCache
+from snmp_compat.compat import OperationHook, select
+from snmp_compat.cursor import WalkCursor
+from snmp_compat.pool import SessionPool
+from snmp_compat.timeouts import AdaptiveTimeout
+from snmp_compat.decode import decode
+from snmp_compat.metrics import Metrics
+from snmp_compat.response import SNMPType
 
 SNMPSession = select(os.getenv('SNMP_LIBRARY'))
 
 print('Running tests with SNMP library %s' % os.getenv('SNMP_LIBRARY'))
 
 snmpsim_host = os.getenv('SNMPSIM_HOST')
+# Version argument for SNMPv2c, easysnmp and ezsnmp use the version number, the other libraries use mpModel
+version_2c = 2 if os.getenv('SNMP_LIBRARY') in ['easysnmp', 'ezsnmp'] else 1
 
 
 class SNMPTestCase(unittest.TestCase):
@@ -83,6 +96,259 @@ class SNMPTestCase(unittest.TestCase):
         self.assertEqual(len(response), 32)
         self.assertEqual(response[31].oid, '.1.3.6.1.2.1.1.9.1.4.8')
 
+    def test_get_many(self):
+        session = SNMPSession(snmpsim_host, 'public')
+        response = session.get_many(['.1.3.6.1.2.1.1.5.0', '.1.7.7.7.7', '.1.3.6.1.2.1.1.7.0'])
+        self.assertEqual(3, len(response))
+        self.assertEqual('zeus.pysnmp.com (you can change this!)', response[0].typed_value())
+        self.assertIsInstance(response[1], snmp_exceptions.SNMPNoData)
+        self.assertEqual('No data for oid .1.7.7.7.7', str(response[1]))
+        self.assertEqual('.1.3.6.1.2.1.1.7.0', response[2].oid)
+
+    def test_bulkwalk(self):
+        session = SNMPSession(snmpsim_host, 'public', version_2c)
+        # Fail if the walk falls back to GETNEXT
+        session.walk = session.get_next = mock.Mock(side_effect=AssertionError('GETNEXT used'))
+        get_bulk = session.get_bulk = mock.Mock(wraps=session.get_bulk)
+        response = session.bulkwalk('.1.3.6.1.2.1.1', max_repetitions=5)
+        self.assertEqual(len(response), 32)
+        self.assertEqual(response[31].oid, '.1.3.6.1.2.1.1.9.1.4.8')
+        if os.getenv('SNMP_LIBRARY') != 'ezsnmp':
+            # ezsnmp sends the GETBULK requests of a walk from the C library
+            self.assertEqual(7, get_bulk.call_count)
+
+    def test_bulkwalk_adaptive(self):
+        session = SNMPSession(snmpsim_host, 'public', version_2c)
+        response = session.bulkwalk('.1.3.6.1.2.1.1', max_repetitions=2, adaptive=True)
+        self.assertEqual(len(response), 32)
+        self.assertEqual(response[31].oid, '.1.3.6.1.2.1.1.9.1.4.8')
+
+        # max-repetitions is halved after tooBig and doubled for each full page
+        repetitions = []
+        get_bulk = session.get_bulk
+
+        def too_big_once(oids, non_repeaters=0, max_repetitions=10):
+            repetitions.append(max_repetitions)
+            if len(repetitions) == 1:
+                raise snmp_exceptions.SNMPTooBig(session=session, oid=oids[0])
+            return get_bulk(oids, non_repeaters, max_repetitions)
+
+        session.get_bulk = too_big_once
+        response = session.bulkwalk('.1.3.6.1.2.1.1', max_repetitions=8, adaptive=True)
+        self.assertEqual(len(response), 32)
+        self.assertEqual([8, 4, 8, 16], repetitions[:4])
+
+    def test_iter_walk(self):
+        for version in [0 if version_2c == 1 else 1, version_2c]:
+            session = SNMPSession(snmpsim_host, 'public', version)
+            walk = session.iter_walk('.1.3.6.1.2.1.1', max_repetitions=5)
+            self.assertEqual('.1.3.6.1.2.1.1.1.0', next(walk).oid)
+            response = list(walk)
+            self.assertEqual(len(response), 31)
+            self.assertEqual(response[30].oid, '.1.3.6.1.2.1.1.9.1.4.8')
+
+    def test_resumable_walk(self):
+        for version in [0 if version_2c == 1 else 1, version_2c]:
+            session = SNMPSession(snmpsim_host, 'public', version)
+            walk = session.resumable_walk('.1.3.6.1.2.1.1', max_repetitions=5)
+            self.assertTrue(walk.complete)
+            self.assertEqual(32, len(walk))
+            self.assertEqual('.1.3.6.1.2.1.1.9.1.4.8', walk.cursor.last)
+
+            cursor = WalkCursor.loads(WalkCursor('.1.3.6.1.2.1.1', '.1.3.6.1.2.1.1.9.1.4.6', 30).dumps())
+            walk = session.resumable_walk(cursor)
+            self.assertEqual(['.1.3.6.1.2.1.1.9.1.4.7', '.1.3.6.1.2.1.1.9.1.4.8'], [entry.oid for entry in walk])
+            self.assertEqual(32, walk.cursor.received)
+
+        session = SNMPSession(snmpsim_host, 'ciscobad', timeout=0.1, retries=0)
+        walk = session.resumable_walk('.1.3.6.1.2.1.1', resumes=1)
+        self.assertFalse(walk.complete)
+        self.assertIsInstance(walk.error, snmp_exceptions.SNMPTimeout)
+        self.assertEqual([], walk.entries)
+
+    def test_walk_result(self):
+        session = SNMPSession(snmpsim_host, 'public', version_2c)
+        result = session.walk_result('.1.3.6.1.2.1.2.2.1')
+        self.assertEqual(len(session.walk('.1.3.6.1.2.1.2.2.1')), len(result))
+        descr = result.select('.1.3.6.1.2.1.2.2.1.2')
+        self.assertEqual([b'lo', b'eth0'], [descr.value(0), descr.value(1)])
+        oid, snmp_type, value = result.select('.1.3.6.1.2.1.2.2.1.6')[1]
+        self.assertEqual('.1.3.6.1.2.1.2.2.1.6.2', oid)
+        self.assertEqual(SNMPType.OCTET_STRING, snmp_type)
+        self.assertEqual(b'\x00\x12\x79\x62\xf9\x40', value)
+        self.assertEqual(SNMPType.INTEGER, result.select('.1.3.6.1.2.1.2.2.1.1')[0][1])
+        self.assertEqual(list(result), list(result.select('')))
+
+    def test_decode(self):
+        for version in [0 if version_2c == 1 else 1, version_2c]:
+            session = SNMPSession(snmpsim_host, 'public', version)
+            for oid in ['.1.3.6.1.2.1.1', '.1.3.6.1.2.1.2.2.1']:
+                response = session.walk(oid)
+                self.assertEqual([entry.typed_value() for entry in response], decode(response))
+
+    def test_cache(self):
+        cache = ResponseCache(prefix_ttls={'.1.3.6.1.2.1.1.3': 0})
+        session = CachingSession(SNMPSession(snmpsim_host, 'public'), cache)
+        self.assertEqual(session.get('.1.3.6.1.2.1.1.5.0').value, session.get('.1.3.6.1.2.1.1.5.0').value)
+        for _ in range(2):
+            with self.assertRaises(snmp_exceptions.SNMPNoData):
+                session.get('.1.7.7.7.7')
+        session.get('.1.3.6.1.2.1.1.3.0')
+        self.assertEqual(2, cache.stats.hits)
+        self.assertEqual(2, len(cache))
+
+        # Walks count one for each response
+        cache = ResponseCache(max_responses=40)
+        session = CachingSession(SNMPSession(snmpsim_host, 'public'), cache)
+        session.get('.1.3.6.1.2.1.1.5.0')
+        session.get('1.3.6.1.2.1.1.5.0')
+        self.assertEqual(1, cache.stats.hits)
+        session.walk('.1.3.6.1.2.1.1')
+        self.assertEqual(33, cache.size)
+        session.walk('.1.3.6.1.2.1.1.9')
+        # The get and the first walk are evicted
+        self.assertEqual((1, 2), (len(cache), cache.stats.evictions))
+        self.assertEqual(len(session.walk('.1.3.6.1.2.1.1.9')), cache.size)
+
+    def test_pool(self):
+        with SessionPool(SNMPSession, max_size=1) as pool:
+            with pool.session(snmpsim_host, 'public') as session:
+                self.assertEqual('zeus.pysnmp.com (you can change this!)',
+                                 session.get('.1.3.6.1.2.1.1.5.0').typed_value())
+            with pool.session(snmpsim_host, 'public') as session2:
+                self.assertIs(session, session2)
+            with pool.session(snmpsim_host, 'public', version_2c) as session3:
+                self.assertIsNot(session, session3)
+            self.assertEqual(1, len(pool))
+
+    def test_pool_max_sessions(self):
+        with SessionPool(SNMPSession, max_sessions=2) as pool:
+            first = pool.acquire(snmpsim_host, 'public')
+            second = pool.acquire(snmpsim_host, 'public', version_2c)
+            with self.assertRaises(TimeoutError):
+                pool.acquire(snmpsim_host, 'public', wait_timeout=0.05)
+
+            releaser = threading.Timer(0.05, pool.release, [first])
+            releaser.start()
+            self.assertIs(first, pool.acquire(snmpsim_host, 'public', wait_timeout=5))
+            releaser.join()
+
+            pool.release(second)
+            with self.assertRaises(ValueError):
+                pool.release(second)
+            # The idle session with other settings is closed to make room
+            third = pool.acquire(snmpsim_host, 'public', timeout=2)
+            self.assertIsNot(second, third)
+            self.assertEqual(0, len(pool))
+            pool.discard(third)
+            pool.release(first)
+
+    def test_adaptive_timeout(self):
+        adaptive = AdaptiveTimeout(retries=1, initial=0.2)
+        session = SNMPSession(snmpsim_host, 'public', timeout=1, retries=2)
+        session.add_hook(adaptive)
+        for _ in range(20):
+            self.assertEqual('.1.3.6.1.2.1.1.5.0', session.get('.1.3.6.1.2.1.1.5.0').oid)
+        self.assertIsNotNone(adaptive.estimator(snmpsim_host).srtt)
+        self.assertEqual(0, session.retries)
+        self.assertLess(session.timeout, 0.2)
+
+        session = SNMPSession(snmpsim_host, 'ciscobad')
+        session.add_hook(adaptive)
+        with self.assertRaises(snmp_exceptions.SNMPTimeout):
+            session.get('.1.3.6.1.2.1.1.5.0')
+
+    def test_nested_operations(self):
+        class DepthHook(OperationHook):
+            depth = 0
+            max_depth = 0
+
+            def __call__(self, session, operation, oid, request):
+                self.depth += 1
+                self.max_depth = max(self.depth, self.max_depth)
+                try:
+                    return request()
+                finally:
+                    self.depth -= 1
+
+        hook = DepthHook()
+        for version in [0 if version_2c == 1 else 1, version_2c]:
+            session = SNMPSession(snmpsim_host, 'public', version)
+            session.add_hook(hook)
+            self.assertEqual(32, len(session.bulkwalk('.1.3.6.1.2.1.1', max_repetitions=5, adaptive=True)))
+            self.assertEqual(32, len(session.resumable_walk('.1.3.6.1.2.1.1')))
+        self.assertEqual(1, hook.max_depth)
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(failures=2, cooldown=0.5)
+        session = SNMPSession(snmpsim_host, 'ciscobad', timeout=0.2, retries=0)
+        session.add_hook(breaker)
+        for _ in range(2):
+            with self.assertRaises(snmp_exceptions.SNMPTimeout):
+                session.get('.1.3.6.1.2.1.1.5.0')
+        self.assertEqual('open', breaker.state(snmpsim_host))
+
+        # The state is shared with other sessions for the host
+        session = SNMPSession(snmpsim_host, 'public')
+        session.add_hook(breaker)
+        with self.assertRaises(snmp_exceptions.SNMPCircuitOpen):
+            session.get('.1.3.6.1.2.1.1.5.0')
+        time.sleep(0.5)
+        self.assertEqual('.1.3.6.1.2.1.1.5.0', session.get('.1.3.6.1.2.1.1.5.0').oid)
+        self.assertEqual('closed', breaker.state(snmpsim_host))
+
+    def test_circuit_breaker_walk(self):
+        # A walk sending several requests is one failure
+        breaker = CircuitBreaker(failures=2, cooldown=30)
+        session = SNMPSession(snmpsim_host, 'ciscobad', 0 if version_2c == 1 else 1, timeout=0.2, retries=0)
+        session.add_hook(breaker)
+        with self.assertRaises(snmp_exceptions.SNMPTimeout):
+            session.bulkwalk('.1.3.6.1.2.1.1')
+        self.assertEqual(1, breaker.circuit(snmpsim_host).failures)
+        with self.assertRaises(snmp_exceptions.SNMPTimeout):
+            session.get('.1.3.6.1.2.1.1.5.0')
+        self.assertEqual('open', breaker.state(snmpsim_host))
+
+    def test_metrics(self):
+        metrics = Metrics()
+        session = SNMPSession(snmpsim_host, 'public', version_2c)
+        session.add_hook(AdaptiveTimeout(retries=1, initial=0.2))
+        session.add_hook(metrics)
+        session.get('.1.3.6.1.2.1.1.5.0')
+        session.get_many(['.1.3.6.1.2.1.1.5.0', '.1.3.6.1.2.1.1.7.7'])
+
+        get = metrics.metrics(snmpsim_host, 'get')
+        self.assertEqual(1, get.requests)
+        self.assertEqual(1, get.varbinds)
+        self.assertGreater(get.wire_seconds, 0)
+        self.assertGreater(get.conversion_seconds, 0)
+        self.assertEqual(1, metrics.metrics(snmpsim_host, 'get_many').varbinds)
+
+        session = SNMPSession(snmpsim_host, 'ciscobad', version_2c, timeout=0.2, retries=0)
+        session.add_hook(AdaptiveTimeout(retries=1, initial=0.2))
+        session.add_hook(metrics)
+        with self.assertRaises(snmp_exceptions.SNMPTimeout):
+            session.get('.1.3.6.1.2.1.1.5.0')
+        self.assertEqual(3, get.requests)
+        self.assertEqual(1, get.retries)
+        self.assertEqual({'SNMPTimeout': 2}, get.errors)
+
+        text = metrics.prometheus()
+        self.assertIn('snmp_request_duration_seconds_count{host="%s",operation="get"} 3' % snmpsim_host, text)
+        self.assertIn('snmp_request_duration_seconds_bucket{host="%s",operation="get",le="+Inf"} 3' % snmpsim_host,
+                      text)
+        self.assertIn('snmp_errors_total{host="%s",operation="get",error="SNMPTimeout"} 2' % snmpsim_host, text)
+        self.assertIn('operation="get_many"', text)
+        self.assertNotIn('_get_many', text)
+
+    def test_get_table(self):
+        for version in [0 if version_2c == 1 else 1, version_2c]:
+            session = SNMPSession(snmpsim_host, 'public', version)
+            table = session.get_table({'descr': '.1.3.6.1.2.1.2.2.1.2', 'speed': '.1.3.6.1.2.1.2.2.1.5'})
+            self.assertEqual(['1', '2'], table.index)
+            self.assertEqual(['lo', 'eth0'], table['descr'])
+            self.assertEqual(('2', ('eth0', 100000000)), list(table)[1])
+
 
 if __name__ == '__main__':
     unittest.main()
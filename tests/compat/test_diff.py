@@ -0,0 +1,58 @@
+import unittest
+
+from snmp_compat.compat import select
+from snmp_compat.diff import DiffStore, WalkState
+from snmp_compat.libraries import ber
+from snmp_compat.libraries.ber import BERResponse
+
+ROOT = '.1.3.6.1.2.1.2.2.1.2'
+
+
+def column(values: dict) -> list:
+    return [BERResponse('%s.%d' % (ROOT, index), None, value, ber.OCTET_STRING) for index, value in values.items()]
+
+
+class DiffTestCase(unittest.TestCase):
+    def test_diff(self):
+        store = DiffStore()
+        first = store.diff('device1', ROOT, column({1: b'lo', 2: b'eth0', 3: b'eth1', 10: b'eth2'}))
+        self.assertEqual(4, len(first.added))
+
+        second = {1: b'lo', 2: b'eth0', 3: b'wan', 4: b'eth3', 11: b'eth4'}
+        walk_diff = store.diff('device1', ROOT, column(second))
+        self.assertEqual(['.1.3.6.1.2.1.2.2.1.2.4', '.1.3.6.1.2.1.2.2.1.2.11'],
+                         [response.oid for response in walk_diff.added])
+        self.assertEqual(['.1.3.6.1.2.1.2.2.1.2.3'], [response.oid for response in walk_diff.changed])
+        self.assertEqual(['.1.3.6.1.2.1.2.2.1.2.10'], walk_diff.removed)
+        self.assertEqual(5, walk_diff.rows)
+
+        # The type is part of the hash
+        integers = [BERResponse(ROOT + '.1', None, 108, ber.INTEGER)]
+        self.assertEqual(1, len(store.diff('device2', ROOT, column({1: b'l'})).added))
+        self.assertEqual(1, len(store.diff('device2', ROOT, integers).changed))
+
+        state = WalkState.from_bytes(store.states[('device1', ROOT)].to_bytes())
+        self.assertEqual([(1,), (2,), (3,), (4,), (11,)], [state.index(row) for row in range(len(state))])
+        store.states[('device1', ROOT)] = state
+        self.assertFalse(store.diff('device1', ROOT, column(second)))
+        self.assertEqual(['.1.3.6.1.2.1.2.2.1.2.1', '.1.3.6.1.2.1.2.2.1.2.2'],
+                         store.diff('device1', ROOT, column({3: b'wan', 4: b'eth3', 11: b'eth4'})).removed)
+
+    def test_walk(self):
+        session = select('snmprec')('device1', 'cisco', 1)
+        store = DiffStore()
+        self.assertEqual(36, len(store.walk(session, ROOT).added))
+        self.assertFalse(store.walk(session, ROOT))
+        # OIDs in other formats share the state
+        self.assertFalse(store.walk(session, 'iso' + ROOT[2:]))
+        self.assertFalse(store.walk(session, ROOT[1:]))
+        self.assertEqual(1, len(store))
+        store.forget('device1', ROOT[1:])
+        self.assertEqual(0, len(store))
+        store.walk(session, ROOT)
+        store.forget('device1')
+        self.assertEqual(0, len(store))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from snmp_compat.oid import OID, normalize
+
+
+class OIDTestCase(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual((1, 3, 6, 1, 2, 1, 1, 5, 0), OID('.1.3.6.1.2.1.1.5.0'))
+        self.assertEqual(OID('.1.3.6.1.2.1.1.5.0'), OID('iso.3.6.1.2.1.1.5.0'))
+        self.assertEqual(OID('.1.3.6.1'), OID('1.3.6.1'))
+        self.assertIs(OID('.1.3.6.1.2.1.1.5.0'), OID('.1.3.6.1.2.1.1.5.0'))
+        self.assertEqual('.1.3.6.1.2.1.1.5.0', str(OID('.iso.3.6.1.2.1.1.5.0')))
+        self.assertEqual(OID.EMPTY, OID(''))
+        with self.assertRaises(ValueError):
+            OID('SNMPv2-MIB::sysName.0')
+
+    def test_normalize(self):
+        self.assertEqual('.1.3.6.1', normalize('iso.3.6.1'))
+        self.assertEqual('.1.3.6.1', normalize('1.3.6.1'))
+        self.assertEqual('sysName', normalize('sysName'))
+
+    def test_order(self):
+        oids = [OID('.1.3.6.1.2.1.10'), OID('.1.3.6.1.2.1.2.2.1.2.10'), OID('.1.3.6.1.2.1.2.2.1.2.9'),
+                OID('.1.3.6.1.2.1.2')]
+        self.assertEqual(['.1.3.6.1.2.1.2', '.1.3.6.1.2.1.2.2.1.2.9', '.1.3.6.1.2.1.2.2.1.2.10', '.1.3.6.1.2.1.10'],
+                         [str(oid) for oid in sorted(oids)])
+
+    def test_tree(self):
+        root = OID('.1.3.6.1.2.1.1')
+        self.assertTrue(OID('.1.3.6.1.2.1.1.5.0').in_tree(root))
+        self.assertFalse(OID('.1.3.6.1.2.1.10.1').in_tree(root))
+        self.assertFalse(root.in_tree(root))
+        self.assertTrue(root.startswith(root))
+        self.assertEqual('1', OID('.1.3.6.1.2.1.2.2.1.2.1').index_string(OID('.1.3.6.1.2.1.2.2.1.2')))
+        self.assertEqual(OID('5.0'), OID('.1.3.6.1.2.1.1.5.0').suffix(root))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import asyncio
+import os
+import unittest
+
+from snmp_compat import snmp_exceptions
+from snmp_compat.response import SNMPType
+
+snmpsim_host = os.getenv('SNMPSIM_HOST')
+
+
+@unittest.skipUnless(os.getenv('SNMP_LIBRARY') in ['pysnmp', 'asyncudp'], 'AsyncPoller requires pysnmp or asyncudp')
+class AsyncPollerTestCase(unittest.TestCase):
+    def test_poll(self):
+        from snmp_compat.poller import AsyncPoller, PollJob
+        jobs = [
+            (snmpsim_host, 'public', ['.1.3.6.1.2.1.1.5.0', '.1.3.6.1.2.1.1.7.0']),
+            PollJob(snmpsim_host, 'public', ['.1.3.6.1.2.1.1.4.0'], 'get_next'),
+            (snmpsim_host, 'ciscobad', ['.1.3.6.1.2.1.1.5.0']),
+        ]
+        results = AsyncPoller(per_host=2, timeout=0.2, retries=0, library=os.getenv('SNMP_LIBRARY')).run(jobs)
+        self.assertEqual(4, len(results))
+        values = {(result.job.community, result.oid): result for result in results}
+        self.assertEqual('zeus.pysnmp.com (you can change this!)',
+                         values[('public', '.1.3.6.1.2.1.1.5.0')].response.typed_value())
+        self.assertEqual('.1.3.6.1.2.1.1.5.0', values[('public', '.1.3.6.1.2.1.1.4.0')].response.oid)
+        self.assertIsNotNone(values[('ciscobad', '.1.3.6.1.2.1.1.5.0')].error)
+
+    def test_lazy_jobs(self):
+        from snmp_compat.poller import AsyncPoller
+        read = []
+
+        def jobs():
+            for number in range(20):
+                read.append(number)
+                yield snmpsim_host, 'public', ['.1.3.6.1.2.1.1.5.0']
+            # Invalid OID raising an unexpected error in the backend
+            yield snmpsim_host, 'public', [None]
+
+        async def poll():
+            results = AsyncPoller(concurrency=2, library=os.getenv('SNMP_LIBRARY')).poll(jobs())
+            first = await results.__anext__()
+            self.assertLess(len(read), 20)
+            return [first] + [result async for result in results]
+
+        results = asyncio.run(poll())
+        self.assertEqual(21, len(results))
+        self.assertEqual([None], [result.oid for result in results if result.error is not None])
+
+    def test_busy_host(self):
+        from snmp_compat.poller import AsyncPoller
+        # Another name for the agent, requests with an unknown community time out
+        slow_host = 'localhost' if snmpsim_host != 'localhost' else '127.0.0.1'
+        jobs = [(slow_host, 'ciscobad', ['.1.3.6.1.2.1.1.%d.0' % number for number in range(1, 7)]),
+                (snmpsim_host, 'public', ['.1.3.6.1.2.1.1.5.0'])]
+        poller = AsyncPoller(concurrency=4, per_host=1, timeout=0.2, retries=0, library=os.getenv('SNMP_LIBRARY'))
+        results = poller.run(jobs)
+        self.assertEqual(7, len(results))
+        # The other host is polled while the busy host waits for its timeouts
+        self.assertEqual('public', results[0].job.community)
+
+
+@unittest.skipUnless(os.getenv('SNMP_LIBRARY') in ['pysnmp', 'asyncudp'],
+                     'Engine shared with a running loop requires pysnmp or asyncudp')
+class AsyncEngineTestCase(unittest.TestCase):
+    def test_blocking_request_in_loop(self):
+        from snmp_compat.poller import async_backend
+        session_class, engine_class = async_backend(os.getenv('SNMP_LIBRARY'))
+
+        async def request():
+            session = session_class(snmpsim_host, 'public', engine=engine_class(asyncio.get_running_loop()))
+            with self.assertRaises(RuntimeError):
+                session.get('.1.3.6.1.2.1.1.5.0')
+            return await session.get_async('.1.3.6.1.2.1.1.5.0')
+
+        self.assertEqual('zeus.pysnmp.com (you can change this!)', asyncio.run(request()).typed_value())
+
+    @unittest.skipUnless(os.getenv('SNMP_LIBRARY') == 'pysnmp', 'Only pysnmp connects a transport per session')
+    def test_concurrent_connect(self):
+        from snmp_compat.poller import async_backend
+        session_class, engine_class = async_backend(os.getenv('SNMP_LIBRARY'))
+        connects = []
+
+        class Session(session_class):
+            async def _async_connect(self):
+                connects.append(self)
+                await super()._async_connect()
+
+        async def request():
+            session = Session(snmpsim_host, 'public', engine=engine_class(asyncio.get_running_loop()))
+            return await asyncio.gather(*[session.get_async('.1.3.6.1.2.1.1.5.0') for _ in range(5)])
+
+        self.assertEqual(5, len(asyncio.run(request())))
+        self.assertEqual(1, len(connects))
+
+
+class ThreadedPollerTestCase(unittest.TestCase):
+    def test_poll(self):
+        from snmp_compat.parallel import ThreadedPoller, PollJob
+        jobs = [
+            (snmpsim_host, 'public', ['.1.3.6.1.2.1.1.5.0', '.1.7.7.7.7']),
+            PollJob(snmpsim_host, 'public', ['.1.3.6.1.2.1.1.4.0'], 'get_next'),
+            (snmpsim_host, 'ciscobad', ['.1.3.6.1.2.1.1.5.0']),
+        ]
+        with ThreadedPoller(workers=2, timeout=0.2, retries=0) as poller:
+            results = poller.run(jobs)
+            self.assertEqual(4, len(results))
+            values = {(result.job.community, result.oid): result for result in results}
+            self.assertEqual('zeus.pysnmp.com (you can change this!)',
+                             values[('public', '.1.3.6.1.2.1.1.5.0')].response.typed_value())
+            self.assertIsInstance(values[('public', '.1.7.7.7.7')].error, snmp_exceptions.SNMPNoData)
+            self.assertEqual('.1.3.6.1.2.1.1.5.0', values[('public', '.1.3.6.1.2.1.1.4.0')].response.oid)
+            self.assertIsNotNone(values[('ciscobad', '.1.3.6.1.2.1.1.5.0')].error)
+            self.assertEqual(4, len(poller.run(jobs)))
+
+    def test_unexpected_error(self):
+        from snmp_compat.compat import select
+        from snmp_compat.parallel import ThreadedPoller, PollJob
+
+        class BrokenSession(select(os.getenv('SNMP_LIBRARY'))):
+            def get_many(self, oids):
+                if self.community == 'broken':
+                    raise ValueError('Broken backend')
+                return super().get_many(oids)
+
+            def get_next(self, oid):
+                if self.community == 'broken':
+                    raise ValueError('Broken backend')
+                return super().get_next(oid)
+
+        jobs = [
+            (snmpsim_host, 'broken', ['.1.3.6.1.2.1.1.5.0', '.1.3.6.1.2.1.1.7.0']),
+            PollJob(snmpsim_host, 'broken', ['.1.3.6.1.2.1.1.4.0'], 'get_next'),
+            (snmpsim_host, 'public', ['.1.3.6.1.2.1.1.5.0']),
+        ]
+        with ThreadedPoller(BrokenSession, workers=2) as poller:
+            results = poller.run(jobs)
+        self.assertEqual(4, len(results))
+        errors = [result for result in results if result.error is not None]
+        self.assertEqual(3, len(errors))
+        self.assertEqual([ValueError] * 3, [type(result.error) for result in errors])
+
+
+class ProcessCollectorTestCase(unittest.TestCase):
+    def test_collect(self):
+        from snmp_compat.collector import ProcessCollector, PollJob
+        jobs = [
+            (snmpsim_host, 'public', ['.1.3.6.1.2.1.1.5.0', '.1.7.7.7.7']),
+            PollJob(snmpsim_host, 'public', ['.1.3.6.1.2.1.2.2.1.2'], 'walk'),
+            (snmpsim_host, 'ciscobad', ['.1.3.6.1.2.1.1.5.0']),
+        ]
+        with ProcessCollector(processes=2, shard_size=1, timeout=0.2, retries=0) as collector:
+            results = {(result.job.community, result.job.operation): result for result in collector.run(jobs)}
+        self.assertEqual(3, len(results))
+        get = results[('public', 'get')]
+        self.assertEqual([('.1.3.6.1.2.1.1.5.0', SNMPType.OCTET_STRING, b'zeus.pysnmp.com (you can change this!)')],
+                         list(get.result))
+        self.assertIsInstance(get.errors['.1.7.7.7.7'], snmp_exceptions.SNMPNoData)
+        self.assertEqual('No data for oid .1.7.7.7.7', str(get.errors['.1.7.7.7.7']))
+        self.assertEqual([b'lo', b'eth0'], [row[2] for row in results[('public', 'walk')].result])
+        self.assertIn('.1.3.6.1.2.1.1.5.0', results[('ciscobad', 'get')].errors)
+
+    def test_unexpected_error(self):
+        from snmp_compat.collector import ProcessCollector, PollJob
+        jobs = [
+            (snmpsim_host, 'public', ['.1.3.6.1.2.1.1.5.0']),
+            # Invalid OID raising an unexpected error in the backend
+            PollJob(snmpsim_host, 'public', [None], 'walk'),
+        ]
+        with ProcessCollector(processes=1) as collector:
+            results = {result.job.operation: result for result in collector.run(jobs)}
+        self.assertEqual(1, len(results['get'].result))
+        self.assertEqual({}, results['get'].errors)
+        self.assertEqual([None], list(results['walk'].errors))
+        self.assertTrue(str(results['walk'].errors[None]).startswith('TypeError: '))
+
+
+if __name__ == '__main__':
+    unittest.main()
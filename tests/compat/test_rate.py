@@ -0,0 +1,74 @@
+import importlib.util
+import unittest
+
+from snmp_compat.rate import RateCalculator
+from snmp_compat.response import SNMPType
+from snmp_compat.walk_result import WalkResult
+
+has_numpy = importlib.util.find_spec('numpy') is not None
+
+
+def counters(*rows) -> WalkResult:
+    result = WalkResult()
+    for oid, type_code, value in rows:
+        result.append(oid, type_code, value)
+    return result
+
+
+class RateTestCase(unittest.TestCase):
+    def test_rate(self):
+        rates = RateCalculator()
+        first = counters(('.1.3.6.1.2.1.2.2.1.10.1', SNMPType.COUNTER32, 100),
+                         ('.1.3.6.1.2.1.2.2.1.2.1', SNMPType.OCTET_STRING, b'lo'))
+        second = counters(('.1.3.6.1.2.1.2.2.1.10.1', SNMPType.COUNTER32, 200),
+                          ('.1.3.6.1.2.1.2.2.1.2.1', SNMPType.OCTET_STRING, b'lo'))
+        self.assertEqual([None, None], rates.update('host', first, 0))
+        self.assertEqual([10, None], rates.update('host', second, 10))
+
+    def test_wrap(self):
+        rates = RateCalculator()
+        rates.update('host', counters(('.1.1', SNMPType.COUNTER32, 2 ** 32 - 10),
+                                      ('.1.2', SNMPType.COUNTER64, 2 ** 64 - 10)), 0)
+        self.assertEqual([2, 2], rates.update('host', counters(('.1.1', SNMPType.COUNTER32, 10),
+                                                               ('.1.2', SNMPType.COUNTER64, 10)), 10))
+
+    def test_restart(self):
+        rates = RateCalculator()
+        rates.update('host', counters(('.1.1', SNMPType.COUNTER32, 1000)), 0, uptime=5000)
+        restarted = counters(('.1.1', SNMPType.COUNTER32, 10))
+        self.assertEqual([None], rates.update('host', restarted, 10, uptime=100))
+        self.assertEqual([1], rates.update('host', counters(('.1.1', SNMPType.COUNTER32, 20)), 20, uptime=1100))
+
+    def test_changed_rows(self):
+        rates = RateCalculator()
+        rates.update('host', counters(('.1.1', SNMPType.COUNTER32, 10), ('.1.3', SNMPType.COUNTER32, 10)), 0)
+        self.assertEqual([None, 1], rates.update('host', counters(('.1.2', SNMPType.COUNTER32, 20),
+                                                                  ('.1.3', SNMPType.COUNTER32, 20)), 10))
+
+    def test_oids(self):
+        rates = RateCalculator()
+        for timestamp in [0, 10]:
+            in_octets = counters(('.1.3.6.1.2.1.31.1.1.1.6.1', SNMPType.COUNTER64, 100 * timestamp))
+            out_octets = counters(('.1.3.6.1.2.1.31.1.1.1.10.1', SNMPType.COUNTER64, 200 * timestamp))
+            in_rates = rates.update('host', in_octets, timestamp, oid='.1.3.6.1.2.1.31.1.1.1.6')
+            out_rates = rates.update('host', out_octets, timestamp, oid='1.3.6.1.2.1.31.1.1.1.10')
+        self.assertEqual([100], in_rates)
+        self.assertEqual([200], out_rates)
+        self.assertEqual(2, len(rates))
+
+        rates.remove('host', 'iso.3.6.1.2.1.31.1.1.1.6')
+        self.assertEqual(1, len(rates))
+        rates.remove('host')
+        self.assertEqual(0, len(rates))
+
+    @unittest.skipUnless(has_numpy, 'NumPy is not installed')
+    def test_rate_numpy(self):
+        rates = RateCalculator()
+        rates.update('host', counters(('.1.1', SNMPType.COUNTER32, 2 ** 32 - 10),
+                                      ('.1.2', SNMPType.COUNTER64, 2 ** 64 - 10),
+                                      ('.1.3', SNMPType.GAUGE32, 10)), 0)
+        result = rates.update('host', counters(('.1.1', SNMPType.COUNTER32, 10),
+                                               ('.1.2', SNMPType.COUNTER64, 10),
+                                               ('.1.3', SNMPType.GAUGE32, 10)), 10, as_numpy=True)
+        self.assertEqual([2, 2], list(result[:2]))
+        self.assertNotEqual(result[2], result[2])  # NaN
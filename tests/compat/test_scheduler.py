@@ -0,0 +1,89 @@
+import unittest
+
+from snmp_compat.libraries import compat_snmprec
+from snmp_compat.libraries.compat_snmprec import AgentProfile
+from snmp_compat.parallel import ThreadedPoller
+from snmp_compat.scheduler import FAILED, MISSED, SKIPPED, PollScheduler
+
+
+class PollSchedulerTestCase(unittest.TestCase):
+    """
+    Polls the snmprec backend, which needs no agent
+    """
+
+    def setUp(self):
+        compat_snmprec.profiles['slow'] = AgentProfile(latency=0.25)
+        self.runs = []
+        self.poller = ThreadedPoller('snmprec', workers=4, version=1)
+
+    def tearDown(self):
+        self.poller.close()
+        del compat_snmprec.profiles['slow']
+
+    def test_spread(self):
+        scheduler = PollScheduler(self.poller, interval=0.2, callback=self.runs.append)
+        jobs = [scheduler.add(('device%d' % number, 'cisco', ['.1.3.6.1.2.1.1.5.0'])) for number in range(4)]
+        scheduler.run(0.5)
+
+        first = {}
+        for run in self.runs:
+            first.setdefault(run.scheduled_job, run.scheduled)
+        offsets = [first[job] - first[jobs[0]] for job in jobs]
+        for offset, expected in zip(offsets, [0, 0.05, 0.1, 0.15]):
+            self.assertAlmostEqual(expected, offset, places=6)
+        for job in jobs:
+            self.assertIn(job.runs, [2, 3])
+            self.assertLess(job.max_lateness, 0.1)
+        self.assertEqual('ROV-SW-01.switch.ltf.local', self.runs[0].results[0].response.typed_value())
+
+    def test_overrun_skip(self):
+        scheduler = PollScheduler(self.poller, interval=0.1, deadline=1, callback=self.runs.append)
+        job = scheduler.add(('slow', 'cisco', ['.1.3.6.1.2.1.1.5.0']))
+        scheduler.run(0.45)
+        self.assertEqual(2, job.runs)
+        self.assertGreater(job.skipped, 0)
+        self.assertIn(SKIPPED, [run.status for run in self.runs])
+
+    def test_overrun_coalesce(self):
+        scheduler = PollScheduler(self.poller, interval=0.1, deadline=1, overrun='coalesce',
+                                  callback=self.runs.append)
+        job = scheduler.add(('slow', 'cisco', ['.1.3.6.1.2.1.1.5.0']))
+        scheduler.run(0.3)
+        started = [run for run in self.runs if run.status != SKIPPED]
+        self.assertEqual(2, job.runs)
+        # The cycle at 0.1 is started when the first run completes at 0.25, the cycle at 0.2 is skipped
+        self.assertGreater(started[1].lateness, 0.1)
+        self.assertEqual(1, job.skipped)
+
+    def test_deadline(self):
+        poller = ThreadedPoller('snmprec', workers=1, version=1)
+        scheduler = PollScheduler(poller, interval=1, deadline=0.1, callback=self.runs.append)
+        scheduler.add(('slow', 'cisco', ['.1.3.6.1.2.1.1.5.0']))
+        missed = scheduler.add(('fast', 'cisco', ['.1.3.6.1.2.1.1.5.0']), interval=0.5)
+        try:
+            scheduler.run(0.1)
+        finally:
+            poller.close()
+        self.assertEqual(1, missed.missed)
+        self.assertEqual([MISSED], [run.status for run in self.runs if run.scheduled_job is missed])
+
+    def test_failed(self):
+        class BrokenPoller(ThreadedPoller):
+            def poll_job(self, job):
+                raise RuntimeError('Broken poller')
+
+        poller = BrokenPoller('snmprec', workers=1, version=1)
+        scheduler = PollScheduler(poller, interval=0.1, callback=self.runs.append)
+        job = scheduler.add(('device1', 'cisco', ['.1.3.6.1.2.1.1.5.0']))
+        try:
+            scheduler.run(0.25)
+        finally:
+            poller.close()
+        self.assertEqual(3, job.runs)
+        self.assertEqual(3, job.failed)
+        self.assertEqual([FAILED] * 3, [run.status for run in self.runs])
+        self.assertIsInstance(self.runs[0].error, RuntimeError)
+
+
+if __name__ == '__main__':
+    unittest.main()
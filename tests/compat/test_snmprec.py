@@ -0,0 +1,111 @@
+import datetime
+import time
+import unittest
+
+from snmp_compat import snmp_exceptions
+from snmp_compat.compat import select
+from snmp_compat.cursor import WalkCursor
+from snmp_compat.libraries.compat_snmprec import AgentProfile
+
+SNMPSession = select('snmprec')
+
+
+class SnmprecTestCase(unittest.TestCase):
+    def test_get(self):
+        session = SNMPSession('device1', 'cisco', 1)
+        response = session.get('.1.3.6.1.2.1.1.5.0')
+        self.assertEqual('ROV-SW-01.switch.ltf.local', response.typed_value())
+        self.assertEqual(datetime.timedelta(seconds=10093515.73), session.get('.1.3.6.1.2.1.1.3.0').typed_value())
+        self.assertEqual('.1.3.6.1.4.1.9.1.1208', session.get('iso.3.6.1.2.1.1.2.0').typed_value())
+        self.assertEqual('40f4ec26f740', session.get('.1.3.6.1.2.1.2.2.1.6.1').typed_value())
+        with self.assertRaises(snmp_exceptions.SNMPNoData):
+            session.get('.1.3.6.1.2.1.1.5')
+
+    def test_get_next(self):
+        session = SNMPSession('device1', 'cisco', 1)
+        self.assertEqual('.1.3.6.1.2.1.1.5.0', session.get_next('.1.3.6.1.2.1.1.4.0').oid)
+        with self.assertRaises(snmp_exceptions.SNMPNoData):
+            session.get_next('.2')
+
+    def test_get_many(self):
+        oids = ['.1.3.6.1.2.1.1.5.0', '.1.3.6.1.2.1.1.7.7', '.1.3.6.1.2.1.1.7.0']
+        for version in [0, 1]:
+            responses = SNMPSession('device1', 'cisco', version).get_many(oids)
+            self.assertEqual(6, responses[2].typed_value())
+            self.assertIsInstance(responses[1], snmp_exceptions.SNMPNoData)
+
+    def test_walk(self):
+        session = SNMPSession('device1', 'cisco', 1)
+        walk = session.walk('.1.3.6.1.2.1.2.2.1.2')
+        self.assertEqual(36, len(walk))
+        self.assertEqual([(entry.oid, entry.value) for entry in walk],
+                         [(entry.oid, entry.value) for entry in session.bulkwalk('.1.3.6.1.2.1.2.2.1.2', 7)])
+        self.assertEqual([], session.walk('.1.3.6.1.2.1.1.5.0'))
+
+        table = session.get_table({'descr': '.1.3.6.1.2.1.2.2.1.2', 'speed': '.1.3.6.1.2.1.2.2.1.5'}, 5)
+        self.assertEqual(36, len(table.index))
+
+    def test_profile(self):
+        session = SNMPSession('device1', 'cisco', 1, profile=AgentProfile(latency=0.02))
+        start = time.monotonic()
+        session.get('.1.3.6.1.2.1.1.5.0')
+        self.assertGreaterEqual(time.monotonic() - start, 0.02)
+
+        session = SNMPSession('device1', 'cisco', 1, timeout=0.05, retries=1, profile=AgentProfile(loss=1))
+        start = time.monotonic()
+        with self.assertRaises(snmp_exceptions.SNMPTimeout):
+            session.get('.1.3.6.1.2.1.1.5.0')
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+        # Responses slower than the timeout are lost
+        session = SNMPSession('device1', 'cisco', 1, timeout=0.05, retries=0, profile=AgentProfile(latency=0.1))
+        with self.assertRaises(snmp_exceptions.SNMPTimeout):
+            session.get('.1.3.6.1.2.1.1.5.0')
+
+    def test_resumable_walk(self):
+        expected = [entry.oid for entry in SNMPSession('device1', 'cisco', 1).walk('.1.3.6.1.2.1.2.2.1.2')]
+        for version in [0, 1]:
+            session = SNMPSession('device1', 'cisco', version, timeout=0.001, retries=0, seed=1,
+                                  profile=AgentProfile(loss=0.3))
+            walk = session.resumable_walk('.1.3.6.1.2.1.2.2.1.2', max_repetitions=5, resumes=20)
+            self.assertTrue(walk.complete)
+            self.assertEqual(expected, [entry.oid for entry in walk])
+
+        # Resume an interrupted walk from the saved cursor
+        session = SNMPSession('device1', 'cisco', 0, timeout=0.001, retries=0, seed=2, profile=AgentProfile(loss=0.3))
+        walk = session.resumable_walk('.1.3.6.1.2.1.2.2.1.2', resumes=0)
+        self.assertFalse(walk.complete)
+        self.assertLess(len(walk), len(expected))
+        resumed = SNMPSession('device1', 'cisco', 0).resumable_walk(WalkCursor.loads(walk.cursor.dumps()))
+        self.assertTrue(resumed.complete)
+        self.assertEqual(expected, [entry.oid for entry in walk] + [entry.oid for entry in resumed])
+
+    def test_walk_not_increasing(self):
+        class RepeatingSession(SNMPSession):
+            """
+            Broken agent responding to each GETBULK with the first row of the column
+            """
+            requests = 0
+
+            def get_bulk(self, oids, non_repeaters=0, max_repetitions=10):
+                self.requests += 1
+                return [self.get_next('.1.3.6.1.2.1.2.2.1.2')] * max_repetitions
+
+        session = RepeatingSession('device1', 'cisco', 1)
+        self.assertEqual(['.1.3.6.1.2.1.2.2.1.2.1'], [entry.oid for entry in session.bulkwalk('.1.3.6.1.2.1.2.2.1.2')])
+        walk = session.resumable_walk('.1.3.6.1.2.1.2.2.1.2')
+        self.assertTrue(walk.complete)
+        self.assertEqual(1, len(walk))
+        self.assertEqual(1, len(session.walk_result('.1.3.6.1.2.1.2.2.1.2')))
+        self.assertEqual(3, session.requests)
+
+    def test_unknown_community(self):
+        session = SNMPSession('device1', 'ciscobad', 1, timeout=0.05, retries=0)
+        with self.assertRaises(snmp_exceptions.SNMPTimeout):
+            session.get('.1.3.6.1.2.1.1.5.0')
+        with self.assertRaises(snmp_exceptions.SNMPTimeout):
+            session.walk('.1.3.6.1.2.1.1')
+
+
+if __name__ == '__main__':
+    unittest.main()